@@ -0,0 +1 @@
+"""Skill-layer microbenchmarks. Run with: python -m benchmarks.run"""
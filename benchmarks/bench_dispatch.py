@@ -0,0 +1,101 @@
+# benchmarks/bench_dispatch.py
+from skills import registry
+from skills.classifier import HAVE_NUMPY, IntentClassifier
+from benchmarks.corpus import GARBLES, transcripts, synthetic_skills
+
+CORPUS = transcripts(5000)
+
+
+def _silent(text):
+    pass
+
+
+def _dispatch_all(corpus):
+    hits = 0
+    for t in corpus:
+        hits += registry.dispatch(t, _silent)
+    return hits
+
+
+def _with_skills(skills, fn):
+    # Grammar matching only: the fallback classifier is measured by the bench_classify_* benches
+    saved = registry._fallback_threshold
+    registry.set_fallback_threshold(None)
+    registry.install_skills(skills)
+    try:
+        return fn()
+    finally:
+        registry.set_fallback_threshold(saved)
+        registry.load_skills()
+
+
+def _noop_handlers(skills):
+    # Real handlers spawn processes / hit the network; keep only the matching cost
+    for skill in skills:
+        for intent in skill.intents:
+            intent.handler = lambda text, speak: None
+    return skills
+
+
+def bench_dispatch_builtin_skills(benchmark):
+    skills = _noop_handlers(registry.load_skills())
+    benchmark.extra_info["transcripts"] = len(CORPUS)
+    _with_skills(skills, lambda: benchmark(_dispatch_all, CORPUS))
+
+
+def bench_dispatch_100_intents(benchmark):
+    skills = _noop_handlers(registry.load_skills()) + synthetic_skills(100)
+    _with_skills(skills, lambda: benchmark(_dispatch_all, CORPUS))
+
+
+def bench_dispatch_1000_intents(benchmark):
+    skills = _noop_handlers(registry.load_skills()) + synthetic_skills(1000)
+    _with_skills(skills, lambda: benchmark(_dispatch_all, CORPUS[:1000]))
+
+
+def _with_examples(skills):
+    # Opt every synthetic intent into the classifier, as a large skill set would
+    for skill in skills:
+        for intent in skill.intents:
+            intent.examples = [" ".join(reversed(p.split())) for p in intent.patterns]
+    return skills
+
+
+def _classify_all(classifier, corpus):
+    hits = 0
+    for t in corpus:
+        hits += classifier.classify(t) is not None
+    return hits
+
+
+def bench_classify_builtin_skills(benchmark):
+    if not HAVE_NUMPY:
+        benchmark.skip("numpy missing")
+    classifier = IntentClassifier(registry.load_skills())
+    benchmark.extra_info["phrases"] = len(classifier.phrases)
+    benchmark(_classify_all, classifier, CORPUS[:1000])
+
+
+def bench_classify_1000_intents(benchmark):
+    if not HAVE_NUMPY:
+        benchmark.skip("numpy missing")
+    classifier = IntentClassifier(registry.load_skills() + _with_examples(synthetic_skills(1000)))
+    benchmark.extra_info["phrases"] = len(classifier.phrases)
+    benchmark(_classify_all, classifier, CORPUS[:1000])
+
+
+def bench_classify_garbles(benchmark):
+    """Grammar misses through the shipped fallback; fails if a known garble resolves wrongly."""
+    if not HAVE_NUMPY:
+        benchmark.skip("numpy missing")
+    from core.config import _DEFAULTS
+    classifier = IntentClassifier(registry.load_skills(), threshold=_DEFAULTS["intent_fallback_threshold"])
+    wrong = []
+    for text, want in GARBLES:
+        hit = classifier.classify(text)
+        if (hit[1].name if hit else None) != want:
+            wrong.append(f"{text!r} -> {hit[1].name if hit else None} (want {want})")
+    if wrong:
+        raise AssertionError("fallback classifier: " + "; ".join(wrong))
+    benchmark.extra_info["garbles"] = len(GARBLES)
+    benchmark(_classify_all, classifier, [t for t, _ in GARBLES])
@@ -0,0 +1,35 @@
+# benchmarks/bench_io.py
+import tempfile
+from pathlib import Path
+
+from benchmarks.corpus import make_tree
+from core.history import HistoryRecorder
+from skills import file_search
+
+
+def bench_search_files_tree(benchmark):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = make_tree(Path(tmp))
+        benchmark.extra_info["files"] = sum(1 for p in root.rglob("*") if p.is_file())
+        # Keyword that never matches: forces a full walk, the worst case
+        benchmark(file_search._search_files, [root], "no-such-file")
+
+
+def bench_search_files_first_hits(benchmark):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = make_tree(Path(tmp))
+        benchmark(file_search._search_files, [root], "invoice")
+
+
+def bench_history_write(benchmark):
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = HistoryRecorder(Path(tmp), session_name="bench")
+
+        def write_100():
+            for i in range(50):
+                recorder.log("You", f"set volume to {i} percent")
+                recorder.event("Dispatch handled=True")
+            recorder._lines.clear()  # keep memory flat across rounds
+
+        benchmark.extra_info["lines_per_call"] = 100
+        benchmark(write_100)
@@ -0,0 +1,43 @@
+# benchmarks/bench_parsing.py
+import random
+
+from benchmarks.corpus import SEED, transcripts
+
+CORPUS = transcripts(2000, miss_ratio=0.0)
+
+_SENTENCE = (
+    "The Artemis program is a robotic and human Moon exploration program led by NASA "
+    "together with several commercial and international partners. "
+)
+
+
+def _article(n_sentences: int = 400) -> str:
+    rng = random.Random(SEED)
+    short = ["Read more.", "Share this.", "Advertisement.", "Subscribe now!"]
+    parts = [_SENTENCE if rng.random() < 0.5 else rng.choice(short) for _ in range(n_sentences)]
+    return " ".join(parts)
+
+
+def _web_search(benchmark):
+    try:
+        from skills import web_search
+    except ImportError as e:
+        benchmark.skip(f"web_search deps missing: {e}")
+    return web_search
+
+
+def bench_extract_query(benchmark):
+    web_search = _web_search(benchmark)
+    benchmark(lambda: [web_search._extract_query(t) for t in CORPUS])
+
+
+def bench_summarize_article(benchmark):
+    web_search = _web_search(benchmark)
+    text = _article()
+    benchmark.extra_info["chars"] = len(text)
+    benchmark(web_search._summarize, text, 4)
+
+
+def bench_parse_percent(benchmark):
+    from skills import volume_skill
+    benchmark(lambda: [volume_skill._parse_percent(t) for t in CORPUS])
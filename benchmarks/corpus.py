@@ -0,0 +1,107 @@
+# benchmarks/corpus.py
+"""Deterministic synthetic inputs shared by the benchmarks."""
+from __future__ import annotations
+import random
+from pathlib import Path
+from typing import List
+
+from skills.types import Intent, Skill
+
+SEED = 1234
+
+# Realistic spoken commands (what Vosk hands us: lowercase, no punctuation)
+COMMANDS = [
+    "volume up",
+    "sound down",
+    "mute",
+    "unmute",
+    "set volume to forty",
+    "set volume to 35 percent",
+    "volume 80 percent",
+    "what time is it",
+    "what is the time",
+    "open notepad",
+    "open calculator",
+    "open google chrome",
+    "open it",
+    "open the link",
+    "search file report",
+    "find file invoice in downloads",
+    "search file \"annual report\" in documents",
+    "search the web for nasa artemis launch",
+    "search for python asyncio tutorial",
+    "what is quantum computing",
+    "who is ada lovelace",
+    "tell me about the roman empire",
+    "news on electric cars",
+]
+
+FILLER = [
+    "um", "please", "hey", "leo", "could", "you", "uh", "now", "the", "a",
+    "okay", "so", "maybe", "just", "thanks", "really", "quickly",
+]
+
+MISSES = [
+    "good morning",
+    "how are you doing today",
+    "thank you very much",
+    "never mind",
+    "that was great",
+    "play some music",
+]
+
+# Misrecognitions the grammar misses and the fallback classifier should resolve
+GARBLES = [
+    ("value up", "volume_up"),
+    ("value down", "volume_down"),
+    ("turn it up", "volume_up"),
+    ("opened notepad", "open_notepad"),
+    ("opened calculator", "open_calculator"),
+    ("read mor", "read_more"),
+    ("time remainin", "time_left"),
+] + [(m, None) for m in MISSES]
+
+
+def transcripts(n: int = 5000, miss_ratio: float = 0.2) -> List[str]:
+    """Commands wrapped in filler words, plus a share of utterances that match nothing."""
+    rng = random.Random(SEED)
+    out: List[str] = []
+    for _ in range(n):
+        base = rng.choice(MISSES) if rng.random() < miss_ratio else rng.choice(COMMANDS)
+        pre = " ".join(rng.choice(FILLER) for _ in range(rng.randint(0, 2)))
+        post = " ".join(rng.choice(FILLER) for _ in range(rng.randint(0, 2)))
+        out.append(" ".join(p for p in (pre, base, post) if p))
+    return out
+
+
+def _noop(text, speak):
+    pass
+
+
+def synthetic_skills(n_intents: int, patterns_per_intent: int = 3, words: int = 3) -> List[Skill]:
+    """Many made-up intents, each with a few multi-word patterns, grouped 20 per skill."""
+    rng = random.Random(SEED + n_intents)
+    vocab = [f"w{i}" for i in range(max(200, n_intents))]
+    skills: List[Skill] = []
+    intents: List[Intent] = []
+    for i in range(n_intents):
+        patterns = [" ".join(rng.choice(vocab) for _ in range(words)) for _ in range(patterns_per_intent)]
+        intents.append(Intent(patterns=patterns, handler=_noop, name=f"synthetic_{i}"))
+        if len(intents) == 20 or i == n_intents - 1:
+            skills.append(Skill(name=f"synthetic_{len(skills)}", intents=intents))
+            intents = []
+    return skills
+
+
+def make_tree(root: Path, dirs: int = 60, files_per_dir: int = 50) -> Path:
+    """Create a nested directory tree of empty files for file-search benchmarks."""
+    rng = random.Random(SEED)
+    names = ["report", "invoice", "notes", "photo", "budget", "draft", "scan", "minutes"]
+    exts = [".txt", ".pdf", ".docx", ".png", ".xlsx"]
+    for d in range(dirs):
+        sub = root / f"dir{d // 10}" / f"sub{d}"
+        sub.mkdir(parents=True, exist_ok=True)
+        for f in range(files_per_dir):
+            name = f"{rng.choice(names)}_{d}_{f}{rng.choice(exts)}"
+            (sub / name).touch()
+    return root
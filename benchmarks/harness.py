@@ -0,0 +1,88 @@
+# benchmarks/harness.py
+"""
+Tiny pytest-benchmark style harness.
+
+Each bench_* function receives a `benchmark` callable and calls it once:
+    benchmark(fn, *args, **kwargs)  -> returns fn's result
+The harness calibrates how many calls make up one round, runs rounds until
+`max_time` is spent, and records per-call timings.
+"""
+from __future__ import annotations
+import statistics
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List
+
+
+class SkipBenchmark(Exception):
+    pass
+
+
+@dataclass
+class Stats:
+    name: str
+    rounds: int
+    iterations: int
+    min: float
+    max: float
+    mean: float
+    median: float
+    stddev: float
+
+    @property
+    def ops(self) -> float:
+        return 1.0 / self.median if self.median > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d["ops"] = self.ops
+        return d
+
+
+class Benchmark:
+    def __init__(self, name: str, min_rounds: int = 5, max_time: float = 1.0, round_time: float = 0.01):
+        self.name = name
+        self.min_rounds = min_rounds
+        self.max_time = max_time
+        self.round_time = round_time
+        self.stats: Stats | None = None
+        self.extra_info: Dict[str, Any] = {}
+
+    def skip(self, reason: str):
+        raise SkipBenchmark(reason)
+
+    def _calibrate(self, fn: Callable[[], Any]) -> int:
+        iterations = 1
+        while True:
+            t0 = time.perf_counter()
+            for _ in range(iterations):
+                fn()
+            elapsed = time.perf_counter() - t0
+            if elapsed >= self.round_time or iterations >= 1_000_000:
+                return iterations
+            iterations *= 10 if elapsed < self.round_time / 10 else 2
+
+    def __call__(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        call = lambda: fn(*args, **kwargs)  # noqa: E731
+        result = call()  # warm-up; also the value handed back to the bench
+        iterations = self._calibrate(call)
+
+        samples: List[float] = []
+        deadline = time.perf_counter() + self.max_time
+        while len(samples) < self.min_rounds or time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            for _ in range(iterations):
+                call()
+            samples.append((time.perf_counter() - t0) / iterations)
+
+        self.stats = Stats(
+            name=self.name,
+            rounds=len(samples),
+            iterations=iterations,
+            min=min(samples),
+            max=max(samples),
+            mean=statistics.fmean(samples),
+            median=statistics.median(samples),
+            stddev=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        )
+        return result
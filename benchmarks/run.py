@@ -0,0 +1,117 @@
+# benchmarks/run.py
+"""
+Run the skill-layer microbenchmarks (no audio, network or Windows needed).
+
+    python -m benchmarks.run                      # run all, compare to saved baseline
+    python -m benchmarks.run -k dispatch          # only benches whose name contains "dispatch"
+    python -m benchmarks.run --save-baseline      # record current numbers as the baseline
+    python -m benchmarks.run --max-regression 0.3 # fail if median slows down by >30%
+
+Exit code 1 when any benchmark regressed beyond the threshold.
+"""
+from __future__ import annotations
+import argparse
+import importlib
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.harness import Benchmark, SkipBenchmark  # noqa: E402
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = ROOT / ".benchmarks" / "baseline.json"
+
+
+def _discover(keyword: str | None):
+    for path in sorted(BENCH_DIR.glob("bench_*.py")):
+        module = importlib.import_module(f"benchmarks.{path.stem}")
+        for name in sorted(dir(module)):
+            fn = getattr(module, name)
+            if name.startswith("bench_") and callable(fn):
+                full = f"{path.stem}::{name}"
+                if keyword and keyword not in full:
+                    continue
+                yield full, fn
+
+
+def _fmt_time(sec: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if sec >= scale:
+            return f"{sec / scale:8.2f} {unit}"
+    return f"{sec / 1e-9:8.2f} ns"
+
+
+def _load_baseline(path: Path) -> Dict[str, dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("benchmarks", {})
+    except Exception:
+        return {}
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Leo skill-layer microbenchmarks")
+    ap.add_argument("-k", dest="keyword", help="only run benchmarks whose name contains this")
+    ap.add_argument("--max-time", type=float, default=1.0, help="seconds spent per benchmark")
+    ap.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    ap.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    ap.add_argument("--max-regression", type=float, default=0.25,
+                    help="allowed median slowdown vs baseline (0.25 = 25%%)")
+    ap.add_argument("--json", type=Path, help="also write results to this file")
+    args = ap.parse_args(argv)
+
+    baseline = _load_baseline(args.baseline)
+    results: Dict[str, dict] = {}
+    regressions: List[str] = []
+
+    print(f"{'benchmark':55} {'median':>11} {'min':>11} {'rounds':>7}  vs baseline")
+    for name, fn in _discover(args.keyword):
+        bench = Benchmark(name, max_time=args.max_time)
+        try:
+            fn(bench)
+        except SkipBenchmark as e:
+            print(f"{name:55} SKIPPED ({e})")
+            continue
+        if bench.stats is None:
+            print(f"{name:55} (benchmark fixture was never called)")
+            continue
+        s = bench.stats
+        results[name] = {**s.to_dict(), "extra_info": bench.extra_info}
+
+        note = ""
+        base = baseline.get(name)
+        if base and base.get("median"):
+            change = s.median / base["median"] - 1.0
+            note = f"{change:+7.1%}"
+            if change > args.max_regression:
+                note += "  ⚠️ REGRESSION"
+                regressions.append(name)
+        print(f"{name:55} {_fmt_time(s.median)} {_fmt_time(s.min)} {s.rounds:7d}  {note}")
+
+    payload = {
+        "machine": {"python": platform.python_version(), "platform": platform.platform()},
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "benchmarks": results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"💾 Baseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"\n⚠️ {len(regressions)} regression(s) over {args.max_regression:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,318 @@
+# core/asr.py
+from __future__ import annotations
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from vosk import Model, KaldiRecognizer
+
+
+class ModelLoader:
+    """
+    Loads a Vosk model on a background thread so wake-word listening can start immediately.
+    - Builds the KaldiRecognizer and runs a short warm-up decode on silence.
+    - `wait()` blocks until the model is ready (or failed to load).
+    """
+    def __init__(
+        self,
+        model_path: str,
+        sample_rate: int,
+        warmup_sec: float = 0.5,
+        on_done: Optional[Callable[["ModelLoader"], None]] = None,
+    ):
+        self.model_path = model_path
+        self.name = model_path  # registry name when loaded through ModelPool
+        self.sample_rate = sample_rate
+        self.warmup_sec = warmup_sec
+        self.on_done = on_done
+
+        self.model: Model | None = None
+        self.recognizer: KaldiRecognizer | None = None
+        self.error: Exception | None = None
+        self.load_time: float = 0.0
+
+        self._ready = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "ModelLoader":
+        self._thread = threading.Thread(target=self._run, name="model_loader", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        t0 = time.monotonic()
+        try:
+            model = Model(self.model_path)
+            recognizer = KaldiRecognizer(model, self.sample_rate)
+            # Warm-up: first decode pays for graph/feature pipeline setup
+            silence = bytes(int(self.sample_rate * self.warmup_sec) * 2)  # int16 mono
+            recognizer.AcceptWaveform(silence)
+            recognizer.FinalResult()  # flushes and resets for the first real utterance
+            self.model, self.recognizer = model, recognizer
+        except Exception as e:
+            self.error = e
+        finally:
+            self.load_time = time.monotonic() - t0
+            self._ready.set()
+            if self.on_done:
+                try:
+                    self.on_done(self)
+                except Exception:
+                    pass
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until loading finished. Returns True if the model is usable."""
+        self._ready.wait(timeout)
+        return self.ready and self.error is None
+
+
+class ModelPool:
+    """
+    On-demand Vosk models by role (see core.config.model_for_role).
+    - loader(role) starts loading the role's model on first use; roles sharing a model
+      share one loader.
+    - Models idle for `idle_unload_sec` are dropped (except those serving `keep_roles`),
+      so a large dictation model only costs memory while it is being used.
+    - Load times and reported RTFs are persisted to the model stats file.
+    """
+    def __init__(
+        self,
+        cfg: dict,
+        sample_rate: int,
+        on_loaded: Optional[Callable[[str, ModelLoader], None]] = None,
+        on_unload: Optional[Callable[[ModelLoader], None]] = None,
+    ):
+        self.cfg = cfg
+        self.sample_rate = sample_rate
+        self.idle_unload_sec = float(cfg.get("model_idle_unload_sec", 0) or 0)
+        self.keep_roles = set(cfg.get("model_keep_loaded") or ())
+        self.on_loaded = on_loaded
+        self.on_unload = on_unload
+        self._loaders: Dict[str, ModelLoader] = {}   # model name -> loader
+        self._last_used: Dict[str, float] = {}
+        self._specs: Dict[str, object] = {}         # role -> ModelSpec (resolved once)
+        self._lock = threading.Lock()
+        self._reaper: threading.Thread | None = None
+
+    def spec(self, role: str):
+        if role not in self._specs:
+            from core.config import model_for_role
+            self._specs[role] = model_for_role(role, self.cfg)
+        return self._specs[role]
+
+    def loader(self, role: str) -> Optional[ModelLoader]:
+        spec = self.spec(role)
+        if spec is None:
+            return None
+        with self._lock:
+            self._last_used[spec.name] = time.monotonic()
+            ld = self._loaders.get(spec.name)
+            if ld is None or (ld.ready and ld.error is not None):
+                ld = ModelLoader(str(spec.path), self.sample_rate, on_done=lambda l, n=spec.name: self._loaded(n, l))
+                ld.name = spec.name
+                self._loaders[spec.name] = ld.start()
+                print(f"🔄 Loading model '{spec.name}' for {role}…")
+            self._start_reaper()
+            return ld
+
+    def touch(self, ld: ModelLoader) -> None:
+        """Mark a model as in use (postpones idle unload)."""
+        self._last_used[ld.name] = time.monotonic()
+
+    def _loaded(self, name: str, ld: ModelLoader) -> None:
+        if ld.error is None:
+            from core.config import record_model_stats
+            record_model_stats(name, load_time=ld.load_time)
+        if self.on_loaded:
+            self.on_loaded(name, ld)
+
+    def record_rtf(self, ld: ModelLoader, rtf: float) -> None:
+        from core.config import record_model_stats
+        record_model_stats(ld.name, rtf=rtf)
+
+    def _start_reaper(self) -> None:
+        if self._reaper is None and self.idle_unload_sec > 0:
+            self._reaper = threading.Thread(target=self._reap, name="model_reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap(self) -> None:
+        while True:
+            time.sleep(max(5.0, self.idle_unload_sec / 10))
+            keep = {s.name for s in (self.spec(r) for r in self.keep_roles) if s is not None}
+            cutoff = time.monotonic() - self.idle_unload_sec
+            with self._lock:
+                idle = [n for n, ld in self._loaders.items()
+                        if ld.ready and n not in keep and self._last_used.get(n, 0) < cutoff]
+                dropped = [self._loaders.pop(n) for n in idle]
+            for ld in dropped:
+                print(f"💤 Unloading idle model '{ld.name}'")
+                if self.on_unload:
+                    self.on_unload(ld)
+                ld.model = ld.recognizer = None  # last references; Kaldi frees on collection
+
+    def loaded(self) -> List[str]:
+        with self._lock:
+            return [n for n, ld in self._loaders.items() if ld.ready and ld.error is None]
+
+
+def _text(result_json: str) -> str:
+    return json.loads(result_json).get("text", "").strip().lower()
+
+
+class FullRecognizer:
+    """Open-vocabulary decoding with the same accept/flush interface as command mode."""
+    redecoded = 0  # bytes decoded a second time (never, here)
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+
+    def accept(self, data: bytes) -> Optional[str]:
+        """Feed one audio chunk. Returns the final transcript when an utterance ends."""
+        if self.recognizer.AcceptWaveform(data):
+            return _text(self.recognizer.Result())
+        return None
+
+    def flush(self) -> str:
+        """Force the current utterance to finish (e.g. the VAD saw it end)."""
+        return _text(self.recognizer.FinalResult())
+
+
+class CommandModeRecognizer:
+    """
+    Grammar-constrained decoding for fixed commands with open-vocabulary fallback.
+    - Decodes with a KaldiRecognizer limited to the command vocabulary (cheap per frame).
+    - Keeps the utterance audio; if `needs_full(text)` says the result is free-form
+      (unknown words, no intent, or a free-text intent like web search), the audio is
+      re-decoded with the full recognizer.
+    - `set_vocabulary()` rebuilds the grammar; the swap happens between utterances.
+    Note: grammars only take effect on models with a dynamic graph (most small models).
+    """
+    def __init__(
+        self,
+        model,
+        sample_rate: int,
+        full_recognizer,
+        vocabulary: List[str],
+        needs_full: Callable[[str], bool],
+    ):
+        self.model = model
+        self.sample_rate = sample_rate
+        self.full = full_recognizer
+        self.needs_full = needs_full
+        self._lock = threading.Lock()
+        self._pending = None
+        self._buf: List[bytes] = []
+        self.redecoded = 0  # bytes of utterance audio re-decoded by the full recognizer (running total)
+        self.command = self._build(vocabulary)
+
+    def _build(self, vocabulary: List[str]):
+        phrases = [p for p in vocabulary if p] + ["[unk]"]
+        return KaldiRecognizer(self.model, self.sample_rate, json.dumps(phrases))
+
+    def set_vocabulary(self, vocabulary: List[str]) -> None:
+        rec = self._build(vocabulary)
+        with self._lock:
+            self._pending = rec
+
+    def accept(self, data: bytes) -> Optional[str]:
+        """Feed one audio block. Returns the final transcript when an utterance ends."""
+        if not self._buf:
+            with self._lock:
+                if self._pending is not None:
+                    self.command, self._pending = self._pending, None
+        self._buf.append(data)
+        if not self.command.AcceptWaveform(data):
+            return None
+
+        return self._finish(_text(self.command.Result()))
+
+    def flush(self) -> str:
+        """Force the current utterance to finish (e.g. the VAD saw it end)."""
+        return self._finish(_text(self.command.FinalResult()))
+
+    def _finish(self, text: str) -> str:
+        audio = b"".join(self._buf)
+        self._buf.clear()
+        if text and self.needs_full(text):
+            self.redecoded += len(audio)
+            self.full.AcceptWaveform(audio)
+            text = _text(self.full.FinalResult())
+        return text
+
+
+class SecondPass:
+    """
+    Two-pass recognition: keep the current utterance's audio while a small model decodes
+    it; if the fast transcript needs free text (a search query, a file name), re-decode the
+    buffered audio with the large dictation model on a worker thread.
+    - add(chunk): audio that was fed to the fast decoder
+    - finish(text): utterance ended. Returns the text to act on now, or None when a
+      re-decode was queued; its result arrives through on_result(text, fast_text).
+    Boundaries follow the fast decoder's finals; with the VAD gate these are clean
+    utterance ends, without it a block straddling two utterances goes to the first.
+    """
+    def __init__(
+        self,
+        get_loader: Callable[[], Optional[ModelLoader]],
+        needs_second_pass: Callable[[str], bool],
+        on_result: Callable[[str, str], None],
+        sample_rate: int,
+        max_sec: float = 15.0,
+        load_timeout: float = 60.0,
+    ):
+        self.get_loader = get_loader
+        self.needs_second_pass = needs_second_pass
+        self.on_result = on_result
+        self.sample_rate = sample_rate
+        self.max_bytes = int(max_sec * sample_rate) * 2
+        self.load_timeout = load_timeout
+        self._buf = bytearray()
+        self._overflow = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asr_second_pass")
+        self._rec: tuple | None = None  # (loader, KaldiRecognizer), reused between utterances
+
+    def add(self, chunk: bytes) -> None:
+        if len(self._buf) + len(chunk) > self.max_bytes:
+            self._overflow = True  # too long to re-decode quickly; keep the fast result
+            return
+        self._buf += chunk
+
+    def reset(self) -> None:
+        self._buf = bytearray()
+        self._overflow = False
+
+    def finish(self, text: str) -> Optional[str]:
+        audio, overflow = bytes(self._buf), self._overflow
+        self.reset()
+        if overflow or not audio or not self.needs_second_pass(text):
+            return text
+        self._executor.submit(self._redecode, text, audio)
+        return None
+
+    def forget(self, ld: ModelLoader) -> None:
+        """Release the cached recognizer of an unloaded model."""
+        if self._rec is not None and self._rec[0] is ld:
+            self._rec = None
+
+    def _recognizer(self, ld: ModelLoader) -> KaldiRecognizer:
+        if self._rec is None or self._rec[0] is not ld:
+            self._rec = (ld, KaldiRecognizer(ld.model, self.sample_rate))
+        return self._rec[1]
+
+    def _redecode(self, fast_text: str, audio: bytes) -> None:
+        text = fast_text
+        try:
+            ld = self.get_loader()
+            if ld is not None and ld.wait(self.load_timeout):
+                rec = self._recognizer(ld)
+                rec.AcceptWaveform(audio)
+                text = _text(rec.FinalResult()) or fast_text
+        except Exception as e:
+            print(f"⚠️ Second pass failed, keeping fast transcript: {e}")
+        self.on_result(text, fast_text)
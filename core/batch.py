@@ -0,0 +1,228 @@
+# core/batch.py
+"""
+Offline batch transcription + intent labeling over WAV corpora.
+
+Each worker process loads the Vosk model once. Vosk reads the model graph into the
+worker's own heap (it is not shared between processes), so N workers cost N times the
+model's memory: roughly the model folder's size each; pick --workers accordingly.
+
+Files are decoded with the full recognizer in the same block size as the live mic path
+(no VAD gate or command grammar). Every final the recognizer produces is one utterance,
+dispatched on its own like a live command (multi-command splitting, fallback, handlers)
+inside the replay sandbox (core/replay.py): handlers run, but their processes, browser,
+network, volume and timers are recorded instead of performed, and `speak` is captured.
+
+Output is one JSON object per file:
+    {"file": ..., "audio_sec": ..., "transcript": ..., "skill": ..., "intent": ...,
+     "slots": {...}, "replies": [...],
+     "utterances": [{"transcript", "skill", "intent", "slots", "commands", "replies", "side_effects"}, ...],
+     "timings": {"read": s, "decode": s, "dispatch": s}, "rtf": ...}
+(top-level skill/intent/slots: the first handled utterance) and a summary with
+throughput in audio-seconds per wall-second.
+
+Run:  python leo.py batch recordings/ [--out labels.jsonl] [--workers 8] [--model NAME|PATH]
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+import time
+import wave
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+CHUNK_BYTES = 8000  # same block size as the live mic stream (16 kHz int16, 0.25 s)
+
+# Per-worker state, set by _init_worker
+_model = None
+
+
+def _init_worker(model_path: str, fallback_threshold: Optional[float] = None) -> None:
+    global _model
+    sys.stdout = sys.stderr  # skill-loading chatter must not mix into JSONL on stdout
+    from vosk import Model, SetLogLevel
+    SetLogLevel(-1)
+    _model = Model(model_path)
+    from skills.registry import load_skills, set_fallback_threshold
+    set_fallback_threshold(fallback_threshold)
+    load_skills()
+
+
+def _read_wav(path: Path):
+    with wave.open(str(path), "rb") as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError("need mono 16-bit PCM WAV")
+        return wf.readframes(wf.getnframes()), wf.getframerate()
+
+
+def _read_audio(path: Path):
+    if path.suffix.lower() == ".flac":  # e.g. clips from core/capture.py
+        import soundfile
+        data, rate = soundfile.read(str(path), dtype="int16")
+        if data.ndim != 1:
+            raise ValueError("need mono audio")
+        return data.tobytes(), rate
+    return _read_wav(path)
+
+
+def _json_safe(value: Any) -> Any:
+    return value if isinstance(value, (str, int, float, bool)) or value is None else str(value)
+
+
+def _dispatch(text: str) -> Dict[str, Any]:
+    """Dispatch one utterance in the replay sandbox; what it matched, said and tried to do."""
+    from core.replay import CONTROL_PHRASES, sandbox
+    from skills.registry import dispatch_match, split_commands
+
+    utt: Dict[str, Any] = {"transcript": text, "skill": None, "intent": None, "slots": {},
+                           "commands": [], "replies": [], "side_effects": []}
+    if any(k in text for k in CONTROL_PHRASES):
+        utt["control"] = True  # exit/sleep words are handled by leo.py, never dispatched
+        return utt
+    commands = split_commands(text)
+    if commands is not None:
+        utt["commands"] = [c.intent.name for _, c, _ in commands]
+    with sandbox(utt["side_effects"]):
+        m = dispatch_match(text, utt["replies"].append)
+    if m is not None:
+        utt.update(skill=m.skill.name, intent=m.intent.name,
+                   slots={k: _json_safe(v) for k, v in m.slots.items()})
+    return utt
+
+
+def process_file(path: str) -> Dict[str, Any]:
+    """Decode one file and dispatch each utterance in the sandbox (runs in a worker process)."""
+    from vosk import KaldiRecognizer
+
+    rec: Dict[str, Any] = {"file": path}
+    try:
+        t0 = time.perf_counter()
+        pcm, rate = _read_audio(Path(path))
+        t1 = time.perf_counter()
+
+        recognizer = KaldiRecognizer(_model, rate)
+        texts: List[str] = []
+        for i in range(0, len(pcm), CHUNK_BYTES):
+            if recognizer.AcceptWaveform(pcm[i:i + CHUNK_BYTES]):
+                texts.append(json.loads(recognizer.Result()).get("text", ""))
+        texts.append(json.loads(recognizer.FinalResult()).get("text", ""))
+        transcript = " ".join(t.strip() for t in texts if t.strip()).lower()
+        t2 = time.perf_counter()
+
+        utterances = [_dispatch(t.strip().lower()) for t in texts if t.strip()]
+        t3 = time.perf_counter()
+
+        first = next((u for u in utterances if u["intent"]), None)
+        audio_sec = len(pcm) / 2 / rate
+        rec.update(
+            audio_sec=round(audio_sec, 3),
+            transcript=transcript,
+            skill=first["skill"] if first else None,
+            intent=first["intent"] if first else None,
+            slots=first["slots"] if first else {},
+            replies=[r for u in utterances for r in u["replies"]],
+            utterances=utterances,
+            timings={"read": round(t1 - t0, 4), "decode": round(t2 - t1, 4), "dispatch": round(t3 - t2, 6)},
+            rtf=round((t2 - t1) / audio_sec, 4) if audio_sec else None,
+        )
+    except Exception as e:
+        rec["error"] = f"{type(e).__name__}: {e}"
+    return rec
+
+
+def find_wavs(inputs: List[Path]) -> List[Path]:
+    files: List[Path] = []
+    for p in inputs:
+        if p.is_dir():
+            files += sorted(p.rglob("*.wav")) + sorted(p.rglob("*.flac"))
+        elif p.suffix.lower() in (".wav", ".flac"):
+            files.append(p)
+    return files
+
+
+def run_batch(files: List[Path], model_path: str, out, workers: int = 0,
+              fallback_threshold: Optional[float] = None) -> Dict[str, Any]:
+    """Process `files` on a process pool, writing JSONL to `out`; returns the summary."""
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    audio = decode = 0.0
+    errors = 0
+    intents: Counter = Counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model_path, fallback_threshold)) as pool:
+        chunksize = max(1, len(files) // (workers * 8))
+        for n, rec in enumerate(pool.map(process_file, [str(f) for f in files], chunksize=chunksize), 1):
+            out.write(json.dumps(rec) + "\n")
+            if "error" in rec:
+                errors += 1
+                continue
+            audio += rec["audio_sec"]
+            decode += rec["timings"]["decode"]
+            intents[rec["intent"] or "(none)"] += 1
+            if n % 100 == 0:
+                print(f"… {n}/{len(files)} files", file=sys.stderr)
+    wall = time.perf_counter() - t0
+    return {
+        "files": len(files),
+        "errors": errors,
+        "workers": workers,
+        "audio_sec": round(audio, 1),
+        "wall_sec": round(wall, 2),
+        "throughput": round(audio / wall, 2) if wall else None,  # audio-seconds per wall-second
+        "mean_rtf": round(decode / audio, 4) if audio else None,  # per-worker decode cost
+        "intents": dict(intents.most_common()),
+    }
+
+
+def _resolve_model(name: Optional[str]) -> Optional[str]:
+    from core.config import load_config, list_models, model_for_role
+    cfg = load_config()
+    if name:
+        models = list_models(cfg)
+        if name in models:
+            return str(models[name].path)
+        return name if Path(name).exists() else None
+    spec = model_for_role("dictation", cfg)
+    return str(spec.path) if spec else None
+
+
+def main(argv: List[str] | None = None):
+    ap = argparse.ArgumentParser(prog="leo batch", description="Transcribe WAV files and label intents (sandboxed dispatch)")
+    ap.add_argument("inputs", nargs="+", type=Path, help="WAV/FLAC files or directories (searched recursively)")
+    ap.add_argument("--out", type=Path, help="JSONL output (default: stdout)")
+    ap.add_argument("--workers", type=int, default=0, help="processes (default: CPU cores)")
+    ap.add_argument("--model", help="registry name or path (default: the dictation model)")
+    args = ap.parse_args(argv)
+
+    files = find_wavs(args.inputs)
+    if not files:
+        print("No WAV files found.", file=sys.stderr)
+        return 1
+    model_path = _resolve_model(args.model)
+    if model_path is None:
+        print("⚠️ No Vosk model found; pass --model or configure models_dir.", file=sys.stderr)
+        return 1
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        from core.config import load_config
+        threshold = float(load_config().get("intent_fallback_threshold", 0) or 0)
+        summary = run_batch(files, model_path, out, args.workers, threshold if threshold > 0 else None)
+    finally:
+        if args.out:
+            out.close()
+    print(
+        f"⏱️ {summary['files']} files ({summary['errors']} errors), {summary['audio_sec']}s audio in "
+        f"{summary['wall_sec']}s on {summary['workers']} workers: {summary['throughput']} audio-s/wall-s, "
+        f"mean RTF {summary['mean_rtf']}",
+        file=sys.stderr,
+    )
+    print(json.dumps(summary), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
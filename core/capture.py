@@ -0,0 +1,150 @@
+# core/capture.py
+"""
+Diagnostic audio capture: what the recognizer actually heard, per utterance.
+
+- add(pcm) copies every chunk fed to Kaldi into a preallocated int16 ring buffer
+  holding the last `seconds` of audio (no allocation on the audio path).
+- cut(transcript) closes the current utterance: its samples are copied out of the ring
+  once and handed to a background writer; the target path is returned immediately so
+  the history entry can link to it.
+- The writer saves FLAC (needs soundfile) or WAV, appends {"file", "transcript", "time"}
+  to index.jsonl (readable by `leo replay`; the clips by `leo batch`), and deletes the
+  oldest clips while clips + index are over `max_mb`; the index is then rewritten
+  without the deleted clips' entries.
+"""
+from __future__ import annotations
+import json
+import queue
+import threading
+import time
+import wave
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+try:
+    import soundfile
+    HAVE_SOUNDFILE = True
+except Exception:
+    HAVE_SOUNDFILE = False
+
+CLIP_SUFFIXES = (".flac", ".wav")
+
+
+class AudioCapture:
+    def __init__(
+        self,
+        out_dir: Path,
+        sample_rate: int = 16000,
+        seconds: float = 30.0,
+        max_mb: float = 200.0,
+        fmt: str = "flac",
+    ):
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.sample_rate = sample_rate
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        if fmt == "flac" and not HAVE_SOUNDFILE:
+            print("ℹ️ soundfile not available; capturing WAV instead of FLAC.")
+            fmt = "wav"
+        self.fmt = fmt
+
+        self._ring = np.zeros(int(sample_rate * seconds), dtype=np.int16)
+        self._written = 0     # total samples ever added (ring position = _written % len)
+        self._utt_start = 0   # sample index where the current utterance began
+        self._seq = 0
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name="audio_capture", daemon=True)
+        self._thread.start()
+
+    # ---------- Audio path (audio_processor thread) ----------
+    def add(self, pcm: bytes) -> None:
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        size = len(self._ring)
+        if len(samples) >= size:
+            self._written += len(samples) - size
+            samples = samples[-size:]
+        pos = self._written % size
+        first = min(len(samples), size - pos)
+        self._ring[pos:pos + first] = samples[:first]
+        self._ring[:len(samples) - first] = samples[first:]
+        self._written += len(samples)
+
+    def mark(self) -> None:
+        """Start a new utterance here (drops anything since the last cut)."""
+        self._utt_start = self._written
+
+    def cut(self, transcript: str) -> Optional[Path]:
+        """End the current utterance; returns the path its clip will be written to."""
+        size = len(self._ring)
+        n = min(self._written - self._utt_start, size)
+        self._utt_start = self._written
+        if n <= 0:
+            return None
+        end = self._written % size
+        start = (end - n) % size
+        if start < end:
+            clip = self._ring[start:end].copy()
+        else:
+            clip = np.concatenate((self._ring[start:], self._ring[:end]))
+        self._seq += 1
+        path = self.out_dir / f"utt_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{self._seq:04d}.{self.fmt}"
+        self._jobs.put((path, clip, transcript))
+        return path
+
+    # ---------- Writer thread ----------
+    def _writer(self):
+        while True:
+            path, clip, transcript = self._jobs.get()
+            try:
+                if self.fmt == "flac":
+                    soundfile.write(str(path), clip, self.sample_rate, format="FLAC", subtype="PCM_16")
+                else:
+                    with wave.open(str(path), "wb") as wf:
+                        wf.setnchannels(1)
+                        wf.setsampwidth(2)
+                        wf.setframerate(self.sample_rate)
+                        wf.writeframes(clip.tobytes())
+                with open(self.out_dir / "index.jsonl", "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"file": path.name, "transcript": transcript, "time": time.time()}) + "\n")
+                self._rotate()
+            except Exception as e:
+                print(f"⚠️ Audio capture write failed: {e}")
+            finally:
+                self._jobs.task_done()
+
+    def _rotate(self) -> None:
+        index = self.out_dir / "index.jsonl"
+        clips = sorted((p for p in self.out_dir.iterdir() if p.suffix in CLIP_SUFFIXES), key=lambda p: p.name)
+        total = sum(p.stat().st_size for p in clips) + (index.stat().st_size if index.exists() else 0)
+        deleted = set()
+        while clips and total > self.max_bytes:
+            oldest = clips.pop(0)
+            total -= oldest.stat().st_size
+            oldest.unlink(missing_ok=True)
+            deleted.add(oldest.name)
+        if deleted:
+            self._prune_index(index, deleted)
+
+    def _prune_index(self, index: Path, deleted: set) -> None:
+        """Rewrite index.jsonl without entries for deleted clips (atomic replace)."""
+        keep = []
+        with open(index, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    if json.loads(line).get("file") in deleted:
+                        continue
+                except ValueError:
+                    continue
+                keep.append(line)
+        tmp = index.with_suffix(".jsonl.tmp")
+        tmp.write_text("".join(keep), encoding="utf-8")
+        tmp.replace(index)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait (up to `timeout`) for queued clips to be written."""
+        deadline = time.monotonic() + timeout
+        while self._jobs.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.02)
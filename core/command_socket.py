@@ -0,0 +1,163 @@
+# core/command_socket.py
+"""
+Local command socket: drive a running (warm) Leo with text instead of speech.
+
+The assistant listens on a Unix domain socket (a named pipe on Windows) through
+multiprocessing.connection. Each request goes through the same dispatch + speak path
+as a voice command; the reply carries the intent and the spoken text, and the client
+decides whether the assistant should also say it out loud.
+
+Connections are authenticated with a random key kept next to the socket (mode 0600),
+so only the local user who started Leo can send commands.
+
+    request : {"text": "search file report", "speak": false}
+    response: {"handled": true, "intent": "search_file", "skill": "file_search",
+               "replies": ["..."], "seconds": 0.004}
+
+Client:  python leo_cli.py "search file report" [--speak] [--json]
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from core.config import ROOT
+
+KEY_PATH = ROOT / "cache" / "command_socket.key"
+
+Handler = Callable[[str, bool], Dict[str, Any]]
+
+
+def default_address() -> str:
+    if sys.platform.startswith("win"):
+        return r"\\.\pipe\leo-" + os.environ.get("USERNAME", "user")
+    return str(ROOT / "cache" / "leo.sock")
+
+
+def _family(address: str) -> str:
+    return "AF_PIPE" if address.startswith("\\\\") else "AF_UNIX"
+
+
+def _authkey(create: bool) -> Optional[bytes]:
+    if KEY_PATH.exists():
+        return KEY_PATH.read_bytes()
+    if not create:
+        return None
+    KEY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    key = secrets.token_bytes(32)
+    fd = os.open(KEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+class CommandServer:
+    """
+    Accepts text commands on `address`; `handler(text, speak_aloud)` does the dispatch and
+    returns the response dict. Each connection is served on its own daemon thread.
+    """
+    def __init__(self, handler: Handler, address: Optional[str] = None):
+        self.handler = handler
+        self.address = address or default_address()
+        self._listener: Optional[Listener] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "CommandServer":
+        family = _family(self.address)
+        if family == "AF_UNIX":
+            Path(self.address).parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.unlink(self.address)  # stale socket from a previous run
+            except FileNotFoundError:
+                pass
+        self._listener = Listener(self.address, family=family, authkey=_authkey(create=True))
+        if family == "AF_UNIX":
+            os.chmod(self.address, 0o600)
+        self._thread = threading.Thread(target=self._accept_loop, name="command_socket", daemon=True)
+        self._thread.start()
+        print(f"🔌 Command socket: {self.address}")
+        return self
+
+    def _accept_loop(self):
+        while self._listener is not None:
+            try:
+                conn = self._listener.accept()
+            except Exception:
+                if self._listener is None:
+                    return
+                continue  # failed handshake (wrong key) or a client that went away
+            threading.Thread(target=self._serve, args=(conn,), name="command_client", daemon=True).start()
+
+    def _serve(self, conn):
+        with conn:
+            while True:
+                try:
+                    req = conn.recv()
+                except (EOFError, OSError):
+                    return
+                text = str((req or {}).get("text") or "").strip().lower()
+                if not text:
+                    conn.send({"error": "empty command"})
+                    continue
+                t0 = time.perf_counter()
+                try:
+                    resp = self.handler(text, bool(req.get("speak", False)))
+                except Exception as e:
+                    resp = {"error": f"{type(e).__name__}: {e}"}
+                resp["seconds"] = round(time.perf_counter() - t0, 4)
+                conn.send(resp)
+
+    def close(self):
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.close()
+
+
+def send(text: str, speak: bool = False, address: Optional[str] = None, timeout: float = 30.0) -> Dict[str, Any]:
+    """Send one command to a running Leo and return its response."""
+    address = address or default_address()
+    authkey = _authkey(create=False)
+    if authkey is None:
+        raise ConnectionError("no command socket key; is Leo running with command_socket_enabled?")
+    with Client(address, family=_family(address), authkey=authkey) as conn:
+        conn.send({"text": text, "speak": speak})
+        if not conn.poll(timeout):
+            raise TimeoutError(f"no reply within {timeout:.0f}s")
+        return conn.recv()
+
+
+def main(argv: List[str] | None = None):
+    ap = argparse.ArgumentParser(prog="leo-cli", description="Send a text command to a running Leo")
+    ap.add_argument("text", nargs="+", help='the command, e.g. "search file report"')
+    ap.add_argument("--speak", action="store_true", help="also say the reply out loud")
+    ap.add_argument("--json", action="store_true", help="print the raw response")
+    ap.add_argument("--address", help=f"socket path / pipe name (default: {default_address()})")
+    args = ap.parse_args(argv)
+
+    try:
+        resp = send(" ".join(args.text), speak=args.speak, address=args.address)
+    except (OSError, AuthenticationError) as e:
+        print(f"⚠️ Could not reach Leo: {e}", file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps(resp))
+    elif "error" in resp:
+        print(f"⚠️ {resp['error']}", file=sys.stderr)
+    else:
+        for line in resp.get("replies") or []:
+            print(line)
+        if not resp.get("handled"):
+            print("(no matching command)", file=sys.stderr)
+    return 0 if resp.get("handled") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,12 @@
 # core/config.py
 import os
+import sys
 import json
+import tempfile
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 from .constants import ASSISTANT_NAME
 
@@ -19,6 +23,7 @@ _DEFAULTS: Dict[str, Any] = {
     # Wake word
     "wake_word": ASSISTANT_NAME.lower(),
     "wake_sensitivity": 0.7,
+    "wake_backend": "auto",        # "porcupine" | "vosk" (keyword spotting on the command model) | "auto"
 
     # UX
     "beep_on_wake": True,
@@ -27,7 +32,92 @@ _DEFAULTS: Dict[str, Any] = {
     # NEW: overlay + history
     "overlay_enabled": True,
     "history_enabled": True,
-    "history_dir": "logs"
+    "history_dir": "logs",
+
+    # Skills: pick up edits in skills/ without restarting
+    "skills_hot_reload": True,
+    "skills_reload_interval_sec": 1.0,
+
+    # Recognition: decode fixed commands with a skill-vocabulary grammar,
+    # falling back to open vocabulary for free-form intents
+    "command_grammar": False,
+
+    # Voice-activity gate: only speech (+ padding) is sent to the recognizer
+    "vad_enabled": True,
+    "vad_backend": "energy",       # "energy" (NumPy) | "webrtc" (needs webrtcvad)
+    "vad_aggressiveness": 2,       # 0..3, higher = stricter speech detection
+    "vad_padding_ms": 300,
+
+    # Fixed replies pre-rendered to PCM on disk
+    "tts_cache_enabled": True,
+    "tts_cache_dir": "cache/tts",
+
+    # Volume control: "auto" | "pycaw" | "keys" | "wpctl" | "pactl" | "osascript" | "fake"
+    "volume_backend": "auto",
+
+    # Server mode (python leo.py serve)
+    "server_host": "127.0.0.1",
+    "server_port": 8765,
+    "server_workers": 0,           # 0 = one decode worker per CPU core
+
+    # Metrics (Prometheus text format): HTTP endpoint on localhost and/or a file
+    "metrics_port": 0,             # 0 = no HTTP endpoint
+    "metrics_host": "127.0.0.1",
+    "metrics_dump_path": "",       # e.g. "logs/metrics.prom"; rewritten after each session
+
+    # Diagnostics written to history_dir per session (off: no cost)
+    "profile_enabled": False,      # sampling profiler -> profile_<stamp>.collapsed
+    "profile_interval_ms": 10,
+    "profile_threads": "MainThread,audio_processor,prefetch,asr,app_index,tts_cache",
+    "tracemalloc_enabled": False,  # allocation growth between sessions -> alloc_<stamp>.txt
+    "capture_enabled": False,      # per-utterance audio as the recognizer heard it -> capture_dir
+    "capture_dir": "logs/audio",
+    "capture_seconds": 30,         # ring buffer length (longest clip)
+    "capture_max_mb": 200,         # oldest clips are deleted beyond this
+    "capture_format": "flac",      # "flac" (needs soundfile) | "wav"
+
+    # Fallback intent classifier (n-gram TF-IDF) for transcripts no pattern matches
+    # ("value up" -> volume up): minimum cosine score to act on its guess, which must also
+    # beat every other intent by a margin; 0 = off. Only intents with `examples` (reversible,
+    # slot-free ones) are eligible.
+    "intent_fallback_threshold": 0.6,
+
+    # Real-time factor (decode time / audio time) monitoring with stepwise degradation:
+    # above rtf_high for a window, apply the next step; below rtf_low for longer, undo one
+    "rtf_monitor_enabled": True,
+    "rtf_high": 0.8,
+    "rtf_low": 0.4,
+    "rtf_window_blocks": 10,
+    "rtf_degrade_steps": "block_size,grammar,fallback_model",
+    "degraded_block_size": 4000,
+    "fallback_model_path": "",     # shorthand for a model named "fallback" in "models" (the fallback role's default)
+
+    # Vosk models: every model folder under models_dir, plus named paths in "models".
+    # Roles pick a model by name; "auto" = smallest for commands on Linux (speed),
+    # largest otherwise. Models load on first use and unload after an idle period.
+    "models_dir": "models",
+    "models": {"vosk-model-en-in-0.5": r"D:\AI Models\J A R V I S\vosk-model-en-in-0.5"} if sys.platform == "win32" else {},
+    "model_roles": {"command": "auto", "dictation": "auto", "fallback": ""},
+    "model_idle_unload_sec": 900,  # 0 = keep everything loaded
+    "model_keep_loaded": ["command"],
+
+    # Two-pass: commands use the command model's transcript; requests with free text
+    # (search queries, file names) are re-decoded with the dictation model on a worker
+    "two_pass": True,
+    "two_pass_max_sec": 15,
+
+    # Network health (core/net.py): short timeouts, per-host circuit breakers and a
+    # background reachability probe so web skills fail fast instead of hanging
+    "net_connect_timeout": 2.0,
+    "net_read_timeout": 6.0,
+    "net_breaker_failures": 3,     # consecutive failures before a host's breaker opens
+    "net_breaker_reset_sec": 30,   # first retry after opening (doubles while still failing)
+    "net_probe_interval_sec": 15,  # 0 = no probe
+    "net_probe_hosts": "1.1.1.1:53,8.8.8.8:53",  # advisory: a successful real request overrules it
+
+    # Local command socket for leo_cli.py (Unix socket / Windows named pipe)
+    "command_socket_enabled": True,
+    "command_socket_address": ""   # "" = cache/leo.sock, or \\.\pipe\leo-<user> on Windows
 }
 
 # Supported API keys for quick diagnostics
@@ -67,12 +157,65 @@ def load_config() -> Dict[str, Any]:
     env_map = {
         "WAKE_WORD": ("wake_word", str),
         "WAKE_SENSITIVITY": ("wake_sensitivity", float),
+        "WAKE_BACKEND": ("wake_backend", str),
         "WAKE_BEEP": ("beep_on_wake", lambda v: str(v).strip().lower() in ("1", "true", "yes", "y")),
         "SESSION_TIMEOUT_SEC": ("session_timeout_sec", int),
 
         "OVERLAY_ENABLED": ("overlay_enabled", lambda v: str(v).strip().lower() in ("1", "true", "yes", "y")),
         "HISTORY_ENABLED": ("history_enabled", lambda v: str(v).strip().lower() in ("1", "true", "yes", "y")),
         "HISTORY_DIR": ("history_dir", str),
+
+        "SKILLS_HOT_RELOAD": ("skills_hot_reload", lambda v: str(v).strip().lower() in ("1", "true", "yes", "y")),
+        "SKILLS_RELOAD_INTERVAL_SEC": ("skills_reload_interval_sec", float),
+        "COMMAND_GRAMMAR": ("command_grammar", lambda v: str(v).strip().lower() in ("1", "true", "yes", "y")),
+        "VAD_ENABLED": ("vad_enabled", lambda v: str(v).strip().lower() in ("1", "true", "yes", "y")),
+        "VAD_BACKEND": ("vad_backend", str),
+        "VAD_AGGRESSIVENESS": ("vad_aggressiveness", int),
+        "VAD_PADDING_MS": ("vad_padding_ms", int),
+
+        "TTS_CACHE_ENABLED": ("tts_cache_enabled", lambda v: str(v).strip().lower() in ("1", "true", "yes", "y")),
+        "TTS_CACHE_DIR": ("tts_cache_dir", str),
+
+        "VOLUME_BACKEND": ("volume_backend", str),
+
+        "SERVER_HOST": ("server_host", str),
+        "SERVER_PORT": ("server_port", int),
+        "SERVER_WORKERS": ("server_workers", int),
+
+        "METRICS_PORT": ("metrics_port", int),
+        "METRICS_HOST": ("metrics_host", str),
+        "METRICS_DUMP_PATH": ("metrics_dump_path", str),
+
+        "PROFILE_ENABLED": ("profile_enabled", lambda v: str(v).strip().lower() in ("1", "true", "yes", "y")),
+        "PROFILE_INTERVAL_MS": ("profile_interval_ms", int),
+        "PROFILE_THREADS": ("profile_threads", str),
+        "TRACEMALLOC_ENABLED": ("tracemalloc_enabled", lambda v: str(v).strip().lower() in ("1", "true", "yes", "y")),
+
+        "RTF_MONITOR_ENABLED": ("rtf_monitor_enabled", lambda v: str(v).strip().lower() in ("1", "true", "yes", "y")),
+        "RTF_HIGH": ("rtf_high", float),
+        "RTF_LOW": ("rtf_low", float),
+        "RTF_WINDOW_BLOCKS": ("rtf_window_blocks", int),
+        "RTF_DEGRADE_STEPS": ("rtf_degrade_steps", str),
+        "DEGRADED_BLOCK_SIZE": ("degraded_block_size", int),
+        "FALLBACK_MODEL_PATH": ("fallback_model_path", str),
+        "MODELS_DIR": ("models_dir", str),
+        "MODEL_IDLE_UNLOAD_SEC": ("model_idle_unload_sec", float),
+        "TWO_PASS": ("two_pass", lambda v: str(v).strip().lower() in ("1", "true", "yes", "y")),
+        "TWO_PASS_MAX_SEC": ("two_pass_max_sec", float),
+        "NET_CONNECT_TIMEOUT": ("net_connect_timeout", float),
+        "NET_READ_TIMEOUT": ("net_read_timeout", float),
+        "NET_BREAKER_FAILURES": ("net_breaker_failures", int),
+        "NET_BREAKER_RESET_SEC": ("net_breaker_reset_sec", float),
+        "NET_PROBE_INTERVAL_SEC": ("net_probe_interval_sec", float),
+        "NET_PROBE_HOSTS": ("net_probe_hosts", str),
+        "COMMAND_SOCKET_ENABLED": ("command_socket_enabled", lambda v: str(v).strip().lower() in ("1", "true", "yes", "y")),
+        "COMMAND_SOCKET_ADDRESS": ("command_socket_address", str),
+        "CAPTURE_ENABLED": ("capture_enabled", lambda v: str(v).strip().lower() in ("1", "true", "yes", "y")),
+        "CAPTURE_DIR": ("capture_dir", str),
+        "CAPTURE_SECONDS": ("capture_seconds", float),
+        "CAPTURE_MAX_MB": ("capture_max_mb", float),
+        "CAPTURE_FORMAT": ("capture_format", str),
+        "INTENT_FALLBACK_THRESHOLD": ("intent_fallback_threshold", float),
     }
     for env_name, (cfg_key, caster) in env_map.items():
         val = os.getenv(env_name)
@@ -82,8 +225,118 @@ def load_config() -> Dict[str, Any]:
             except Exception:
                 pass
 
+    # Per-role model overrides: MODEL_COMMAND=vosk-model-small-en-us-0.15, MODEL_DICTATION=...
+    roles = dict(_DEFAULTS["model_roles"], **(cfg.get("model_roles") or {}))
+    for role in list(roles):
+        val = os.getenv(f"MODEL_{role.upper()}")
+        if val:
+            roles[role] = val
+    cfg["model_roles"] = roles
+
     return cfg
 
+# ---------- Vosk model registry ----------
+MODEL_STATS_PATH = ROOT / "cache" / "models.json"
+
+@dataclass
+class ModelSpec:
+    name: str
+    path: Path
+    size_mb: float
+    load_time: Optional[float] = None  # seconds, last measured load + warm-up
+    rtf: Optional[float] = None        # decode real-time factor, averaged over sessions
+
+def _is_vosk_model(path: Path) -> bool:
+    return path.is_dir() and ((path / "am").is_dir() or (path / "conf" / "model.conf").is_file())
+
+def _dir_size_mb(path: Path) -> float:
+    total = 0
+    for root, _, files in os.walk(path):
+        for f in files:
+            try:
+                total += os.path.getsize(os.path.join(root, f))
+            except OSError:
+                pass
+    return total / 1e6
+
+def _load_model_stats() -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(MODEL_STATS_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+_model_stats_lock = threading.Lock()  # loader threads and the audio thread all record
+
+def record_model_stats(name: str, **stats: Any) -> None:
+    """Persist measurements for a model (load_time, rtf, size_mb); rtf is smoothed."""
+    with _model_stats_lock:
+        data = _load_model_stats()
+        entry = data.setdefault(name, {})
+        for key, value in stats.items():
+            if value is None:
+                continue
+            if key == "rtf" and entry.get("rtf") is not None:
+                value = 0.7 * float(entry["rtf"]) + 0.3 * float(value)
+            entry[key] = round(float(value), 4)
+        try:
+            MODEL_STATS_PATH.parent.mkdir(parents=True, exist_ok=True)
+            # Unique temp file: another process (leo batch workers) may be saving too
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=MODEL_STATS_PATH.parent,
+                                             prefix=MODEL_STATS_PATH.stem, suffix=".tmp", delete=False) as f:
+                json.dump(data, f, indent=2)
+            Path(f.name).replace(MODEL_STATS_PATH)
+        except OSError:
+            pass
+
+def list_models(cfg: Optional[Dict[str, Any]] = None) -> Dict[str, ModelSpec]:
+    """All known models, smallest first: named in config, then found under models_dir."""
+    cfg = cfg or load_config()
+    paths: Dict[str, Path] = {}
+    for name, path in (cfg.get("models") or {}).items():
+        paths[name] = Path(path)
+    models_dir = Path(cfg.get("models_dir") or "models")
+    if not models_dir.is_absolute():
+        models_dir = ROOT / models_dir
+    if models_dir.is_dir():
+        for d in sorted(models_dir.iterdir()):
+            if _is_vosk_model(d):
+                paths.setdefault(d.name, d)
+    if cfg.get("fallback_model_path"):
+        paths.setdefault("fallback", Path(cfg["fallback_model_path"]))
+
+    stats = _load_model_stats()
+    specs: Dict[str, ModelSpec] = {}
+    for name, path in paths.items():
+        if not path.exists():
+            continue
+        st = stats.get(name, {})
+        size = st.get("size_mb")
+        if size is None:
+            size = _dir_size_mb(path)
+            record_model_stats(name, size_mb=size)  # walking a large model is slow; do it once
+        specs[name] = ModelSpec(name, path, float(size), st.get("load_time"), st.get("rtf"))
+    return dict(sorted(specs.items(), key=lambda kv: kv[1].size_mb))
+
+def model_for_role(role: str, cfg: Optional[Dict[str, Any]] = None) -> Optional[ModelSpec]:
+    """The model configured for `role` ("command", "dictation", "fallback"), or None."""
+    cfg = cfg or load_config()
+    models = list_models(cfg)
+    wanted = str((cfg.get("model_roles") or {}).get(role, "auto") or "")
+    if role == "fallback" and not wanted:
+        return models.get("fallback")
+    if wanted and wanted != "auto":
+        if wanted in models:
+            return models[wanted]
+        path = Path(wanted)  # a path works too
+        return ModelSpec(path.name, path, 0.0) if path.exists() else None
+    if not models:
+        return None
+    ordered = list(models.values())
+    small_first = role == "fallback" or (role == "command" and sys.platform.startswith("linux"))
+    return ordered[0] if small_first else ordered[-1]
+
 def get_key(name: str) -> str:
     """Get an API key by name: env > config.json. Raise if missing."""
     val = os.getenv(name)
@@ -0,0 +1,281 @@
+# core/metrics.py
+"""
+In-process metrics: counters, gauges and histograms, exported in Prometheus text format.
+
+Recording is lock-light so it can sit on the audio path: every thread writes to its own
+shard (a plain dict reached through threading.local), so inc()/observe() never contend.
+Shards are summed only when the registry is rendered; when a thread exits, its shard is
+folded into the metric's base totals and dropped, so short-lived threads don't pile up.
+
+    from core import metrics
+    DISPATCH = metrics.counter("leo_dispatch_total", "Dispatched commands", ("skill", "intent"))
+    DISPATCH.inc(skill="volume", intent="volume_up")
+    with metrics.timer(HANDLER_SECONDS, skill="volume"):
+        ...
+
+Expose with start_http_server(host, port) (GET /metrics) or write with dump(path).
+"""
+from __future__ import annotations
+import abc
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Seconds; tuned for command latencies (decode chunks, handlers, TTS)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) and not v.is_integer() else str(int(v))
+
+
+class _ShardHolder:
+    """Per-thread owner of a shard; collected (and the shard retired) when its thread exits."""
+    __slots__ = ("shard", "__weakref__")
+
+    def __init__(self):
+        self.shard: dict = {}
+
+
+class _Metric(abc.ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._base: dict = {}  # totals folded in from shards of exited threads
+        self._shards_lock = threading.Lock()  # taken once per thread, on its first write and at exit
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _shard(self) -> dict:
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            holder = self._local.holder = _ShardHolder()
+            with self._shards_lock:
+                self._shards.append(holder.shard)
+            # The thread's locals die with it; the holder's finalizer keeps its counts
+            weakref.finalize(holder, self._retire, holder.shard)
+        return holder.shard
+
+    def _retire(self, shard: dict) -> None:
+        with self._shards_lock:
+            self._shards = [s for s in self._shards if s is not shard]
+            self._fold(self._base, shard)
+
+    def _fold(self, base: dict, shard: dict) -> None:
+        """Add a retired shard's values into `base` (numbers; Histogram overrides)."""
+        for key, v in shard.items():
+            base[key] = base.get(key, 0) + v
+
+    def _snapshot(self) -> List[dict]:
+        with self._shards_lock:
+            return [dict(self._base)] + [dict(s) for s in self._shards]
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    @abc.abstractmethod
+    def _samples(self) -> List[str]:
+        """Prometheus sample lines for this metric."""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = self._key(labels)
+        return sum(s.get(key, 0) for s in self._snapshot())
+
+    def _samples(self) -> List[str]:
+        totals: Dict[Tuple[str, ...], float] = {}
+        for s in self._snapshot():
+            for key, v in s.items():
+                totals[key] = totals.get(key, 0) + v
+        return [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in sorted(totals.items())]
+
+
+class Gauge(_Metric):
+    """Last-written value per label set, or a callback read at scrape time."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), fn: Optional[Callable[[], float]] = None):
+        super().__init__(name, help, labelnames)
+        self.fn = fn
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value  # single dict store; atomic under the GIL
+
+    def _samples(self) -> List[str]:
+        if self.fn is not None:
+            try:
+                return [f"{self.name} {_fmt(self.fn())}"]
+            except Exception:
+                return []
+        return [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in sorted(dict(self._values).items())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        cell = shard.get(key)
+        if cell is None:
+            cell = shard[key] = [[0] * len(self.buckets), 0.0, 0]  # per-bucket counts, sum, count
+        counts = cell[0]
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                counts[i] += 1
+                break
+        cell[1] += value
+        cell[2] += 1
+
+    def _fold(self, base: dict, shard: dict) -> None:
+        for key, (counts, total, n) in shard.items():
+            old = base.get(key) or [[0] * len(self.buckets), 0.0, 0]
+            # A new cell, not updated in place: snapshots share the old one
+            base[key] = [[a + b for a, b in zip(old[0], counts)], old[1] + total, old[2] + n]
+
+    def _samples(self) -> List[str]:
+        merged: Dict[Tuple[str, ...], list] = {}
+        for s in self._snapshot():
+            for key, (counts, total, n) in s.items():
+                m = merged.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+                m[0] = [a + b for a, b in zip(m[0], counts)]
+                m[1] += total
+                m[2] += n
+        lines = []
+        for key, (counts, total, n) in sorted(merged.items()):
+            running = 0
+            for upper, c in zip(self.buckets, counts):
+                running += c
+                le = 'le="%s"' % _fmt(upper)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {running}")
+            inf = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, inf)} {n}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {n}")
+        return lines
+
+
+# ---------- Registry ----------
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            m = self._metrics.get(name)
+            if m is None:
+                m = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(m, cls):
+                raise ValueError(f"metric '{name}' already registered as {m.kind}")
+            return m
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for m in sorted(metrics, key=lambda m: m.name):
+            lines += m.render()
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY._get(Counter, name, help, labelnames)
+
+
+def gauge(name: str, help: str, labelnames: Sequence[str] = (), fn: Optional[Callable[[], float]] = None) -> Gauge:
+    g = REGISTRY._get(Gauge, name, help, labelnames)
+    if fn is not None:
+        g.fn = fn
+    return g
+
+
+def histogram(name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY._get(Histogram, name, help, labelnames, buckets)
+
+
+@contextmanager
+def timer(hist: Histogram, **labels: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        hist.observe(time.perf_counter() - t0, **labels)
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+def dump(path: Path) -> None:
+    """Write the current metrics (Prometheus text format) to `path`, atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(render(), encoding="utf-8")
+    tmp.replace(path)
+
+
+# ---------- HTTP endpoint ----------
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scrapes would flood the console
+
+
+def start_http_server(host: str = "127.0.0.1", port: int = 9108) -> ThreadingHTTPServer:
+    """Serve GET /metrics on a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics_http", daemon=True).start()
+    print(f"📈 Metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
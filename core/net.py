@@ -0,0 +1,223 @@
+# core/net.py
+"""
+Shared network health for web-dependent skills.
+
+- CircuitBreaker per host: after `failures` consecutive errors (connect failures,
+  timeouts, HTTP 429/5xx) the breaker opens and calls fail immediately. After a
+  back-off it lets one trial request through (half-open); success closes it, failure
+  re-opens it with a doubled back-off (capped).
+- A background probe (TCP connect to well-known IPs, no DNS) guesses whether we are
+  online at all. The guess is advisory: while it says offline, hosts fail fast but one
+  trial call per `reset_sec` still goes through, and any successful call marks us online
+  (networks that block the probe's port work normally).
+- get() wraps requests.get with short connect/read timeouts; guard(host) wraps any
+  other client (e.g. DDGS) in the same bookkeeping.
+
+    from core.net import get_health, NetworkUnavailable
+    health = get_health()
+    if not health.available("duckduckgo.com"): ...        # milliseconds, no I/O
+    resp = health.get(url)                                 # raises NetworkUnavailable fast
+"""
+from __future__ import annotations
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from core import metrics
+
+FAST_FAILS = metrics.counter("leo_net_fast_fail_total", "Requests refused by an open breaker or offline probe", ("host",))
+BREAKER_OPENS = metrics.counter("leo_net_breaker_open_total", "Circuit breaker openings", ("host",))
+
+
+class NetworkUnavailable(Exception):
+    """Raised instead of waiting on a host that is known to be down (or while offline)."""
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, host: str, failures: int = 3, reset_sec: float = 30.0, max_reset_sec: float = 300.0):
+        self.host = host
+        self.max_failures = failures
+        self.base_reset_sec = reset_sec
+        self.max_reset_sec = max_reset_sec
+        self.state = self.CLOSED
+        self.failures = 0
+        self.reset_sec = reset_sec
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def ready(self) -> bool:
+        """Would allow() let a call through? (no state change)"""
+        with self._lock:
+            return self.state == self.CLOSED or (
+                self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_sec)
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_sec:
+                self.state = self.HALF_OPEN  # one trial request goes through
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                print(f"🌐 {self.host} reachable again")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.reset_sec = self.base_reset_sec
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN:
+                self.reset_sec = min(self.reset_sec * 2, self.max_reset_sec)
+            elif self.failures < self.max_failures:
+                return
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+        BREAKER_OPENS.inc(host=self.host)
+        print(f"⚠️ {self.host} unreachable; failing fast for {self.reset_sec:.0f}s")
+
+    def retry_in(self) -> float:
+        return max(0.0, self.reset_sec - (time.monotonic() - self.opened_at)) if self.state == self.OPEN else 0.0
+
+
+class NetworkHealth:
+    def __init__(
+        self,
+        connect_timeout: float = 2.0,
+        read_timeout: float = 6.0,
+        probe_hosts: Tuple[Tuple[str, int], ...] = (("1.1.1.1", 53), ("8.8.8.8", 53)),
+        probe_interval_sec: float = 15.0,
+        failures: int = 3,
+        reset_sec: float = 30.0,
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.probe_hosts = probe_hosts
+        self.probe_interval_sec = probe_interval_sec
+        self.failures = failures
+        self.reset_sec = reset_sec
+        self.online = True  # optimistic until the first probe says otherwise
+        self._last_success = float("-inf")  # monotonic times of the last guarded call outcomes
+        self._last_failure = float("-inf")
+        self._offline_trial_at = float("-inf")
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._probe_thread: Optional[threading.Thread] = None
+
+    # ---------- Probe ----------
+    def start(self) -> "NetworkHealth":
+        if self._probe_thread is None and self.probe_interval_sec > 0:
+            self._probe_thread = threading.Thread(target=self._probe_loop, name="net_probe", daemon=True)
+            self._probe_thread.start()
+        return self
+
+    def probe(self) -> bool:
+        for host, port in self.probe_hosts:
+            try:
+                with socket.create_connection((host, port), timeout=1.5):
+                    return True
+            except OSError:
+                continue
+        return False
+
+    def _probe_loop(self):
+        while True:
+            # A failed probe is overruled while the latest real call succeeded
+            online = self.probe() or self._last_success > self._last_failure
+            if online != self.online:
+                print("🌐 Network is back" if online else "⚠️ Network looks down; web skills will answer offline")
+            self.online = online
+            time.sleep(self.probe_interval_sec if online else min(5.0, self.probe_interval_sec))
+
+    # ---------- Breakers ----------
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            b = self._breakers.get(host)
+            if b is None:
+                b = self._breakers[host] = CircuitBreaker(host, self.failures, self.reset_sec)
+            return b
+
+    def _offline_trial(self, take: bool) -> bool:
+        """While the probe says offline: is a trial call due? (`take` claims it)"""
+        with self._lock:
+            if time.monotonic() - self._offline_trial_at < self.reset_sec:
+                return False
+            if take:
+                self._offline_trial_at = time.monotonic()
+            return True
+
+    def available(self, host: str) -> bool:
+        """Cheap check (no I/O): False while the host's breaker is open or while offline (between trials)."""
+        return self.breaker(host).ready() and (self.online or self._offline_trial(take=False))
+
+    @contextmanager
+    def guard(self, host: str):
+        """Run a network call against `host` under its breaker; raises NetworkUnavailable if refused."""
+        b = self.breaker(host)
+        if not (b.ready() and (self.online or self._offline_trial(take=True)) and b.allow()):
+            FAST_FAILS.inc(host=host)
+            raise NetworkUnavailable(host)
+        try:
+            yield
+        except Exception:
+            self._last_failure = time.monotonic()
+            b.record_failure()
+            raise
+        b.record_success()
+        self._last_success = time.monotonic()
+        if not self.online:
+            print("🌐 Network is back")
+            self.online = True
+
+    def get(self, url: str, timeout: Optional[Tuple[float, float]] = None, **kwargs):
+        """requests.get with short timeouts and breaker bookkeeping (429/5xx count as failures)."""
+        import requests
+        host = urlsplit(url).hostname or url
+        with self.guard(host):
+            resp = requests.get(url, timeout=timeout or (self.connect_timeout, self.read_timeout), **kwargs)
+            if resp.status_code == 429 or resp.status_code >= 500:
+                raise requests.HTTPError(f"{resp.status_code} from {host}", response=resp)
+        return resp
+
+    def status(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            return [(h, b.state, b.retry_in()) for h, b in sorted(self._breakers.items())]
+
+
+_health: Optional[NetworkHealth] = None
+_health_lock = threading.Lock()
+
+
+def get_health() -> NetworkHealth:
+    """Process-wide instance (config: net_*), probe started on first use."""
+    global _health
+    with _health_lock:
+        if _health is None:
+            try:
+                from core.config import load_config
+                cfg = load_config()
+            except Exception:
+                cfg = {}
+            hosts = []
+            for item in str(cfg.get("net_probe_hosts", "1.1.1.1:53,8.8.8.8:53")).split(","):
+                host, _, port = item.strip().rpartition(":")
+                if host and port.isdigit():
+                    hosts.append((host, int(port)))
+            _health = NetworkHealth(
+                connect_timeout=float(cfg.get("net_connect_timeout", 2.0)),
+                read_timeout=float(cfg.get("net_read_timeout", 6.0)),
+                probe_hosts=tuple(hosts),
+                probe_interval_sec=float(cfg.get("net_probe_interval_sec", 15.0)),
+                failures=int(cfg.get("net_breaker_failures", 3)),
+                reset_sec=float(cfg.get("net_breaker_reset_sec", 30.0)),
+            ).start()
+        return _health
@@ -0,0 +1,114 @@
+# core/profiler.py
+"""
+Field diagnostics, off unless enabled in config (profile_enabled / tracemalloc_enabled).
+
+SamplingProfiler: a daemon thread that reads every thread's current frame with
+sys._current_frames() at a fixed interval and counts the stacks of the threads we care
+about. Output is collapsed-stack text ("thread;module:func;module:func count"), which
+flamegraph.pl, speedscope and inferno read directly. Nothing is hooked into the
+interpreter, so the profiled threads pay nothing beyond the GIL hand-off per sample.
+
+AllocationTracker: tracemalloc snapshots taken at the end of each session and diffed
+against the previous one, to spot growth (history lines, queued audio, caches).
+"""
+from __future__ import annotations
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+# Thread-name prefixes sampled by default: main loop, decoding/dispatch, skill workers
+DEFAULT_THREADS = ("MainThread", "audio_processor", "prefetch", "asr", "app_index", "tts_cache")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{code.co_name}"
+
+
+class SamplingProfiler:
+    def __init__(self, interval_sec: float = 0.01, threads: Iterable[str] = DEFAULT_THREADS, max_depth: int = 64):
+        self.interval_sec = interval_sec
+        self.thread_prefixes = tuple(threads)
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _wanted(self, name: str) -> bool:
+        return not self.thread_prefixes or name.startswith(self.thread_prefixes)
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval_sec):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                name = names.get(ident)
+                if ident == me or name is None or not self._wanted(name):
+                    continue
+                labels: List[str] = []
+                while frame is not None and len(labels) < self.max_depth:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(name)
+                self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def start(self) -> "SamplingProfiler":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def write(self, path: Path) -> Path:
+        """Collapsed stacks, one "frame;frame;frame count" line per distinct stack."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{stack} {n}\n")
+        return path
+
+    def hottest(self, n: int = 5) -> List[Tuple[str, int]]:
+        """Leaf frames with the most samples (quick summary for the session log)."""
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(n)
+
+
+class AllocationTracker:
+    def __init__(self, nframes: int = 5, top: int = 25):
+        self.top = top
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(nframes)
+
+    def checkpoint(self, path: Optional[Path] = None) -> Optional[Path]:
+        """Snapshot now; write the top growth since the last checkpoint (None on the first)."""
+        snap = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        previous, self._previous = self._previous, snap
+        if previous is None or path is None:
+            return None
+        stats = snap.compare_to(previous, "traceback")
+        current, peak = tracemalloc.get_traced_memory()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# traced now {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB\n")
+            for stat in stats[: self.top]:
+                f.write(f"{stat.size_diff / 1024:+.1f} KiB ({stat.count_diff:+d} blocks), total {stat.size / 1024:.1f} KiB\n")
+                for line in stat.traceback.format():
+                    f.write(f"    {line}\n")
+        return path
@@ -0,0 +1,261 @@
+# core/replay.py
+"""
+Replay recorded transcripts through skill dispatch and compare with what happened live.
+
+Sources:
+  - HistoryRecorder logs (logs/session_*.txt): every "You: ..." line, paired with the
+    "Dispatch handled=... [intent=... skill=...]" event that followed it
+  - JSONL with {"transcript": ..., "intent": ...} per line (e.g. `leo batch` output)
+
+Handlers run inside a sandbox: processes, browser, network, the volume backend and the
+timer scheduler are replaced with recorders, and `speak` is captured, so a replay never
+touches the machine.
+With --match-only handlers are skipped entirely (grammar matching only, much faster).
+
+Run:  python leo.py replay logs/ [--match-only] [--show all|changed] [--json report.json]
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import webbrowser
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from unittest import mock
+
+_YOU = re.compile(r"^\[\d\d:\d\d:\d\d\] You(?:@[^:]*)?: (.*)$")
+_DISPATCH = re.compile(r"^\[\d\d:\d\d:\d\d\] \* Dispatch handled=(True|False)(?: intent=(\S+))?(?: skill=(\S+))?")
+
+# Voice control handled before dispatch in leo.py; never reaches the skills
+CONTROL_PHRASES = ("stop", "exit", "shutdown", "quit", "go to sleep", "stop listening", "sleep mode")
+
+
+@dataclass
+class Utterance:
+    source: str
+    text: str
+    recorded_handled: Optional[bool] = None  # None: log has no outcome (older/server logs)
+    recorded_intent: Optional[str] = None
+    intent: Optional[str] = None
+    skill: Optional[str] = None
+    slots: Dict[str, Any] = field(default_factory=dict)
+    commands: List[str] = field(default_factory=list)  # every intent, when split into several commands
+    spoken: List[str] = field(default_factory=list)
+    side_effects: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def changed(self) -> bool:
+        if self.recorded_intent is not None:
+            return self.intent != self.recorded_intent
+        if self.recorded_handled is not None:
+            return (self.intent is not None) != self.recorded_handled
+        return False
+
+
+# ---------- Sources ----------
+def parse_log(path: Path) -> Iterator[Utterance]:
+    pending: Optional[Utterance] = None
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            m = _YOU.match(line)
+            if m:
+                if pending is not None:
+                    yield pending
+                pending = Utterance(source=path.name, text=m.group(1).strip())
+                continue
+            m = _DISPATCH.match(line)
+            if m and pending is not None:
+                pending.recorded_handled = m.group(1) == "True"
+                pending.recorded_intent = m.group(2)  # absent in older logs: only handled is known
+                yield pending
+                pending = None
+    if pending is not None:
+        yield pending
+
+
+def parse_jsonl(path: Path) -> Iterator[Utterance]:
+    with open(path, "r", encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if rec.get("utterances"):  # `leo batch` output: one entry per decoded utterance
+                for i, utt in enumerate(rec["utterances"], 1):
+                    if utt.get("transcript") and not utt.get("control"):
+                        yield Utterance(
+                            source=f"{path.name}:{n}.{i}",
+                            text=utt["transcript"],
+                            recorded_handled=utt.get("intent") is not None,
+                            recorded_intent=utt.get("intent"),
+                        )
+                continue
+            text = rec.get("transcript") or rec.get("text")
+            if text:
+                yield Utterance(
+                    source=f"{path.name}:{n}",
+                    text=text,
+                    recorded_handled=rec["intent"] is not None if "intent" in rec else None,
+                    recorded_intent=rec.get("intent"),
+                )
+
+
+def load_utterances(inputs: List[Path]) -> List[Utterance]:
+    files: List[Path] = []
+    for p in inputs:
+        if p.is_dir():
+            files += sorted(p.glob("session_*.txt")) + sorted(p.glob("*.jsonl"))
+        else:
+            files.append(p)
+    out: List[Utterance] = []
+    for f in files:
+        parser = parse_jsonl if f.suffix == ".jsonl" else parse_log
+        out += [u for u in parser(f) if u.text and not any(k in u.text for k in CONTROL_PHRASES)]
+    return out
+
+
+# ---------- Sandbox ----------
+@contextmanager
+def sandbox(effects: List[str]):
+    """Swap side-effecting APIs for recorders; `effects` collects what handlers tried."""
+    from core import net
+    from skills import scheduler, volume_backends
+
+    def recorder(name, result=None):
+        def call(*args, **kwargs):
+            effects.append(f"{name}{args!r}")
+            return result if result is not None else mock.MagicMock()
+        return call
+
+    def recorded(name, fn):
+        def call(*args, **kwargs):
+            effects.append(f"{name}{args + tuple(kwargs.items())!r}")
+            return fn(*args, **kwargs)
+        return call
+
+    def no_network(*args, **kwargs):
+        effects.append(f"network{args[1:]!r}")
+        raise OSError("network disabled during replay")
+
+    saved_backend = (volume_backends._backend, volume_backends._selected)
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(subprocess, "Popen", recorder("subprocess.Popen")))
+        stack.enter_context(mock.patch.object(subprocess, "run", recorder("subprocess.run")))
+        stack.enter_context(mock.patch.object(subprocess, "call", recorder("subprocess.call", 0)))
+        stack.enter_context(mock.patch.object(os, "system", recorder("os.system", 0)))
+        if hasattr(os, "startfile"):
+            stack.enter_context(mock.patch.object(os, "startfile", recorder("os.startfile")))
+        stack.enter_context(mock.patch.object(webbrowser, "open", recorder("webbrowser.open", True)))
+        stack.enter_context(mock.patch.object(webbrowser, "open_new_tab", recorder("webbrowser.open_new_tab", True)))
+        stack.enter_context(mock.patch.object(socket.socket, "connect", no_network))
+        stack.enter_context(mock.patch.object(socket, "create_connection", no_network))
+        # Fresh breakers and no background probe: each replayed handler sees the network as it is
+        stack.enter_context(mock.patch.object(net, "_health", net.NetworkHealth(probe_interval_sec=0)))
+        # A scheduler that is never started (nothing fires, nothing is saved) on a throwaway
+        # path, so replayed timers neither ring nor land in cache/scheduler.json
+        sched = scheduler.Scheduler(path=Path(stack.enter_context(tempfile.TemporaryDirectory())) / "scheduler.json")
+        for name in ("add", "cancel", "cancel_all"):
+            setattr(sched, name, recorded(f"scheduler.{name}", getattr(sched, name)))
+        stack.enter_context(mock.patch.object(scheduler, "_scheduler", sched))
+        volume_backends.set_backend(volume_backends.FakeBackend())
+        try:
+            yield
+        finally:
+            volume_backends._backend, volume_backends._selected = saved_backend
+
+
+# ---------- Replay ----------
+def replay(utterances: List[Utterance], match_only: bool = False) -> Dict[str, Any]:
+    from skills.registry import classify, dispatch_match, load_skills, match, split_commands
+
+    load_skills()
+    t0 = time.perf_counter()
+    for u in utterances:
+        start = time.perf_counter()
+        commands = split_commands(u.text)
+        if commands is not None:
+            u.commands = [c.intent.name for _, c, _ in commands]
+        if match_only:
+            m = commands[0][1] if commands is not None else (match(u.text) or classify(u.text))
+        else:
+            with sandbox(u.side_effects):
+                m = dispatch_match(u.text, u.spoken.append)  # live routing: splits, fallback, handlers
+        if m is not None:
+            # Like the live Dispatch event: a multi-command reports its first command
+            u.intent, u.skill, u.slots = m.intent.name, m.skill.name, dict(m.slots)
+        u.seconds = time.perf_counter() - start
+    wall = time.perf_counter() - t0
+
+    changed = [u for u in utterances if u.changed]
+    transitions = Counter(f"{u.recorded_intent or ('handled' if u.recorded_handled else 'none')} -> {u.intent or 'none'}"
+                          for u in changed)
+    return {
+        "utterances": len(utterances),
+        "with_recorded_outcome": sum(u.recorded_handled is not None for u in utterances),
+        "changed": len(changed),
+        "matched": sum(u.intent is not None for u in utterances),
+        "wall_sec": round(wall, 3),
+        "dispatches_per_sec": round(len(utterances) / wall, 1) if wall else None,
+        "transitions": dict(transitions.most_common()),
+    }
+
+
+def main(argv: List[str] | None = None):
+    ap = argparse.ArgumentParser(prog="leo replay", description="Replay logged transcripts through dispatch")
+    ap.add_argument("inputs", nargs="*", type=Path, default=[Path("logs")],
+                    help="session logs, JSONL files or directories (default: logs/)")
+    ap.add_argument("--match-only", action="store_true", help="match intents without running handlers")
+    ap.add_argument("--show", choices=("changed", "all", "none"), default="changed")
+    ap.add_argument("--json", type=Path, help="write the full report (summary + utterances) here")
+    args = ap.parse_args(argv)
+
+    from core.config import load_config
+    from skills.registry import set_fallback_threshold
+    threshold = float(load_config().get("intent_fallback_threshold", 0) or 0)
+    set_fallback_threshold(threshold if threshold > 0 else None)
+
+    utterances = load_utterances(args.inputs)
+    if not utterances:
+        print("No transcripts found.")
+        return 1
+    summary = replay(utterances, match_only=args.match_only)
+
+    if args.show != "none":
+        for u in utterances:
+            if args.show == "all" or u.changed:
+                was = u.recorded_intent or {True: "handled", False: "none", None: "?"}[u.recorded_handled]
+                flag = "≠" if u.changed else "="
+                print(f"{flag} [{u.source}] '{u.text}': {was} -> {u.intent or 'none'} {u.slots or ''}")
+                if len(u.commands) > 1:
+                    print(f"      commands: {', '.join(u.commands)}")
+                for s in u.spoken:
+                    print(f"      speak: {s}")
+                for e in u.side_effects:
+                    print(f"      would: {e}")
+
+    print(
+        f"⏱️ {summary['utterances']} transcripts in {summary['wall_sec']}s "
+        f"({summary['dispatches_per_sec']}/s, {'match only' if args.match_only else 'sandboxed handlers'}); "
+        f"{summary['changed']} of {summary['with_recorded_outcome']} with a recorded outcome changed"
+    )
+    for t, n in summary["transitions"].items():
+        print(f"   {n:>5}  {t}")
+    if args.json:
+        args.json.write_text(json.dumps({"summary": summary, "utterances": [asdict(u) for u in utterances]}, indent=2),
+                             encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+# core/rtf.py
+"""
+Decode real-time-factor (RTF) tracking with stepwise degradation.
+
+RTF = processing time / audio duration. Above 1.0 the recognizer falls behind the mic
+and latency grows without bound; we act well before that.
+
+RtfMonitor keeps a sliding window of per-block RTFs (plus per-utterance totals). When
+the window mean stays above `high` the degradation level goes up one step; when it
+stays below `low` for longer, it comes back down. A cooldown after every transition
+lets the new setting show its effect before the next decision. The caller maps levels
+to concrete actions (smaller blocks, grammar decoding, a smaller model) and is told
+about every change through `on_change(old_level, new_level, reason)`.
+"""
+from __future__ import annotations
+from collections import deque
+from typing import Callable, Optional, Sequence
+
+# Known degradation steps, cheapest first
+STEPS = ("block_size", "grammar", "fallback_model")
+
+
+class RtfMonitor:
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        steps: Sequence[str] = STEPS,
+        high: float = 0.8,
+        low: float = 0.4,
+        window: int = 10,
+        recover_window: int = 40,
+        cooldown: int = 10,
+        on_change: Optional[Callable[[int, int, str], None]] = None,
+    ):
+        unknown = [s for s in steps if s not in STEPS]
+        if unknown:
+            print(f"⚠️ Unknown degradation steps ignored: {', '.join(unknown)}")
+        self.steps = tuple(s for s in steps if s in STEPS)
+        self.bytes_per_sec = sample_rate * 2  # int16 mono
+        self.high = high
+        self.low = low
+        self.window = window
+        self.recover_window = max(recover_window, window)
+        self.cooldown = cooldown
+        self.on_change = on_change
+
+        self.level = 0
+        self._rtfs: deque = deque(maxlen=self.recover_window)
+        self._since_change = 0
+        self._utt_audio = 0.0
+        self._utt_decode = 0.0
+        self.last_block_rtf = 0.0
+        self.last_utterance_rtf = 0.0
+
+    @property
+    def active_steps(self) -> Sequence[str]:
+        return self.steps[: self.level]
+
+    def window_rtf(self, n: Optional[int] = None) -> float:
+        recent = list(self._rtfs)[-(n or self.window):]
+        return sum(recent) / len(recent) if recent else 0.0
+
+    def record(self, nbytes: int, seconds: float) -> float:
+        """Account one processed block; returns its RTF and may change the level."""
+        audio_sec = nbytes / self.bytes_per_sec
+        if audio_sec <= 0:
+            return 0.0
+        rtf = seconds / audio_sec
+        self.last_block_rtf = rtf
+        self._rtfs.append(rtf)
+        self._utt_audio += audio_sec
+        self._utt_decode += seconds
+        self._since_change += 1
+        self._decide()
+        return rtf
+
+    def end_utterance(self) -> float:
+        """Close the current utterance; returns its overall RTF."""
+        rtf = self._utt_decode / self._utt_audio if self._utt_audio else 0.0
+        self.last_utterance_rtf = rtf
+        self._utt_audio = self._utt_decode = 0.0
+        return rtf
+
+    def _decide(self) -> None:
+        if self._since_change < self.cooldown or len(self._rtfs) < self.window:
+            return
+        mean = self.window_rtf()
+        if mean > self.high and self.level < len(self.steps):
+            self._set(self.level + 1, f"RTF {mean:.2f} > {self.high:.2f} over {self.window} blocks")
+        elif self.level > 0 and len(self._rtfs) >= self.recover_window:
+            slow = self.window_rtf(self.recover_window)
+            if slow < self.low:
+                self._set(self.level - 1, f"RTF {slow:.2f} < {self.low:.2f} over {self.recover_window} blocks")
+
+    def _set(self, level: int, reason: str) -> None:
+        old, self.level = self.level, level
+        self._since_change = 0
+        self._rtfs.clear()  # judge the new setting on its own numbers
+        if self.on_change:
+            self.on_change(old, level, reason)
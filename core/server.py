@@ -0,0 +1,270 @@
+# core/server.py
+"""
+Multi-client recognition server.
+
+One vosk.Model is loaded once and shared. Each connected client streams 16 kHz mono
+int16 PCM over TCP and gets its own recognizer (from a reusable pool) and its own
+skills session state. Decoding and skill dispatch run on a thread pool sized to the
+CPU cores; Vosk releases the GIL while decoding, so throughput scales with cores.
+
+Protocol (newline-delimited JSON from the server, raw PCM from the client):
+    client -> server : {"client": "kitchen", "sample_rate": 16000}\\n  then PCM bytes,
+                       then half-close (EOF) when done
+    server -> client : {"type": "ready"}
+                       {"type": "transcript", "text": "..."}
+                       {"type": "speak", "text": "..."}
+                       {"type": "dispatch", "handled": true, "intent": "volume_up"}
+                       {"type": "bye"}
+
+Run:   python leo.py serve [--host 127.0.0.1] [--port 8765]
+Test:  python -m core.server replay a.wav b.wav [--host ...] [--port ...] [--realtime]
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List
+
+from core import metrics
+
+SAMPLE_RATE = 16000
+READ_CHUNK = 8000  # bytes (~0.25 s of 16 kHz int16)
+
+# Per-client voice control (no process exit: a client only ends its own session)
+END_PHRASES = ("goodbye", "stop listening", "go to sleep")
+
+DECODE_SECONDS = metrics.histogram("leo_decode_seconds", "Recognizer time per audio chunk", ("source",))
+SESSIONS_TOTAL = metrics.counter("leo_sessions_total", "Listening sessions started", ("kind",))
+CLIENTS = metrics.gauge("leo_server_clients", "Connected server clients")
+
+
+class RecognizerPool:
+    """Reusable KaldiRecognizers over one shared model."""
+    def __init__(self, model, sample_rate: int = SAMPLE_RATE):
+        self.model = model
+        self.sample_rate = sample_rate
+        self._free: List[Any] = []
+        self._lock = Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+        from vosk import KaldiRecognizer
+        return KaldiRecognizer(self.model, self.sample_rate)
+
+    def release(self, rec) -> None:
+        try:
+            rec.FinalResult()  # flush + reset stream state for the next client
+        except Exception:
+            return
+        with self._lock:
+            self._free.append(rec)
+
+
+def _text(result_json: str) -> str:
+    return json.loads(result_json).get("text", "").strip().lower()
+
+
+class RecognitionServer:
+    def __init__(self, model, workers: int = 0, history=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = RecognizerPool(model)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="asr")
+        self.history = history
+        self.clients: Dict[str, "asyncio.StreamWriter"] = {}
+        self._ids = itertools.count(2)
+
+    # ---------- Blocking work (runs on the executor) ----------
+    @staticmethod
+    def _decode(rec, data: bytes) -> str | None:
+        with metrics.timer(DECODE_SECONDS, source="server"):
+            if rec.AcceptWaveform(data):
+                return _text(rec.Result())
+        return None
+
+    @staticmethod
+    def _dispatch(state, text: str, speak) -> Dict[str, Any]:
+        from skills.registry import dispatch_match
+        from skills.session_state import use_session, reset_session
+
+        token = use_session(state)
+        try:
+            m = dispatch_match(text, speak)
+            return {"type": "dispatch", "handled": m is not None, "intent": m.intent.name if m else None}
+        finally:
+            reset_session(token)
+
+    # ---------- Per-client connection ----------
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        from skills.session_state import SessionState
+
+        loop = asyncio.get_running_loop()
+        peer = writer.get_extra_info("peername")
+        out: asyncio.Queue = asyncio.Queue()
+
+        def send(msg: Dict[str, Any] | None):
+            # Safe from executor threads; None stops the writer after queued messages
+            loop.call_soon_threadsafe(out.put_nowait, msg)
+
+        async def pump():
+            while True:
+                msg = await out.get()
+                if msg is None:
+                    break
+                writer.write((json.dumps(msg) + "\n").encode("utf-8"))
+                await writer.drain()
+
+        try:
+            header = json.loads((await reader.readline()) or b"{}")
+        except ValueError:
+            header = {}
+        name = str(header.get("client") or (f"{peer[0]}:{peer[1]}" if peer else "client"))
+        rate = int(header.get("sample_rate", SAMPLE_RATE))
+        pump_task = asyncio.create_task(pump())
+        if rate != SAMPLE_RATE:
+            send({"type": "error", "message": f"sample_rate must be {SAMPLE_RATE}"})
+            send(None)
+            await pump_task
+            writer.close()
+            return
+
+        if name in self.clients:
+            name = f"{name}#{next(self._ids)}"
+        self.clients[name] = writer
+        SESSIONS_TOTAL.inc(kind="server")
+        CLIENTS.set(len(self.clients))
+        print(f"🔌 Client connected: {name}")
+        if self.history:
+            self.history.event(f"Server client connected: {name}")
+
+        rec = self.pool.acquire()
+        state = SessionState()
+        speak = lambda text: send({"type": "speak", "text": text})  # noqa: E731
+
+        async def on_text(text: str) -> bool:
+            send({"type": "transcript", "text": text})
+            if self.history:
+                self.history.log(f"You@{name}", text)
+            if any(p in text for p in END_PHRASES):
+                speak("Goodbye.")
+                return False
+            send(await loop.run_in_executor(self.executor, self._dispatch, state, text, speak))
+            return True
+
+        send({"type": "ready"})
+        try:
+            while True:
+                data = await reader.read(READ_CHUNK)
+                if not data:
+                    text = await loop.run_in_executor(self.executor, lambda: _text(rec.FinalResult()))
+                    if text:
+                        await on_text(text)
+                    break
+                text = await loop.run_in_executor(self.executor, self._decode, rec, data)
+                if text and not await on_text(text):
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.clients.pop(name, None)
+            CLIENTS.set(len(self.clients))
+            self.pool.release(rec)
+            send({"type": "bye"})
+            send(None)
+            try:
+                await pump_task
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+            print(f"🔌 Client disconnected: {name}")
+
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self.handle_client, host, port)
+        print(f"🛰️ Leo recognition server on {host}:{port} ({self.workers} workers)")
+        async with server:
+            await server.serve_forever()
+
+
+def run_server(model, host: str = "127.0.0.1", port: int = 8765, workers: int = 0, history=None):
+    """Block serving clients until interrupted."""
+    from skills.registry import load_skills
+    load_skills()
+    server = RecognitionServer(model, workers=workers, history=history)
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.executor.shutdown(wait=False)
+
+
+# ---------- Local test client ----------
+def _read_wav(path: Path) -> bytes:
+    with wave.open(str(path), "rb") as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2 or wf.getframerate() != SAMPLE_RATE:
+            raise ValueError(f"{path}: need 16 kHz mono 16-bit PCM WAV")
+        return wf.readframes(wf.getnframes())
+
+
+async def replay_wav(path: Path, host: str, port: int, realtime: bool = False) -> List[Dict[str, Any]]:
+    """Stream one WAV file to the server; return the messages it sent back."""
+    pcm = _read_wav(path)
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write((json.dumps({"client": path.stem, "sample_rate": SAMPLE_RATE}) + "\n").encode("utf-8"))
+
+    async def send_audio():
+        for i in range(0, len(pcm), READ_CHUNK):
+            writer.write(pcm[i:i + READ_CHUNK])
+            await writer.drain()
+            if realtime:
+                await asyncio.sleep(READ_CHUNK / 2 / SAMPLE_RATE)
+        writer.write_eof()
+
+    sender = asyncio.create_task(send_audio())
+    messages: List[Dict[str, Any]] = []
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        msg = json.loads(line)
+        messages.append(msg)
+        print(f"[{path.stem}] {msg}")
+        if msg.get("type") == "bye":
+            break
+    sender.cancel()
+    writer.close()
+    return messages
+
+
+async def _replay_all(paths: List[Path], host: str, port: int, realtime: bool):
+    t0 = time.monotonic()
+    await asyncio.gather(*(replay_wav(p, host, port, realtime) for p in paths))
+    wall = time.monotonic() - t0
+    audio = sum(len(_read_wav(p)) / 2 / SAMPLE_RATE for p in paths)
+    print(f"⏱️ {len(paths)} stream(s), {audio:.1f}s audio in {wall:.1f}s ({audio / wall:.1f}x realtime)")
+
+
+def main(argv: List[str] | None = None):
+    ap = argparse.ArgumentParser(description="Leo recognition server test client")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    rp = sub.add_parser("replay", help="stream WAV files concurrently, one client each")
+    rp.add_argument("wavs", nargs="+", type=Path)
+    rp.add_argument("--host", default="127.0.0.1")
+    rp.add_argument("--port", type=int, default=8765)
+    rp.add_argument("--realtime", action="store_true", help="pace audio at 1x instead of max speed")
+    args = ap.parse_args(argv)
+    asyncio.run(_replay_all(args.wavs, args.host, args.port, args.realtime))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+# core/tts.py
+from __future__ import annotations
+import hashlib
+import sys
+import threading
+import wave
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pyttsx3
+import sounddevice as sd
+
+# TTS settings shared by live speech and pre-rendered phrases
+TTS_DRIVER = "sapi5" if sys.platform.startswith("win") else None
+TTS_RATE = 160
+TTS_VOLUME = 1.0
+
+# Serializes every pyttsx3 use: engines are not safe to drive from two threads at once
+engine_lock = threading.Lock()
+
+
+def _init_engine():
+    if sys.platform.startswith("win") and threading.current_thread() is not threading.main_thread():
+        try:
+            import comtypes
+            comtypes.CoInitialize()
+        except Exception:
+            pass
+    engine = pyttsx3.init(TTS_DRIVER) if TTS_DRIVER else pyttsx3.init()
+    voices = engine.getProperty("voices")
+    voice_id = voices[0].id if voices else ""
+    if voice_id:
+        engine.setProperty("voice", voice_id)
+    engine.setProperty("rate", TTS_RATE)
+    engine.setProperty("volume", TTS_VOLUME)
+    return engine, voice_id
+
+
+def say(text: str) -> None:
+    """Live TTS synthesis (blocking)."""
+    with engine_lock:
+        engine, _ = _init_engine()
+        engine.say(text)
+        engine.runAndWait()
+
+
+# ---------- Generated tones ----------
+def tone(freq_hz: float, ms: int, sample_rate: int = 22050, volume: float = 0.4) -> np.ndarray:
+    """Sine tone with short fades (no clicks), int16 mono."""
+    n = int(sample_rate * ms / 1000)
+    t = np.arange(n, dtype=np.float32) / sample_rate
+    wave_ = np.sin(2 * np.pi * freq_hz * t)
+    fade = min(n // 2, int(sample_rate * 0.005))
+    if fade:
+        ramp = np.linspace(0.0, 1.0, fade, dtype=np.float32)
+        wave_[:fade] *= ramp
+        wave_[-fade:] *= ramp[::-1]
+    return (wave_ * volume * 32767).astype(np.int16)
+
+
+_tone_cache: Dict[Tuple[Tuple[float, int], ...], np.ndarray] = {}
+
+
+def play_tones(seq: Iterable[Tuple[float, int]], sample_rate: int = 22050) -> None:
+    """Play a sequence of (freq_hz, ms) tones; buffers are generated once and reused."""
+    key = tuple(seq)
+    buf = _tone_cache.get(key)
+    if buf is None:
+        buf = np.concatenate([tone(f, ms, sample_rate) for f, ms in key])
+        _tone_cache[key] = buf
+    sd.play(buf, sample_rate)
+    sd.wait()
+
+
+# ---------- Pre-rendered phrases ----------
+class PhraseCache:
+    """
+    Fixed phrases synthesized once to PCM and played straight through the audio device.
+    - Keyed by (text, voice, rate); persisted as WAV files under cache_dir.
+    - warm() renders missing phrases on a background thread.
+    - play(text) returns False for phrases that are not cached yet (caller falls back to TTS).
+    """
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.voice_id = ""
+        self._pcm: Dict[str, Tuple[np.ndarray, int]] = {}  # text -> (samples, sample_rate)
+        self._lock = threading.Lock()
+
+    def _path(self, text: str) -> Path:
+        key = hashlib.sha1(f"{text}|{self.voice_id}|{TTS_RATE}".encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{key}.wav"
+
+    @staticmethod
+    def _read(path: Path) -> Tuple[np.ndarray, int]:
+        with wave.open(str(path), "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError("expected 16-bit PCM")
+            pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+            channels = wf.getnchannels()
+            return (pcm.reshape(-1, channels) if channels > 1 else pcm), wf.getframerate()
+
+    def _render(self, phrases: List[str]) -> None:
+        with engine_lock:
+            engine, self.voice_id = _init_engine()
+            todo = []
+            for text in phrases:
+                path = self._path(text)
+                if path.exists():
+                    try:
+                        with self._lock:
+                            self._pcm[text] = self._read(path)
+                        continue
+                    except Exception:
+                        pass
+                engine.save_to_file(text, str(path))
+                todo.append((text, path))
+            if todo:
+                engine.runAndWait()
+        for text, path in todo:
+            try:
+                with self._lock:
+                    self._pcm[text] = self._read(path)
+            except Exception as e:
+                print(f"⚠️ Could not pre-render '{text}': {e}")
+
+    def warm(self, phrases: Iterable[str]) -> threading.Thread:
+        t = threading.Thread(target=self._render, args=(list(phrases),), name="tts_cache", daemon=True)
+        t.start()
+        return t
+
+    def play(self, text: str) -> bool:
+        with self._lock:
+            entry = self._pcm.get(text)
+        if entry is None:
+            return False
+        pcm, rate = entry
+        sd.play(pcm, rate)
+        sd.wait()
+        return True
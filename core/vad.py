@@ -0,0 +1,142 @@
+# core/vad.py
+from __future__ import annotations
+from collections import deque
+from typing import List, Tuple
+
+import numpy as np
+
+# Optional WebRTC backend
+try:
+    import webrtcvad
+    HAVE_WEBRTC = True
+except Exception:
+    HAVE_WEBRTC = False
+
+
+class _EnergyBackend:
+    """
+    Vectorized energy + zero-crossing classifier over a batch of frames.
+    Tracks an adaptive noise floor so the threshold follows the room.
+    """
+    def __init__(self, aggressiveness: int = 2):
+        self.margin_db = 6.0 + 3.0 * max(0, min(3, aggressiveness))  # speech must exceed floor by this
+        self.min_db = 30.0          # absolute floor: digital silence never counts as speech
+        self.max_zcr = 0.35         # hiss/fan noise crosses zero far more often than voice
+        self.floor_db: float | None = None
+
+    def classify(self, frames: np.ndarray) -> np.ndarray:
+        x = frames.astype(np.float32)
+        energy_db = 10.0 * np.log10(np.mean(x * x, axis=1) + 1e-9)
+        signs = np.signbit(x)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / x.shape[1]
+
+        if self.floor_db is None:
+            self.floor_db = float(np.percentile(energy_db, 20))
+        threshold = max(self.floor_db + self.margin_db, self.min_db)
+        speech = (energy_db > threshold) & (zcr < self.max_zcr)
+
+        quiet = energy_db[~speech]
+        if quiet.size:
+            # Slow EWMA toward the current background level
+            self.floor_db = 0.95 * self.floor_db + 0.05 * float(np.median(quiet))
+        return speech
+
+
+class _WebRtcBackend:
+    def __init__(self, sample_rate: int, aggressiveness: int = 2):
+        self.vad = webrtcvad.Vad(max(0, min(3, aggressiveness)))
+        self.sample_rate = sample_rate
+
+    def classify(self, frames: np.ndarray) -> np.ndarray:
+        return np.fromiter(
+            (self.vad.is_speech(f.tobytes(), self.sample_rate) for f in frames),
+            dtype=bool, count=len(frames),
+        )
+
+
+class VadGate:
+    """
+    Voice-activity gate between the audio queue and the recognizer.
+    - feed(block) -> [(speech_bytes, segment_ended), ...]
+      speech_bytes: speech frames plus `padding_ms` of context on both sides
+      segment_ended: trailing silence passed the padding; finalize the utterance after
+      feeding these bytes
+    - skipped_fraction: share of frames never sent to the recognizer
+    """
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 30,
+        padding_ms: int = 300,
+        backend: str = "energy",
+        aggressiveness: int = 2,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_len = sample_rate * frame_ms // 1000
+        self.pad_frames = max(1, padding_ms // frame_ms)
+        if backend == "webrtc" and HAVE_WEBRTC and frame_ms in (10, 20, 30):
+            self.backend = _WebRtcBackend(sample_rate, aggressiveness)
+        else:
+            if backend == "webrtc":
+                print("ℹ️ webrtcvad not available; using energy VAD.")
+            self.backend = _EnergyBackend(aggressiveness)
+
+        self._carry = np.zeros(0, dtype=np.int16)
+        self._preroll: deque = deque(maxlen=self.pad_frames)
+        self._triggered = False
+        self._silence_run = 0
+
+        self.frames_total = 0
+        self.frames_skipped = 0
+
+    @property
+    def skipped_fraction(self) -> float:
+        return self.frames_skipped / self.frames_total if self.frames_total else 0.0
+
+    @property
+    def in_speech(self) -> bool:
+        return self._triggered
+
+    def feed(self, block: bytes) -> List[Tuple[bytes, bool]]:
+        samples = np.frombuffer(block, dtype=np.int16)
+        if self._carry.size:
+            samples = np.concatenate((self._carry, samples))
+        n = samples.size // self.frame_len
+        self._carry = samples[n * self.frame_len:].copy()
+        if n == 0:
+            return []
+
+        frames = samples[: n * self.frame_len].reshape(n, self.frame_len)
+        is_speech = self.backend.classify(frames)
+        self.frames_total += n
+
+        segments: List[Tuple[bytes, bool]] = []
+        out: List[np.ndarray] = []
+        for frame, speech in zip(frames, is_speech):
+            if self._triggered:
+                out.append(frame)
+                self._silence_run = 0 if speech else self._silence_run + 1
+                if self._silence_run > self.pad_frames:
+                    self._triggered = False
+                    self._silence_run = 0
+                    segments.append((np.concatenate(out).tobytes(), True))
+                    out = []
+            elif speech:
+                out.extend(self._preroll)
+                self._preroll.clear()
+                out.append(frame)
+                self._triggered = True
+            else:
+                if len(self._preroll) == self._preroll.maxlen:
+                    self.frames_skipped += 1  # oldest pre-roll frame falls out unsent
+                self._preroll.append(frame)
+
+        if out:
+            segments.append((np.concatenate(out).tobytes(), False))
+        return segments
+
+    def reset(self) -> None:
+        self._carry = np.zeros(0, dtype=np.int16)
+        self._preroll.clear()
+        self._triggered = False
+        self._silence_run = 0
@@ -1,9 +1,18 @@
+import json
 import os
+import queue
 import struct
 import sys
-import pvporcupine
+import time
 import sounddevice as sd
-from core.config import get_key
+from core.config import get_key, get_key_safe
+
+try:
+    import pvporcupine
+    HAVE_PORCUPINE = True
+except Exception:
+    pvporcupine = None
+    HAVE_PORCUPINE = False
 
 class WakeWordDetector:
     """
@@ -11,13 +20,9 @@ class WakeWordDetector:
     Keyword and sensitivity should be provided at init (or pulled from config).
     """
     def __init__(self, keyword="Leo", sensitivity=0.7):
+        if not HAVE_PORCUPINE:
+            raise RuntimeError("pvporcupine is not installed; use wake_backend 'vosk'")
         access_key = get_key("PICOVOICE_ACCESS_KEY")
-        self.porcupine = pvporcupine.create(
-            access_key=access_key,
-            keywords=[keyword],
-            sensitivities=[sensitivity]
-        )
-
         try:
             self.porcupine = pvporcupine.create(
                 access_key=access_key,
@@ -63,3 +68,95 @@ class WakeWordDetector:
             self.porcupine.delete()
         except Exception:
             pass
+
+
+class VoskWakeWordDetector:
+    """
+    Keyword spotting with Vosk: a recognizer whose grammar is just the wake phrase and
+    "[unk]", on the already-loaded (command) model. No second engine, no access key.
+    - Audio arrives in 100 ms blocks; a VAD gate (optional) keeps silence away from the
+      recognizer, so the decoder only runs while someone is talking.
+    - `sensitivity` (0..1, as for Porcupine: higher = more eager) maps onto the minimum
+      per-word confidence the recognizer must report for every word of the phrase.
+    - The wake phrase must be in the model's vocabulary (Vosk logs a warning otherwise).
+    Same interface as WakeWordDetector: listen() blocks until detection, close().
+    """
+    BLOCK_SIZE = 1600  # 100 ms at 16 kHz
+
+    def __init__(self, keyword="leo", sensitivity=0.7, loader=None, sample_rate=16000, vad=None):
+        from vosk import KaldiRecognizer
+        if loader is None or not loader.wait():
+            raise RuntimeError(f"Vosk wake word needs a loaded model: {getattr(loader, 'error', None)}")
+        self.phrase = keyword.strip().lower()
+        self.min_conf = min(0.95, max(0.3, 0.95 - 0.5 * float(sensitivity)))
+        self.vad = vad
+        self.recognizer = KaldiRecognizer(loader.model, sample_rate, json.dumps([self.phrase, "[unk]"]))
+        self.recognizer.SetWords(True)
+
+        self._q: "queue.Queue[bytes]" = queue.Queue(maxsize=50)
+        self.stream = sd.RawInputStream(
+            samplerate=sample_rate,
+            blocksize=self.BLOCK_SIZE,
+            dtype="int16",
+            channels=1,
+            callback=self._audio_callback
+        )
+        self.detected = False
+        self.decoded_sec = 0.0  # recognizer CPU time, for comparing against Porcupine
+
+    def _audio_callback(self, indata, frames, time_info, status):
+        if status:
+            print(status, file=sys.stderr)
+        try:
+            self._q.put_nowait(bytes(indata))
+        except queue.Full:
+            pass  # a stalled listener only loses wake-word audio
+
+    def _matches(self, result_json: str) -> bool:
+        words = json.loads(result_json).get("result") or []
+        spoken = " ".join(w.get("word", "") for w in words)
+        if self.phrase not in spoken:
+            return False
+        confs = [w.get("conf", 0.0) for w in words if w.get("word") in self.phrase.split()]
+        return bool(confs) and min(confs) >= self.min_conf
+
+    def _feed(self, pcm: bytes, ended: bool) -> bool:
+        t0 = time.perf_counter()
+        hit = False
+        if pcm and self.recognizer.AcceptWaveform(pcm):
+            hit = self._matches(self.recognizer.Result())
+        if ended and not hit:
+            hit = self._matches(self.recognizer.FinalResult())
+        self.decoded_sec += time.perf_counter() - t0
+        return hit
+
+    def listen(self):
+        """Block until wake word is detected."""
+        print("Listening for wake word (Vosk)...")
+        self.detected = False
+        self.recognizer.Reset()
+        if self.vad is not None:
+            self.vad.reset()
+        with self.stream:
+            while not self.detected:
+                block = self._q.get()
+                segments = self.vad.feed(block) if self.vad is not None else [(block, False)]
+                for pcm, ended in segments:
+                    if self._feed(pcm, ended):
+                        print("Wake word detected!")
+                        self.detected = True
+                        break
+
+    def close(self):
+        try:
+            self.stream.close()
+        except Exception:
+            pass
+
+
+def wake_backend(cfg) -> str:
+    """Resolve wake_backend: 'auto' prefers Porcupine when installed and keyed, else Vosk."""
+    backend = str(cfg.get("wake_backend", "auto")).strip().lower()
+    if backend == "auto":
+        return "porcupine" if HAVE_PORCUPINE and get_key_safe("PICOVOICE_ACCESS_KEY") else "vosk"
+    return backend
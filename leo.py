@@ -1,8 +1,5 @@
 import sounddevice as sd
 import queue
-import json
-from vosk import Model, KaldiRecognizer
-import pyttsx3
 import os
 import threading
 import time
@@ -10,22 +7,75 @@ import sys
 from pathlib import Path
 from core.constants import ASSISTANT_NAME
 
-# Windows-only beep (fastest). On non-Windows, we’ll fall back to TTS.
+# Windows-only beep (fastest). On non-Windows, we play generated tone buffers.
 if sys.platform.startswith("win"):
     import winsound
 
-from core.config import load_config, get_key
-from core.wake_word import WakeWordDetector
+from core.config import load_config, get_key, list_models, model_for_role
+from core.wake_word import VoskWakeWordDetector, WakeWordDetector, wake_backend
 from core.ui import show_listening, show_sleeping, show_message
 from core.history import HistoryRecorder
+from core.asr import ModelLoader, ModelPool
+from core.tts import PhraseCache, play_tones, say
+from core import metrics
 
-MODEL_PATH = r"D:\AI Models\J A R V I S\vosk-model-en-in-0.5"
 SAMPLE_RATE = 16000
 BLOCK_SIZE = 8000
+_block_size = BLOCK_SIZE  # current mic block size (lowered by RTF degradation)
 
-q = queue.Queue()
+AUDIO_QUEUE_MAX = 240  # blocks (~2 min of audio); covers buffering while the model loads
+
+q = queue.Queue(maxsize=AUDIO_QUEUE_MAX)
 stream = None  # Vosk mic stream
 
+# Runtime metrics (see core/metrics.py)
+AUDIO_DROPS = metrics.counter("leo_audio_blocks_dropped_total", "Mic blocks dropped because the queue was full")
+metrics.gauge("leo_audio_queue_depth", "Mic blocks waiting to be decoded", fn=q.qsize)
+DECODE_SECONDS = metrics.histogram("leo_decode_seconds", "Recognizer time per audio chunk", ("source",))
+WAKE_TOTAL = metrics.counter("leo_wake_detections_total", "Wake word detections")
+DECODE_RTF = metrics.gauge("leo_decode_rtf", "Decode real-time factor of the last processed block")
+UTTERANCE_RTF = metrics.histogram(
+    "leo_utterance_rtf", "Decode real-time factor per utterance", buckets=(0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 4.0)
+)
+DEGRADE_LEVEL = metrics.gauge("leo_degradation_level", "Recognizer degradation steps in effect")
+TTS_SECONDS = metrics.histogram("leo_tts_seconds", "Time spent speaking a reply", ("path",))
+SESSIONS_TOTAL = metrics.counter("leo_sessions_total", "Listening sessions started", ("kind",))
+
+_alloc_tracker = None  # AllocationTracker when tracemalloc_enabled
+_speak_lock = threading.RLock()
+command_server = None  # CommandServer: text commands from leo_cli.py
+_capture = None  # AudioCapture when capture_enabled: per-utterance clips for diagnostics
+
+# Voice control phrases handled before skill dispatch
+EXIT_WORDS = ("stop", "exit", "shutdown", "quit")
+SLEEP_PHRASES = ("go to sleep", "stop listening", "sleep mode")
+
+_decoders = {}  # (id(loader), grammar) -> decoder, built on first use
+_decoder_listeners = {}  # same key -> skill reload listener of a command-mode decoder
+model_pool = None  # ModelPool: Vosk models by role (core.config model registry)
+_second_pass = None  # SecondPass: re-decodes free-form requests with the dictation model
+_second_results = queue.Queue()  # its transcripts, handled by the audio processor
+_rtf_monitor = None  # RtfMonitor; lives across sessions so the degradation level persists
+
+# Fixed replies worth pre-rendering (played from PCM instead of live TTS)
+WAKE_TONES = ((880, 120), (1320, 120))
+CACHED_PHRASES = [
+    "I'm listening.",
+    "Volume up.",
+    "Volume down.",
+    "Muted.",
+    "Unmuted.",
+    "Opening Notepad, sir.",
+    "Opening Calculator, sir.",
+    "Opening Google Chrome.",
+    "What should I search for?",
+    "I faced an error running that command.",
+    "Going to sleep. Say the wake word to activate me.",
+    "No activity detected. Going to sleep.",
+    "Goodbye sir, shutting down.",
+]
+phrase_cache = None  # PhraseCache when tts_cache_enabled
+
 # session state
 _session_state = {
     "mode": "sleep",           # "sleep" | "recognize"
@@ -36,59 +86,67 @@ def now():
     return time.monotonic()
 
 def beep():
-    """Short confirmation beep on wake (Windows fast path)."""
+    """Short confirmation beep on wake (Windows fast path, generated tones elsewhere)."""
     if sys.platform.startswith("win"):
         try:
-            winsound.Beep(880, 120)
-            winsound.Beep(1320, 120)
+            for freq, ms in WAKE_TONES:
+                winsound.Beep(freq, ms)
             return
         except Exception:
             pass
+    try:
+        play_tones(WAKE_TONES)
+        return
+    except Exception as e:
+        print(f"⚠️ Tone playback error: {e}")
     # fallback: quick TTS chirp
     speak("ding")
 
 def speak(text: str):
     """Stop mic stream, speak with TTS, then restart mic stream if in recognize mode."""
     global stream, history
-    print(f"🤖 Assistant: {text}")
-    if history:
-        history.log({ASSISTANT_NAME}, text)
+    with _speak_lock:  # the audio processor and the command socket can both reply
+        print(f"🤖 Assistant: {text}")
+        if history:
+            history.log({ASSISTANT_NAME}, text)
+
+        if stream:
+            try:
+                stream.stop()
+                stream.close()
+            except Exception as e:
+                print(f"⚠️ Error stopping stream: {e}")
 
-    if stream:
+        t0 = time.perf_counter()
+        path = "cache"
         try:
-            stream.stop()
-            stream.close()
+            if not (phrase_cache and phrase_cache.play(text)):
+                path = "live"
+                say(text)
         except Exception as e:
-            print(f"⚠️ Error stopping stream: {e}")
+            path = "error"
+            print(f"⚠️ TTS error: {e}")
+        TTS_SECONDS.observe(time.perf_counter() - t0, path=path)
 
-    try:
-        engine = pyttsx3.init("sapi5")
-        voices = engine.getProperty("voices")
-        if voices:
-            engine.setProperty("voice", voices[0].id)
-        engine.setProperty("rate", 160)
-        engine.setProperty("volume", 1.0)
-        engine.say(text)
-        engine.runAndWait()
-    except Exception as e:
-        print(f"⚠️ TTS error: {e}")
-
-    try:
-        if recognizer_active():
-            start_vosk_stream()
-    except Exception as e:
-        print(f"⚠️ Error starting stream: {e}")
+        try:
+            if recognizer_active():
+                start_vosk_stream()
+        except Exception as e:
+            print(f"⚠️ Error starting stream: {e}")
 
 def callback(indata, frames, time_info, status):
     if status:
         print(status)
-    q.put(bytes(indata))
+    try:
+        q.put_nowait(bytes(indata))
+    except queue.Full:
+        AUDIO_DROPS.inc()
 
 def start_vosk_stream():
     global stream
     stream = sd.RawInputStream(
         samplerate=SAMPLE_RATE,
-        blocksize=BLOCK_SIZE,
+        blocksize=_block_size,
         dtype="int16",
         channels=1,
         callback=callback
@@ -98,13 +156,149 @@ def start_vosk_stream():
 def recognizer_active() -> bool:
     return _session_state.get("mode") == "recognize"
 
-def wait_for_wake(cfg):
-    # Ensure key exists (clear error if missing)
-    get_key("PICOVOICE_ACCESS_KEY")
-    detector = WakeWordDetector(
-        keyword=cfg["wake_word"],
-        sensitivity=float(cfg["wake_sensitivity"])
+def _command_vocabulary():
+    from skills.registry import command_vocabulary
+    return command_vocabulary(EXIT_WORDS + SLEEP_PHRASES)
+
+def _needs_full_decode(text: str) -> bool:
+    from skills.registry import needs_full_decode
+    if any(k in text for k in EXIT_WORDS + SLEEP_PHRASES):
+        return False
+    return needs_full_decode(text)
+
+def make_decoder(loader, cfg, grammar=None):
+    """Return a decoder (accept(block) -> transcript or None, flush() -> transcript) per cfg."""
+    if grammar is None:
+        grammar = bool(cfg.get("command_grammar", False))
+    key = (id(loader), grammar)
+    dec = _decoders.get(key)
+    if dec is not None:
+        return dec
+    if grammar:
+        from core.asr import CommandModeRecognizer
+        from skills.registry import add_reload_listener
+        dec = CommandModeRecognizer(
+            loader.model, SAMPLE_RATE, loader.recognizer,
+            _command_vocabulary(), _needs_full_decode,
+        )
+        # Skills changed -> new vocabulary (removed again when the model is unloaded)
+        listener = _decoder_listeners[key] = lambda: dec.set_vocabulary(_command_vocabulary())
+        add_reload_listener(listener)
+    else:
+        from core.asr import FullRecognizer
+        dec = FullRecognizer(loader.recognizer)
+    _decoders[key] = dec
+    return dec
+
+def _forget_decoders(ld):
+    """Drop cached decoders of an unloaded model so its memory can be freed."""
+    from skills.registry import remove_reload_listener
+    for key in [k for k in _decoders if k[0] == id(ld)]:
+        del _decoders[key]
+        listener = _decoder_listeners.pop(key, None)
+        if listener is not None:
+            remove_reload_listener(listener)  # it holds the decoder, and so the model
+    if _second_pass is not None:
+        _second_pass.forget(ld)
+
+def _needs_second_pass(text: str) -> bool:
+    from skills.registry import needs_free_text
+    if any(k in text for k in EXIT_WORDS + SLEEP_PHRASES):
+        return False
+    return needs_free_text(text)
+
+def make_second_pass(cfg):
+    """SecondPass when dictation uses a different (larger) model than commands, else None."""
+    global _second_pass
+    if not cfg.get("two_pass", True):
+        return None
+    if _second_pass is None:
+        cmd, dic = model_pool.spec("command"), model_pool.spec("dictation")
+        if cmd is None or dic is None or cmd.name == dic.name:
+            return None
+        from core.asr import SecondPass
+        _second_pass = SecondPass(
+            lambda: model_pool.loader("dictation"),
+            _needs_second_pass,
+            lambda text, fast: _second_results.put(text),
+            SAMPLE_RATE,
+            max_sec=float(cfg.get("two_pass_max_sec", 15)),
+        )
+    return _second_pass
+
+def make_rtf_monitor(cfg):
+    global _rtf_monitor
+    if _rtf_monitor is None and cfg.get("rtf_monitor_enabled", True):
+        from core.rtf import RtfMonitor
+        steps = [s.strip() for s in str(cfg.get("rtf_degrade_steps", "")).split(",") if s.strip()]
+        if "fallback_model" in steps and model_pool.spec("fallback") is None:
+            steps.remove("fallback_model")
+        _rtf_monitor = RtfMonitor(
+            SAMPLE_RATE,
+            steps=steps,
+            high=float(cfg.get("rtf_high", 0.8)),
+            low=float(cfg.get("rtf_low", 0.4)),
+            window=int(cfg.get("rtf_window_blocks", 10)),
+            recover_window=4 * int(cfg.get("rtf_window_blocks", 10)),
+            on_change=lambda old, new, reason: _on_degradation(cfg, old, new, reason),
+        )
+    return _rtf_monitor
+
+def _on_degradation(cfg, old, new, reason):
+    """Log the transition and apply the stream-level step; decoders switch in the processor."""
+    global _block_size
+    steps = _rtf_monitor.steps[:new]
+    verb = "Degrading" if new > old else "Recovering"
+    msg = f"{verb} recognizer to level {new} ({', '.join(steps) or 'full quality'}): {reason}"
+    print(("🐢 " if new > old else "🐇 ") + msg)
+    if history:
+        history.event(msg)
+    DEGRADE_LEVEL.set(new)
+
+    if "fallback_model" in steps:
+        model_pool.loader("fallback")  # starts loading; the processor switches once it is ready
+
+    want = int(cfg.get("degraded_block_size", 4000)) if "block_size" in steps else BLOCK_SIZE
+    if want != _block_size:
+        _block_size = want
+        # Same restart speak() does; the mic callback keeps feeding the same queue
+        try:
+            if stream:
+                stream.stop()
+                stream.close()
+            if recognizer_active():
+                start_vosk_stream()
+        except Exception as e:
+            print(f"⚠️ Error restarting stream: {e}")
+
+def make_vad(cfg):
+    if not cfg.get("vad_enabled", True):
+        return None
+    from core.vad import VadGate
+    return VadGate(
+        sample_rate=SAMPLE_RATE,
+        padding_ms=int(cfg.get("vad_padding_ms", 300)),
+        backend=str(cfg.get("vad_backend", "energy")),
+        aggressiveness=int(cfg.get("vad_aggressiveness", 2)),
     )
+
+def wait_for_wake(cfg):
+    if wake_backend(cfg) == "vosk":
+        # Keyword spotting on the command model: one engine, no access key
+        detector = VoskWakeWordDetector(
+            keyword=cfg["wake_word"],
+            sensitivity=float(cfg["wake_sensitivity"]),
+            loader=model_pool.loader("command"),
+            sample_rate=SAMPLE_RATE,
+            vad=make_vad(cfg),
+        )
+    else:
+        # Ensure key exists (clear error if missing)
+        get_key("PICOVOICE_ACCESS_KEY")
+        detector = WakeWordDetector(
+            keyword=cfg["wake_word"],
+            sensitivity=float(cfg["wake_sensitivity"])
+        )
     try:
         if cfg.get("overlay_enabled", True):
             show_sleeping()
@@ -113,8 +307,8 @@ def wait_for_wake(cfg):
     finally:
         detector.close()
 
-def vosk_session(model, recognizer, cfg):
-    from skills.registry import load_skills, dispatch
+def vosk_session(loader, cfg):
+    from skills.registry import load_skills, dispatch_match
 
     skills = load_skills()
     print(f"🧩 Loaded skills: {', '.join([s.name for s in skills]) or 'none'}")
@@ -123,7 +317,15 @@ def vosk_session(model, recognizer, cfg):
 
     _session_state["mode"] = "recognize"
     _session_state["last_activity"] = now()
+    SESSIONS_TOTAL.inc(kind="voice")
 
+    profiler = None
+    if cfg.get("profile_enabled", False):
+        from core.profiler import SamplingProfiler
+        threads = [t.strip() for t in str(cfg.get("profile_threads", "")).split(",") if t.strip()]
+        profiler = SamplingProfiler(int(cfg.get("profile_interval_ms", 10)) / 1000.0, threads).start()
+
+    # Mic starts right away; if the model is still loading, audio queues up in `q`
     start_vosk_stream()
 
     # Visual + audio confirmation on wake
@@ -137,38 +339,147 @@ def vosk_session(model, recognizer, cfg):
     timeout_sec = int(cfg.get("session_timeout_sec", 120))
 
     def audio_processor():
+        if not loader.ready:
+            print("⏳ Vosk model still loading; buffering audio…")
+            if history:
+                history.event("Wake during model load; buffering audio")
+        if not loader.wait():
+            print(f"⚠️ Vosk model failed to load: {loader.error}")
+            speak("My speech model failed to load.")
+            _session_state["mode"] = "sleep"
+            return
+        monitor = make_rtf_monitor(cfg)
+        gate = make_vad(cfg)
+        _session_state["last_activity"] = now()
+
+        def wanted_decoder():
+            """Decoder for the current degradation level (fallback model once it has loaded)."""
+            nonlocal current_loader
+            steps = monitor.active_steps if monitor else ()
+            current_loader = loader
+            if "fallback_model" in steps:
+                fb = model_pool.loader("fallback")
+                if fb is not None and fb.ready and fb.error is None:
+                    current_loader = fb
+            return make_decoder(current_loader, cfg, grammar=True if "grammar" in steps else None)
+
+        current_loader = loader
+        decoder = wanted_decoder()
+        utterance_rtfs = []  # (loader, rtf) for the model stats
+        fed = [0, 0.0]  # bytes decoded (re-decodes included), seconds spent decoding them
+        second = make_second_pass(cfg)
+        if second is not None:
+            second.reset()
+            while not _second_results.empty():
+                _second_results.get_nowait()  # late results from the previous session
+
+        if _capture is not None:
+            _capture.mark()
+
+        def decode(chunk, final=False):
+            if second is not None:
+                second.add(chunk)
+            if _capture is not None:
+                _capture.add(chunk)
+            redecoded = decoder.redecoded
+            t0 = time.perf_counter()
+            text = decoder.accept(chunk)
+            if final and text is None:
+                text = decoder.flush()
+            # The time includes any command-mode re-decode, so count that audio too
+            fed[0] += len(chunk) + decoder.redecoded - redecoded
+            fed[1] += time.perf_counter() - t0
+            return text
+
+        def transcripts(data):
+            """Decoded utterances from one block; only VAD speech reaches the recognizer."""
+            nonlocal decoder
+            texts = []
+            nxt = wanted_decoder()
+            if nxt is not decoder:
+                # Level changed: finish the utterance in progress on the old decoder
+                texts.append(decoder.flush())
+                decoder = nxt
+            if gate is None:
+                texts.append(decode(data))
+            else:
+                for speech, ended in gate.feed(data):
+                    texts.append(decode(speech, final=ended))
+            return [t for t in texts if t]
+
+        def handle(text, clip=None):
+            """Act on one final transcript; returns False when the session should end."""
+            print(f"🗣️ You said: {text}")
+            if history:
+                history.log("You", text)
+                if clip is not None:
+                    history.event(f"Audio: {clip}")
+            _session_state["last_activity"] = now()
+
+            if any(k in text for k in EXIT_WORDS):
+                speak("Goodbye sir, shutting down.")
+                if history:
+                    history.event("System exiting by voice command.")
+                os._exit(0)
+
+            if any(k in text for k in SLEEP_PHRASES):
+                speak("Going to sleep. Say the wake word to activate me.")
+                if history:
+                    history.event("Going to sleep by voice command.")
+                _session_state["mode"] = "sleep"
+                return False
+
+            m = dispatch_match(text, speak)
+            handled = m is not None
+            if history:
+                # intent/skill let `leo replay` compare against recorded outcomes
+                history.event(f"Dispatch handled={handled}" + (f" intent={m.intent.name} skill={m.skill.name}" if m else "")
+                          + (f" via=fallback near='{m.pattern}'" if m and m.fallback else ""))
+            return True
+
         while recognizer_active():
-            data = q.get()
-            if recognizer.AcceptWaveform(data):
-                result = recognizer.Result()
-                text = json.loads(result).get("text", "").strip().lower()
-                if text:
-                    print(f"🗣️ You said: {text}")
-                    if history:
-                        history.log("You", text)
-                    _session_state["last_activity"] = now()
-
-                    if any(k in text for k in ("stop", "exit", "shutdown", "quit")):
-                        speak("Goodbye sir, shutting down.")
-                        if history:
-                            history.event("System exiting by voice command.")
-                        os._exit(0)
-
-                    if any(k in text for k in ("go to sleep", "stop listening", "sleep mode")):
-                        speak("Going to sleep. Say the wake word to activate me.")
-                        if history:
-                            history.event("Going to sleep by voice command.")
-                        _session_state["mode"] = "sleep"
-                        break
-
-                    handled = dispatch(text, speak)
-                    if history:
-                        history.event(f"Dispatch handled={handled}")
-                    if not handled:
-                        # Optional: fallback
-                        pass
+            # Re-decoded free-form requests from the dictation model
+            while not _second_results.empty() and recognizer_active():
+                handle(_second_results.get_nowait())
+            try:
+                data = q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            model_pool.touch(current_loader)
+            t0 = time.perf_counter()
+            fed[0], fed[1] = 0, 0.0
+            texts = transcripts(data)
+            DECODE_SECONDS.observe(time.perf_counter() - t0, source="mic")
+            if monitor and fed[0]:
+                DECODE_RTF.set(monitor.record(fed[0], fed[1]))
+            if monitor and texts:
+                rtf = monitor.end_utterance()
+                UTTERANCE_RTF.observe(rtf)
+                utterance_rtfs.append((current_loader, rtf))
+            for text in texts:
+                clip = _capture.cut(text) if _capture is not None else None
+                if second is not None:
+                    text = second.finish(text)
+                    if text is None:
+                        # Fast path stays free; the dictation result is handled when it lands
+                        print("🔁 Free-form request; re-decoding with the dictation model…")
+                        if history and clip is not None:
+                            history.event(f"Audio: {clip} (re-decoding)")
+                        continue
+                if not handle(text, clip):
+                    break
+
+        for ld in {ld for ld, _ in utterance_rtfs}:
+            rtfs = [r for l, r in utterance_rtfs if l is ld]
+            model_pool.record_rtf(ld, sum(rtfs) / len(rtfs))
 
-    processor_thread = threading.Thread(target=audio_processor, daemon=True)
+        if gate is not None:
+            msg = f"VAD skipped {gate.skipped_fraction:.0%} of {gate.frames_total} frames"
+            print(f"🔇 {msg}")
+            if history:
+                history.event(msg)
+
+    processor_thread = threading.Thread(target=audio_processor, name="audio_processor", daemon=True)
     processor_thread.start()
 
     # Keep device alive and check for inactivity timeout
@@ -176,7 +487,8 @@ def vosk_session(model, recognizer, cfg):
         with stream:
             while recognizer_active():
                 sd.sleep(100)
-                if timeout_sec > 0 and (now() - _session_state["last_activity"]) > timeout_sec:
+                # Inactivity clock only runs once the model can actually hear us
+                if timeout_sec > 0 and loader.ready and (now() - _session_state["last_activity"]) > timeout_sec:
                     speak("No activity detected. Going to sleep.")
                     if history:
                         history.event("Auto-sleep due to inactivity.")
@@ -191,6 +503,91 @@ def vosk_session(model, recognizer, cfg):
             pass
         if cfg.get("overlay_enabled", True):
             show_sleeping()
+        if cfg.get("metrics_dump_path"):
+            try:
+                metrics.dump(Path(cfg["metrics_dump_path"]))
+            except Exception as e:
+                print(f"⚠️ Metrics dump failed: {e}")
+        write_diagnostics(cfg, profiler)
+
+def write_diagnostics(cfg, profiler):
+    """Per-session profiler output and allocation diff, into history_dir."""
+    logs_dir = Path(cfg.get("history_dir", "logs"))
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    if profiler is not None:
+        profiler.stop()
+        try:
+            path = profiler.write(logs_dir / f"profile_{stamp}.collapsed")
+            hot = ", ".join(f"{name} ({n})" for name, n in profiler.hottest(3))
+            print(f"🔬 Profile: {profiler.samples} samples -> {path}")
+            if history:
+                history.event(f"Profile written: {path} ({profiler.samples} samples; hottest: {hot})")
+        except Exception as e:
+            print(f"⚠️ Profile write failed: {e}")
+    if _alloc_tracker is not None:
+        try:
+            path = _alloc_tracker.checkpoint(logs_dir / f"alloc_{stamp}.txt")
+            if path and history:
+                history.event(f"Allocation diff written: {path}")
+        except Exception as e:
+            print(f"⚠️ Allocation snapshot failed: {e}")
+
+def deliver_timer(text: str):
+    """Due timers/reminders: spoken right away, whether or not a session is active."""
+    if history:
+        history.event(f"Timer: {text}")
+    speak(text)
+
+def configure_fallback(cfg):
+    from skills.registry import set_fallback_threshold
+    threshold = float(cfg.get("intent_fallback_threshold", 0) or 0)
+    set_fallback_threshold(threshold if threshold > 0 else None)
+
+def start_metrics(cfg):
+    port = int(cfg.get("metrics_port", 0))
+    if port:
+        try:
+            metrics.start_http_server(cfg.get("metrics_host", "127.0.0.1"), port)
+        except OSError as e:
+            print(f"⚠️ Metrics endpoint failed to start: {e}")
+
+def handle_text_command(text: str, speak_aloud: bool = False) -> dict:
+    """Command socket entry: the voice dispatch path, with replies returned as text."""
+    from skills.registry import dispatch_match
+
+    replies = []
+
+    def reply(t: str):
+        replies.append(t)
+        if speak_aloud:
+            speak(t)
+        else:
+            print(f"🤖 Assistant: {t}")
+            if history:
+                history.log(ASSISTANT_NAME, t)
+
+    if history:
+        history.log("You@cli", text)
+    m = dispatch_match(text, reply)
+    if history:
+        history.event(f"Dispatch handled={m is not None}" + (f" intent={m.intent.name} skill={m.skill.name}" if m else "")
+                          + (f" via=fallback near='{m.pattern}'" if m and m.fallback else ""))
+    return {
+        "handled": m is not None,
+        "intent": m.intent.name if m else None,
+        "skill": m.skill.name if m else None,
+        "replies": replies,
+    }
+
+def start_command_socket(cfg):
+    global command_server
+    if not cfg.get("command_socket_enabled", True):
+        return
+    from core.command_socket import CommandServer
+    try:
+        command_server = CommandServer(handle_text_command, cfg.get("command_socket_address") or None).start()
+    except OSError as e:
+        print(f"⚠️ Command socket failed to start: {e}")
 
 def main():
     global history
@@ -200,26 +597,139 @@ def main():
     logs_dir = Path(cfg.get("history_dir", "logs"))
     history_enabled = bool(cfg.get("history_enabled", True))
     history = HistoryRecorder(logs_dir, enabled=history_enabled)
+    start_metrics(cfg)
+    configure_fallback(cfg)
+
+    global _alloc_tracker
+    if cfg.get("tracemalloc_enabled", False):
+        from core.profiler import AllocationTracker
+        _alloc_tracker = AllocationTracker()
+        _alloc_tracker.checkpoint()  # baseline for the first session's diff
+
+    global _capture
+    if cfg.get("capture_enabled", False):
+        from core.capture import AudioCapture
+        _capture = AudioCapture(
+            Path(cfg.get("capture_dir", "logs/audio")),
+            sample_rate=SAMPLE_RATE,
+            seconds=float(cfg.get("capture_seconds", 30)),
+            max_mb=float(cfg.get("capture_max_mb", 200)),
+            fmt=str(cfg.get("capture_format", "flac")),
+        )
+
+    global phrase_cache
+    if cfg.get("tts_cache_enabled", True):
+        phrase_cache = PhraseCache(Path(cfg.get("tts_cache_dir", "cache/tts")))
+        phrase_cache.warm(CACHED_PHRASES)
+
+    def _model_loaded(name: str, ld: ModelLoader):
+        if ld.error:
+            msg = f"Vosk model '{name}' failed to load: {ld.error}"
+        else:
+            msg = f"Vosk model '{name}' ready in {ld.load_time:.1f}s"
+        print(("⚠️ " if ld.error else "✅ ") + msg)
+        if history:
+            history.event(msg)
 
-    if not os.path.exists(MODEL_PATH):
-        msg = "Vosk model not found, check MODEL_PATH."
+    global model_pool
+    model_pool = ModelPool(cfg, SAMPLE_RATE, on_loaded=_model_loaded, on_unload=_forget_decoders)
+    spec = model_pool.spec("command")
+    if spec is None:
+        msg = "No Vosk model found. Put models under models_dir or list them in config 'models'."
         print("⚠️ " + msg)
         if history:
             history.event(msg)
         return
 
-    print("🔄 Loading Vosk model…")
+    # Load + warm up the command model in the background; wake detection starts immediately
     if history:
-        history.event("Loading Vosk model")
-    model = Model(MODEL_PATH)
-    recognizer = KaldiRecognizer(model, SAMPLE_RATE)
+        history.event(f"Loading Vosk model '{spec.name}' for commands")
+    model_pool.loader("command")
+
+    if cfg.get("skills_hot_reload", True):
+        from skills.registry import start_watcher
+        start_watcher(float(cfg.get("skills_reload_interval_sec", 1.0)))
+    start_command_socket(cfg)
+
+    # Timers/reminders (resumes the ones persisted by the last run)
+    from skills.scheduler import set_delivery
+    set_delivery(deliver_timer)
 
     while True:
         _session_state["mode"] = "sleep"
         wait_for_wake(cfg)
+        WAKE_TOTAL.inc()
         if history:
             history.event("Wake word detected")
-        vosk_session(model, recognizer, cfg)
+        vosk_session(model_pool.loader("command"), cfg)
+
+def serve(cfg, host=None, port=None, workers=None):
+    """Server mode: one shared model, many remote microphones (see core/server.py)."""
+    from core.server import run_server
+    from vosk import Model
+
+    logs_dir = Path(cfg.get("history_dir", "logs"))
+    recorder = HistoryRecorder(logs_dir, enabled=bool(cfg.get("history_enabled", True)))
+    start_metrics(cfg)
+    configure_fallback(cfg)
+    spec = model_for_role("dictation", cfg)  # clients send free-form speech too
+    if spec is None:
+        print("⚠️ No Vosk model found. Put models under models_dir or list them in config 'models'.")
+        return
+    print(f"🔄 Loading Vosk model '{spec.name}'…")
+    model = Model(str(spec.path))
+    run_server(
+        model,
+        host=host or cfg.get("server_host", "127.0.0.1"),
+        port=int(port or cfg.get("server_port", 8765)),
+        workers=int(workers if workers is not None else cfg.get("server_workers", 0)),
+        history=recorder,
+    )
+
+def show_models(cfg):
+    """Print the model registry: size, measured load time and RTF, and role assignments."""
+    models = list_models(cfg)
+    if not models:
+        print("No Vosk models found. Put them under models_dir or list them in config 'models'.")
+        return
+    roles = {}
+    for role in cfg.get("model_roles", {}):
+        spec = model_for_role(role, cfg)
+        if spec is not None:
+            roles.setdefault(spec.name, []).append(role)
+    print(f"{'model':<40} {'size':>9} {'load':>7} {'rtf':>6}  roles")
+    for m in models.values():
+        load = f"{m.load_time:.1f}s" if m.load_time is not None else "-"
+        rtf = f"{m.rtf:.2f}" if m.rtf is not None else "-"
+        print(f"{m.name:<40} {m.size_mb:>7.0f}MB {load:>7} {rtf:>6}  {', '.join(roles.get(m.name, []))}")
+
+def cli(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(prog="leo", description=f"{ASSISTANT_NAME} voice assistant")
+    sub = ap.add_subparsers(dest="cmd")
+    sp = sub.add_parser("serve", help="serve many clients over TCP from one loaded model")
+    sp.add_argument("--host")
+    sp.add_argument("--port", type=int)
+    sp.add_argument("--workers", type=int, help="decode threads (default: CPU cores)")
+    sub.add_parser("models", help="list Vosk models with size, load time, RTF and roles")
+    bp = sub.add_parser("batch", help="transcribe + label a WAV corpus offline (see core/batch.py)")
+    bp.add_argument("args", nargs=argparse.REMAINDER)
+    rp = sub.add_parser("replay", help="replay logged transcripts through dispatch (see core/replay.py)")
+    rp.add_argument("args", nargs=argparse.REMAINDER)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "serve":
+        serve(load_config(), args.host, args.port, args.workers)
+    elif args.cmd == "models":
+        show_models(load_config())
+    elif args.cmd == "batch":
+        from core.batch import main as batch_main
+        sys.exit(batch_main(args.args))
+    elif args.cmd == "replay":
+        from core.replay import main as replay_main
+        sys.exit(replay_main(args.args))
+    else:
+        main()
 
 if __name__ == "__main__":
-    main()
+    cli()
@@ -0,0 +1,8 @@
+# leo_cli.py
+"""Send text commands to a running Leo: python leo_cli.py "search file report" [--speak]"""
+import sys
+
+from core.command_socket import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+# skills/app_index.py
+"""
+Application launch index for "open <app>".
+
+Built once on a background thread and refreshed when the source folders change:
+  - Linux:   .desktop files (XDG data dirs, flatpak exports)
+  - Windows: Start Menu shortcuts (.lnk) + a few built-in programs
+  - both:    executables on PATH, but only those named in PATH_ALLOWLIST
+Spoken names resolve by exact name, then alias, then fuzzy match, to a cached
+launch target, so launching is a single spawn. PATH executables are never fuzzy-matched
+("open shut down" must not find `shutdown`).
+"""
+from __future__ import annotations
+import configparser
+import difflib
+import os
+import re
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Spoken name -> other names it may be installed under (tried in order)
+ALIASES: Dict[str, List[str]] = {
+    "notepad": ["notepad", "text editor", "gedit", "gnome text editor", "kate", "textedit"],
+    "calculator": ["calculator", "calc", "gnome calculator", "kcalc"],
+    "chrome": ["google chrome", "chrome", "chromium", "google chrome stable"],
+    "browser": ["web browser", "firefox", "google chrome", "microsoft edge"],
+    "edge": ["microsoft edge", "msedge"],
+    "terminal": ["terminal", "gnome terminal", "konsole", "windows terminal", "command prompt"],
+    "files": ["files", "file manager", "nautilus", "dolphin", "file explorer", "explorer"],
+}
+
+# Programs that may be launched straight from PATH (exact name only)
+PATH_ALLOWLIST = {
+    "gedit", "kate", "gnome text editor", "calc", "gnome calculator", "kcalc", "chromium", "firefox",
+    "google chrome", "google chrome stable", "msedge", "konsole", "gnome terminal", "nautilus", "dolphin",
+    "code", "codium", "vlc", "gimp", "inkscape", "blender", "audacity", "thunderbird", "libreoffice",
+    "spotify", "discord", "slack", "obs", "steam",
+}
+
+# Always-present Windows programs that have no Start Menu shortcut
+_WINDOWS_BUILTINS = {"notepad": "notepad.exe", "calc": "calc.exe", "explorer": "explorer.exe"}
+
+_FIELD_CODES = re.compile(r"\s*%[fFuUdDnNickvm]")
+
+
+def _norm(name: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9+ ]+", " ", name.lower()).split())
+
+
+@dataclass
+class AppEntry:
+    name: str                       # display name
+    argv: Optional[List[str]] = None
+    target: Optional[str] = None    # file to open with the OS (Windows shortcuts)
+    source: str = ""                # "desktop" | "startmenu" | "path" | "builtin"
+
+    def launch(self) -> None:
+        if self.target:
+            os.startfile(self.target)  # Windows-only
+            return
+        kwargs = dict(stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if os.name == "posix":
+            kwargs["start_new_session"] = True  # don't die with Leo / share its terminal
+        subprocess.Popen(self.argv, **kwargs)
+
+
+# ---------- Sources ----------
+def _desktop_dirs() -> List[Path]:
+    data_home = Path(os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share")
+    data_dirs = (os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share").split(":")
+    dirs = [data_home / "applications"] + [Path(d) / "applications" for d in data_dirs if d]
+    dirs += [
+        Path("/var/lib/flatpak/exports/share/applications"),
+        data_home / "flatpak" / "exports" / "share" / "applications",
+    ]
+    return [d for d in dirs if d.is_dir()]
+
+
+def _start_menu_dirs() -> List[Path]:
+    dirs = []
+    for env in ("APPDATA", "PROGRAMDATA"):
+        base = os.environ.get(env)
+        if base:
+            dirs.append(Path(base) / "Microsoft" / "Windows" / "Start Menu" / "Programs")
+    return [d for d in dirs if d.is_dir()]
+
+
+def _path_dirs() -> List[Path]:
+    return [Path(p) for p in os.environ.get("PATH", "").split(os.pathsep) if p and Path(p).is_dir()]
+
+
+def _parse_desktop(path: Path) -> List[Tuple[str, AppEntry]]:
+    cp = configparser.ConfigParser(interpolation=None, strict=False)
+    try:
+        cp.read(path, encoding="utf-8")
+        e = cp["Desktop Entry"]
+    except Exception:
+        return []
+    if e.get("Type", "Application") != "Application" or e.get("NoDisplay") == "true" or e.get("Hidden") == "true":
+        return []
+    name, exec_ = e.get("Name"), e.get("Exec")
+    if not name or not exec_:
+        return []
+    try:
+        argv = shlex.split(_FIELD_CODES.sub("", exec_))
+    except ValueError:
+        return []
+    entry = AppEntry(name=name, argv=argv, source="desktop")
+    names = [name, path.stem]
+    if e.get("GenericName"):
+        names.append(e["GenericName"])
+    return [(n, entry) for n in names]
+
+
+def _scan() -> Dict[str, AppEntry]:
+    """name -> entry; earlier sources win (desktop/start menu over bare executables)."""
+    found: List[Tuple[str, AppEntry]] = []
+    if sys.platform == "win32":
+        for d in _start_menu_dirs():
+            for lnk in d.rglob("*.lnk"):
+                if "uninstall" not in lnk.stem.lower():
+                    found.append((lnk.stem, AppEntry(name=lnk.stem, target=str(lnk), source="startmenu")))
+        for name, exe in _WINDOWS_BUILTINS.items():
+            found.append((name, AppEntry(name=name, argv=[exe], source="builtin")))
+        exts = tuple(os.environ.get("PATHEXT", ".EXE").lower().split(";"))
+    else:
+        for d in _desktop_dirs():
+            for f in d.glob("*.desktop"):
+                found += _parse_desktop(f)
+        exts = ()
+    for d in _path_dirs():
+        try:
+            for f in d.iterdir():
+                if exts and not f.name.lower().endswith(exts):
+                    continue
+                name = f.stem if exts else f.name
+                if _norm(name) in PATH_ALLOWLIST and (exts or os.access(f, os.X_OK)) and f.is_file():
+                    found.append((name, AppEntry(name=name, argv=[str(f)], source="path")))
+        except OSError:
+            pass
+
+    index: Dict[str, AppEntry] = {}
+    for name, entry in found:
+        index.setdefault(_norm(name), entry)
+    return index
+
+
+def _signature() -> Tuple[Tuple[str, int], ...]:
+    """Cheap change detector: mtimes of the folders we index."""
+    dirs = _start_menu_dirs() if sys.platform == "win32" else _desktop_dirs()
+    sig = []
+    for d in dirs + _path_dirs():
+        roots = [p for p, _, _ in os.walk(d)] if sys.platform == "win32" and d in dirs else [d]
+        for r in roots:
+            try:
+                sig.append((str(r), os.stat(r).st_mtime_ns))
+            except OSError:
+                pass
+    return tuple(sig)
+
+
+# ---------- Index ----------
+class AppIndex:
+    def __init__(self, refresh_sec: float = 60.0):
+        self.refresh_sec = refresh_sec
+        self._state: Tuple[Dict[str, AppEntry], List[str]] = ({}, [])  # (entries, sorted fuzzy-matchable names)
+        self._sig: Tuple = ()
+        self._ready = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "AppIndex":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="app_index", daemon=True)
+            self._thread.start()
+        return self
+
+    def _rebuild(self):
+        sig = _signature()
+        entries = _scan()
+        # One assignment: readers never see a half-built index
+        self._state = (entries, sorted(n for n, e in entries.items() if e.source != "path"))
+        self._sig = sig
+        self._ready.set()
+
+    def _run(self):
+        try:
+            self._rebuild()
+        except Exception as e:
+            print(f"⚠️ App index build failed: {e}")
+            self._ready.set()
+        while True:
+            time.sleep(self.refresh_sec)
+            try:
+                if _signature() != self._sig:
+                    self._rebuild()
+                    print(f"🔁 App index refreshed ({len(self._state[0])} entries)")
+            except Exception as e:
+                print(f"⚠️ App index refresh failed: {e}")
+
+    def resolve(self, spoken: str, timeout: float = 3.0) -> Optional[AppEntry]:
+        self._ready.wait(timeout)
+        entries, names = self._state
+        key = _norm(spoken)
+        if not key:
+            return None
+        aliases = ALIASES.get(key) or ALIASES.get(key.replace(" ", ""), [])  # "note pad" -> notepad
+        for candidate in [key] + [_norm(a) for a in aliases]:
+            if candidate in entries:
+                return entries[candidate]
+        close = difflib.get_close_matches(key, names, n=1, cutoff=0.8)
+        if close:
+            return entries[close[0]]
+        # "open visual studio" -> "visual studio code"
+        prefixed = [n for n in names if n.startswith(key + " ")]
+        return entries[min(prefixed, key=len)] if prefixed else None
+
+
+_index: AppIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> AppIndex:
+    """Process-wide index; the first call starts the background build."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = AppIndex().start()
+        return _index
@@ -0,0 +1,125 @@
+# skills/classifier.py
+"""
+Fallback intent classifier for transcripts the grammar cannot match ("value up").
+
+Only intents that opt in with `examples` are eligible — a guess must never land on an
+intent nobody vetted for it (launching apps, opening links, changing the volume). Each
+eligible intent's slot-free patterns plus its examples are the training phrases; each
+becomes a TF-IDF row over character n-grams (robust to split/merged words and small
+misrecognitions) and word n-grams. Rows are L2-normalized, so scoring a transcript is
+one product of the matrix columns for its features with their weights — cosine
+similarity to every training phrase at once. The best row names the intent if it clears
+the threshold and beats the best phrase of any other intent by `margin`.
+
+Handlers run without slots, so give examples only to intents that work without them.
+
+Needs NumPy; without it classify() always returns None.
+"""
+from __future__ import annotations
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except Exception:
+    np = None
+    HAVE_NUMPY = False
+
+from .types import Skill, Intent
+
+DEFAULT_THRESHOLD = 0.6
+DEFAULT_MARGIN = 0.1
+CHAR_NGRAMS = (3, 4)
+WORD_NGRAMS = (1, 2)
+
+_SLOT = re.compile(r"\{[^{}]*\}")
+_NON_WORD = re.compile(r"[^a-z0-9' ]+")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_NON_WORD.sub(" ", (text or "").lower()).split())
+
+
+def _features(text: str) -> Counter:
+    t = _normalize(text)
+    feats: Counter = Counter()
+    padded = f" {t} "
+    for n in CHAR_NGRAMS:
+        feats.update("c:" + padded[i:i + n] for i in range(len(padded) - n + 1))
+    words = t.split()
+    for n in WORD_NGRAMS:
+        feats.update("w:" + " ".join(words[i:i + n]) for i in range(len(words) - n + 1))
+    return feats
+
+
+class IntentClassifier:
+    def __init__(self, skills: Iterable[Skill], threshold: float = DEFAULT_THRESHOLD, margin: float = DEFAULT_MARGIN):
+        self.threshold = threshold
+        self.margin = margin
+        self.labels: List[Tuple[Skill, Intent]] = []
+        self.phrases: List[str] = []
+        owners: List[int] = []  # intent number per row, for the margin check
+        for skill in skills:
+            for intent in skill.intents:
+                if not intent.examples:
+                    continue
+                for phrase in [p for p in intent.patterns if not _SLOT.search(p)] + list(intent.examples):
+                    if _normalize(phrase):
+                        self.labels.append((skill, intent))
+                        self.phrases.append(phrase)
+                        owners.append(id(intent))
+
+        self.vocab: Dict[str, int] = {}
+        self.matrix = None
+        if not HAVE_NUMPY or not self.phrases:
+            return
+        docs = [_features(p) for p in self.phrases]
+        df: Counter = Counter()
+        for d in docs:
+            df.update(d.keys())
+        self.vocab = {f: i for i, f in enumerate(sorted(df))}
+        self.idf = np.array([math.log((1 + len(docs)) / (1 + df[f])) + 1.0 for f in sorted(df)], dtype=np.float32)
+        self.unknown_idf = float(self.idf.min())
+        matrix = np.zeros((len(docs), len(self.vocab)), dtype=np.float32)
+        for row, d in enumerate(docs):
+            for f, tf in d.items():
+                matrix[row, self.vocab[f]] = 1.0 + math.log(tf)
+        matrix *= self.idf
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-9)
+        self.matrix = matrix
+        self._owner = np.array(owners, dtype=np.int64)
+
+    def scores(self, text: str):
+        """Cosine similarity of `text` to every training phrase (None without NumPy/data)."""
+        if self.matrix is None:
+            return None
+        query = _features(text)
+        feats = [(self.vocab[f], tf) for f, tf in query.items() if f in self.vocab]
+        if not feats:
+            return np.zeros(len(self.phrases), dtype=np.float32)
+        cols = np.fromiter((c for c, _ in feats), dtype=np.intp, count=len(feats))
+        weights = np.fromiter((1.0 + math.log(tf) for _, tf in feats), dtype=np.float32, count=len(feats))
+        weights *= self.idf[cols]
+        # Features never seen in training still count towards the query norm (weighted like
+        # the most common feature): misheard letters lower the score without swamping it
+        unknown = sum((1.0 + math.log(tf)) ** 2 for f, tf in query.items() if f not in self.vocab)
+        norm = math.sqrt(float(weights @ weights) + unknown * self.unknown_idf ** 2)
+        return self.matrix[:, cols] @ (weights / norm)
+
+    def classify(self, text: str, threshold: Optional[float] = None) -> Optional[Tuple[Skill, Intent, float, str]]:
+        """Best (skill, intent, score, nearest phrase) if confident and unambiguous, else None."""
+        s = self.scores(text)
+        if s is None or not len(s):
+            return None
+        best = int(np.argmax(s))
+        score = float(s[best])
+        if score < (self.threshold if threshold is None else threshold):
+            return None
+        rivals = s[self._owner != self._owner[best]]
+        if rivals.size and score - float(rivals.max()) < self.margin:
+            return None  # too close to another intent to guess
+        skill, intent = self.labels[best]
+        return skill, intent, score, self.phrases[best]
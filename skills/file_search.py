@@ -63,14 +63,26 @@ def _detect_roots(t: str):
         return [Path.home() / "Desktop"]
     return USER_DIRS
 
-def _handle_search(text, speak):
+# Spoken folder hint -> root dir
+FOLDER_DIRS = {
+    "downloads": Path.home() / "Downloads",
+    "documents": Path.home() / "Documents",
+    "desktop": Path.home() / "Desktop",
+}
+
+def _handle_search(text, speak, slots=None):
     # Example: "search file report", "find file 'invoice' in downloads"
-    keyword = _extract_keyword(text)
+    if slots is not None:
+        keyword = slots.get("name")
+        folder = slots.get("folder")
+        roots = [FOLDER_DIRS[folder]] if folder in FOLDER_DIRS else USER_DIRS
+    else:
+        keyword = _extract_keyword(text)
+        roots = _detect_roots(text)
     if not keyword:
         speak("Please tell me the file name to search. For example: search file report.")
         return
 
-    roots = _detect_roots(text)
     hits = _search_files(roots, keyword)
 
     if not hits:
@@ -90,6 +102,11 @@ def _handle_search(text, speak):
 
 def register() -> Skill:
     intents = [
-        Intent(patterns=["search file", "find file"], handler=_handle_search, name="file_search"),
+        Intent(patterns=[
+            "search file {name} in {folder:downloads|documents|desktop}",
+            "find file {name} in {folder:downloads|documents|desktop}",
+            "search file {name}", "find file {name}",
+            "search file", "find file",
+        ], handler=_handle_search, name="file_search"),
     ]
     return Skill(name="file_search", intents=intents)
@@ -0,0 +1,274 @@
+# skills/grammar.py
+"""
+Intent grammar compiled from every skill pattern.
+
+Patterns are plain phrases with optional typed slots:
+    "volume up"
+    "set volume to {percent:int} percent"
+    "find file {name} in {folder:downloads|documents|desktop}"
+
+Slot types:
+    {x} / {x:str}   free text (lazy in the middle of a pattern, greedy at the end)
+    {x:int}         digits or spoken numbers ("forty five" -> 45)
+    {x:ordinal}     "first" .. "tenth", "1st" .. "10th", "last" (-> 1..10, -1 for last)
+    {x:word}        a single token
+    {x:a|b|c}       one of the listed words/phrases
+
+Matching is a single pass over the transcript's tokens: at each token the patterns
+that start with that word are tried together (most specific first), and the first
+(leftmost) hit returns the intent plus its converted slots.
+"""
+from __future__ import annotations
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+
+from .types import Intent, Skill
+
+# ---------- Spoken numbers ----------
+_UNITS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17,
+    "eighteen": 18, "nineteen": 19,
+}
+_TENS = {
+    "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+    "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90,
+}
+_SCALES = {"hundred": 100, "thousand": 1000}
+
+NUMBER_WORDS = [*_UNITS, *_TENS, *_SCALES]
+_NUMBER_WORD = "|".join(sorted([*_UNITS, *_TENS, *_SCALES], key=len, reverse=True))
+# Digits, or a run of number words ("one hundred", "forty-five")
+NUMBER = rf"(?:\d+|(?:{_NUMBER_WORD})(?:[\s-]+(?:{_NUMBER_WORD}))*)(?!\w)"
+
+# "the second one", "the 3rd result", "the last one"
+_ORDINALS = {
+    "first": 1, "second": 2, "third": 3, "fourth": 4, "fifth": 5,
+    "sixth": 6, "seventh": 7, "eighth": 8, "ninth": 9, "tenth": 10, "last": -1,
+}
+ORDINAL_WORDS = list(_ORDINALS)
+ORDINAL = rf"(?:{'|'.join(sorted(_ORDINALS, key=len, reverse=True))}|\d+(?:st|nd|rd|th))(?!\w)"
+
+
+def ordinal_to_int(text: str) -> int | None:
+    """'second' -> 2, '3rd' -> 3, 'last' -> -1. None if not an ordinal."""
+    t = (text or "").strip().lower()
+    if t in _ORDINALS:
+        return _ORDINALS[t]
+    m = re.fullmatch(r"(\d+)(?:st|nd|rd|th)", t)
+    return int(m.group(1)) if m else None
+
+
+def words_to_int(text: str) -> int | None:
+    """'forty five' -> 45, 'one hundred' -> 100, '35' -> 35. None if not a number."""
+    t = (text or "").strip().lower()
+    if not t:
+        return None
+    if t.isdigit():
+        return int(t)
+    total, current, seen = 0, 0, False
+    for w in re.split(r"[\s-]+", t):
+        if w in _UNITS:
+            current += _UNITS[w]
+        elif w in _TENS:
+            current += _TENS[w]
+        elif w == "hundred":
+            current = max(current, 1) * 100
+        elif w == "thousand":
+            total += max(current, 1) * 1000
+            current = 0
+        elif w == "and" and seen:
+            continue
+        else:
+            return None
+        seen = True
+    return total + current if seen else None
+
+
+# ---------- Pattern compilation ----------
+_SLOT_RX = re.compile(r"\{(\w+)(?::([^}]+))?\}")
+
+
+@dataclass
+class Match:
+    skill: Skill
+    intent: Intent
+    pattern: str
+    slots: Dict[str, Any] = field(default_factory=dict)
+    fallback: bool = False            # guessed by the fallback classifier (pattern = nearest phrase)
+
+
+@dataclass
+class _Alt:
+    index: int
+    pattern: str
+    skill: Skill
+    intent: Intent
+    regex: str
+    slots: List[Tuple[str, str]]      # (name, type)
+    first_word: str | None            # None when the pattern starts with a slot
+    specificity: Tuple[int, int]      # (literal chars, slot count)
+    words: List[str]                  # closed vocabulary this pattern can produce
+
+    @property
+    def free_text(self) -> bool:
+        """True if a slot can hold arbitrary words (needs open-vocabulary recognition)."""
+        return any(kind in ("str", "word") for _, kind in self.slots)
+
+
+def _literal(text: str) -> str:
+    words = text.split()
+    rx = r"\s+".join(re.escape(w) for w in words)
+    if words and text[:1].isspace():
+        rx = r"\s+" + rx
+    if words and text[-1:].isspace():
+        rx += r"\s+"
+    if not words and text:
+        rx = r"\s+"
+    return rx
+
+
+def _slot(group: str, kind: str, last: bool) -> str:
+    if kind in ("", "str"):
+        return rf"(?P<{group}>.+)" if last else rf"(?P<{group}>.+?)"
+    if kind == "int":
+        return rf"(?P<{group}>{NUMBER})"
+    if kind == "ordinal":
+        return rf"(?P<{group}>{ORDINAL})"
+    if kind == "word":
+        return rf"(?P<{group}>\S+)"
+    if "|" in kind:
+        choices = sorted((c.strip() for c in kind.split("|") if c.strip()), key=len, reverse=True)
+        return rf"(?P<{group}>{'|'.join(_literal(c) for c in choices)})(?!\w)"
+    raise ValueError(f"unknown slot type '{kind}'")
+
+
+def _compile(index: int, pattern: str, skill: Skill, intent: Intent) -> _Alt:
+    p = pattern.lower()
+    pieces: List[str] = []
+    slots: List[Tuple[str, str]] = []
+    words: List[str] = []
+    literal_chars, pos = 0, 0
+    found = list(_SLOT_RX.finditer(p))
+    for n, m in enumerate(found):
+        lit = p[pos:m.start()]
+        pieces.append(_literal(lit))
+        literal_chars += len(" ".join(lit.split()))
+        words += lit.split()
+        name, kind = m.group(1), (m.group(2) or "").strip()
+        if kind == "int":
+            words += NUMBER_WORDS
+        elif kind == "ordinal":
+            words += ORDINAL_WORDS
+        elif "|" in kind:
+            words += kind.replace("|", " ").split()
+        last = n == len(found) - 1 and not p[m.end():].strip()
+        pieces.append(_slot(f"p{index}__{name}", kind, last))
+        slots.append((name, kind or "str"))
+        pos = m.end()
+    tail = p[pos:]
+    pieces.append(_literal(tail))
+    literal_chars += len(" ".join(tail.split()))
+    words += tail.split()
+    if tail.strip() and re.search(r"\w$", tail):
+        pieces.append(r"(?!\w)")  # whole-word end: "time" must not match "timer"
+
+    head = p.lstrip()
+    first_word = None if head.startswith("{") else (head.split() or [None])[0]
+    if first_word is not None:
+        first_word = _SLOT_RX.split(first_word, 1)[0] or None
+
+    return _Alt(
+        index=index,
+        pattern=pattern,
+        skill=skill,
+        intent=intent,
+        regex=rf"(?P<p{index}>{''.join(pieces)})",
+        slots=slots,
+        first_word=first_word,
+        specificity=(literal_chars, len(slots)),
+        words=words,
+    )
+
+
+def _convert(kind: str, raw: str) -> Any:
+    raw = raw.strip()
+    if kind == "int":
+        return words_to_int(raw)
+    if kind == "ordinal":
+        return ordinal_to_int(raw)
+    if kind in ("", "str"):
+        # quoted free text: 'search file "annual report"'
+        if len(raw) >= 2 and raw[0] in "\"'" and raw[-1] == raw[0]:
+            raw = raw[1:-1].strip()
+        return raw
+    return " ".join(raw.split())
+
+
+class Grammar:
+    """Compiled union of all (pattern, skill, intent) entries."""
+
+    def __init__(self, entries: Iterable[Tuple[str, Skill, Intent]]):
+        self.alts: List[_Alt] = []
+        for pattern, skill, intent in entries:
+            try:
+                self.alts.append(_compile(len(self.alts), pattern, skill, intent))
+            except (ValueError, re.error) as e:
+                print(f"⚠️ Bad pattern '{pattern}' in skill '{skill.name}': {e}")
+
+        # Most specific first; ties keep registration order
+        ordered = sorted(self.alts, key=lambda a: (-a.specificity[0], -a.specificity[1], a.index))
+        by_word: Dict[str, List[_Alt]] = {}
+        anywhere: List[_Alt] = []
+        for alt in ordered:
+            if alt.first_word is None:
+                anywhere.append(alt)
+            else:
+                by_word.setdefault(alt.first_word, []).append(alt)
+
+        self._by_word: Dict[str, Pattern[str]] = {w: self._union(alts) for w, alts in by_word.items()}
+        self._anywhere: Optional[Pattern[str]] = self._union(anywhere) if anywhere else None
+        self._by_group = {f"p{a.index}": a for a in self.alts}
+        self._free_text_intents = {id(a.intent) for a in self.alts if a.free_text}
+
+    @staticmethod
+    def _union(alts: List[_Alt]) -> Pattern[str]:
+        return re.compile("|".join(a.regex for a in alts), re.IGNORECASE | re.DOTALL)
+
+    def match(self, text: str) -> Optional[Match]:
+        t = (text or "").lower()
+        for tok in re.finditer(r"\S+", t):
+            start = tok.start()
+            rx = self._by_word.get(tok.group())
+            m = rx.match(t, start) if rx is not None else None
+            if m is None and self._anywhere is not None:
+                m = self._anywhere.match(t, start)
+            if m is not None:
+                return self._build(m)
+        return None
+
+    def _build(self, m: re.Match) -> Match:
+        alt = self._by_group[m.lastgroup]
+        slots: Dict[str, Any] = {}
+        for name, kind in alt.slots:
+            raw = m.group(f"p{alt.index}__{name}")
+            if raw is not None:
+                slots[name] = _convert(kind, raw)
+        return Match(skill=alt.skill, intent=alt.intent, pattern=alt.pattern, slots=slots)
+
+    def needs_free_text(self, intent: Intent) -> bool:
+        """True if any of the intent's patterns takes free text (e.g. a web search query)."""
+        return id(intent) in self._free_text_intents
+
+    def vocabulary(self, extra: Iterable[str] = ()) -> List[str]:
+        """
+        Phrases and words a command-mode recognizer needs: every slot-free pattern as a
+        phrase, plus each word the patterns (and closed slots) can produce.
+        """
+        phrases = {" ".join(a.pattern.lower().split()) for a in self.alts if not a.slots}
+        phrases |= {" ".join(e.lower().split()) for e in extra}
+        words = {w for a in self.alts for w in a.words}
+        words |= {w for e in extra for w in e.lower().split()}
+        return sorted(phrases | words)
@@ -1,59 +1,54 @@
-import subprocess
 from .types import Intent, Skill
+from .app_index import get_index
 
 # ---- Handlers ----
 
-def _open_notepad(text, speak):
+def _launch(spoken, speak, ok_msg=None, fallback=None, fallback_msg=None):
+    """Resolve through the cached app index and spawn once."""
+    index = get_index()
+    entry = index.resolve(spoken)
+    msg = ok_msg
+    if entry is None and fallback:
+        entry = index.resolve(fallback)
+        msg = fallback_msg
+    if entry is None:
+        speak(f"I couldn't find an app called {spoken}.")
+        return
     try:
-        subprocess.Popen(["notepad.exe"])
-        speak("Opening Notepad, sir.")
+        entry.launch()
+        speak(msg or f"Opening {entry.name}.")
     except Exception as e:
-        print(f"⚠️ Notepad error: {e}")
-        speak("I couldn't open Notepad.")
+        print(f"⚠️ Launch error for {entry.name}: {e}")
+        speak(f"I couldn't open {entry.name}.")
+
+def _open_notepad(text, speak):
+    _launch("notepad", speak, "Opening Notepad, sir.")
 
 def _open_calculator(text, speak):
-    try:
-        subprocess.Popen(["calc.exe"])
-        speak("Opening Calculator, sir.")
-    except Exception as e:
-        print(f"⚠️ Calculator error: {e}")
-        speak("I couldn't open Calculator.")
+    _launch("calculator", speak, "Opening Calculator, sir.")
 
 def _open_chrome(text, speak):
-    """
-    Tries a few ways to launch Chrome on Windows.
-    If Chrome isn't available, falls back to Edge.
-    """
-    try:
-        # If chrome is on PATH
-        subprocess.Popen(["chrome"])
-        speak("Opening Google Chrome.")
+    """Chrome if installed, otherwise Edge; decided from the index, not by failed spawns."""
+    _launch("chrome", speak, "Opening Google Chrome.",
+            fallback="edge", fallback_msg="Chrome was not found. Opening Microsoft Edge instead.")
+
+def _open_any(text, speak, slots=None):
+    app = (slots or {}).get("app")
+    if not app:
+        speak("Which app should I open?")
         return
-    except Exception:
-        pass
-
-    try:
-        # Windows 'start' - empty title arg after /c start
-        subprocess.Popen(["cmd", "/c", "start", "", "chrome"])
-        speak("Opening Google Chrome.")
-        return
-    except Exception:
-        pass
-
-    # Fallback to Edge
-    try:
-        subprocess.Popen(["cmd", "/c", "start", "", "msedge"])
-        speak("Chrome was not found. Opening Microsoft Edge instead.")
-    except Exception as e:
-        print(f"⚠️ Browser launch error: {e}")
-        speak("I couldn't open a browser.")
+    _launch(app, speak)
 
 # ---- Registration ----
 
 def register() -> Skill:
+    get_index()  # start building the launch index in the background
     intents = [
-        Intent(patterns=["open notepad"], handler=_open_notepad, name="open_notepad"),
-        Intent(patterns=["open calculator"], handler=_open_calculator, name="open_calculator"),
-        Intent(patterns=["open chrome", "open google chrome"], handler=_open_chrome, name="open_chrome"),
+        Intent(patterns=["open notepad"], handler=_open_notepad, name="open_notepad", independent=True,
+               examples=["open note pad", "opened notepad", "open the notepad"]),
+        Intent(patterns=["open calculator"], handler=_open_calculator, name="open_calculator", independent=True,
+               examples=["open calc", "opened calculator", "open the calculator"]),
+        Intent(patterns=["open chrome", "open google chrome"], handler=_open_chrome, name="open_chrome", independent=True),
+        Intent(patterns=["open {app}", "launch {app}"], handler=_open_any, name="open_app", independent=True),
     ]
     return Skill(name="open_apps", intents=intents)
@@ -2,18 +2,29 @@ from __future__ import annotations
 import webbrowser
 from typing import Callable
 from .types import Skill, Intent
-from .session_state import get_last_result   # <-- updated
+from .session_state import current_session
 
-def handle_open_last(transcript: str, speak: Callable[[str], None]) -> None:
-    url, title = get_last_result()
-    if not url:
+
+def handle_open_last(transcript: str, speak: Callable[[str], None], slots: dict | None = None) -> None:
+    state = current_session()
+    n = (slots or {}).get("n")
+    if n is None:
+        result = state.get_result()
+    else:
+        index = state.count() - 1 if n == -1 else n - 1
+        result = state.select(index)
+        if result is None and state.count():
+            speak(f"I only have {state.count()} results.")
+            return
+
+    if result is None or not result.url:
         speak("I don’t have a link to open yet. Say search for something first.")
         return
 
-    speak(f"Opening {title or 'the last result'}.")
+    speak(f"Opening {result.title or 'the last result'}.")
     try:
-        webbrowser.open(url, new=2)  # new tab
-        print(f"\n🌐 Opening: {title or url}\n{url}\n")
+        webbrowser.open(result.url, new=2)  # new tab
+        print(f"\n🌐 Opening: {result.title or result.url}\n{result.url}\n")
     except Exception as e:
         print(f"⚠️ Browser open failed: {e}")
         speak("I couldn’t open the link on this system.")
@@ -28,6 +39,11 @@ def register() -> Skill:
                 "open result",
                 "open that",
                 "open the website",
+                "open the {n:ordinal} one",
+                "open the {n:ordinal} result",
+                "open the {n:ordinal} link",
+                "open result {n:int}",
+                "open result number {n:int}",
             ],
             handler=handle_open_last,
         )
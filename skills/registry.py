@@ -1,117 +1,431 @@
 import importlib
+import importlib.util
+import inspect
 import pkgutil
-from typing import List, Callable
-from .types import Skill
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from pathlib import Path
+from functools import lru_cache
+from typing import List, Callable, Dict, Iterable, Optional, Tuple
+from .types import Skill, Intent
+from .grammar import Grammar, Match
+from .classifier import IntentClassifier
 from . import __path__ as skills_pkg_path  # package search path
+from core import metrics
 
 
-# Modules to ignore during discovery
-EXCLUDE = {"registry", "types", "__init__"}
+DISPATCH_TOTAL = metrics.counter("leo_dispatch_total", "Commands dispatched to an intent", ("skill", "intent"))
+UNMATCHED_TOTAL = metrics.counter("leo_dispatch_unmatched_total", "Transcripts that matched no intent")
+FALLBACK_TOTAL = metrics.counter("leo_dispatch_fallback_total", "Transcripts routed by the fallback classifier", ("intent",))
+HANDLER_ERRORS = metrics.counter("leo_handler_errors_total", "Skill handlers that raised", ("skill", "intent"))
+HANDLER_SECONDS = metrics.histogram("leo_handler_seconds", "Skill handler run time", ("skill", "intent"))
 
-# In-memory cache so we don't re-import every dispatch
-_skills_cache: List[Skill] | None = None
+MULTI_COMMAND_TOTAL = metrics.counter("leo_dispatch_multi_total", "Utterances split into several commands")
+
+# "mute and open notepad", "set volume to forty then what time is it"
+_CONJUNCTION = re.compile(r"\s+(?:and then|then|and also|and|also|after that)\s+")
+_SEQUENTIAL = re.compile(r"\bthen\b|\bafter that\b")
+MAX_COMMANDS = 4
+
+# Infrastructure modules never imported as skills; any other module without a register()
+# (helpers such as session_state) is skipped silently
+EXCLUDE = {"registry", "types", "grammar", "classifier", "scheduler", "volume_backends", "app_index", "__init__"}
+
+# Minimum cosine score for the fallback classifier (None = grammar matches only; leo.py
+# sets it from intent_fallback_threshold)
+_fallback_threshold: Optional[float] = None
+
+
+class _IntentTable:
+    """
+    Immutable snapshot of the loaded skills, their flattened (pattern, skill, intent) entries
+    and the grammar compiled from them. Rebuilt on (re)load and swapped in with a single
+    assignment, so a dispatch that is already using an old table keeps a consistent view.
+    """
+    def __init__(self, skills: List[Skill], version: int = 0):
+        self.skills: Tuple[Skill, ...] = tuple(skills)
+        self.entries: Tuple[Tuple[str, Skill, Intent], ...] = tuple(
+            (pattern.lower(), skill, intent)
+            for skill in self.skills
+            for intent in skill.intents
+            for pattern in intent.patterns
+        )
+        self.grammar = Grammar(self.entries)
+        self.classifier = IntentClassifier(self.skills)
+        self.version = version
+
+
+# Current table; None until the first load_skills()
+_table: _IntentTable | None = None
+
+# Last good Skill per module name, plus the source mtimes we built it from
+_modules: Dict[str, Skill] = {}
+_mtimes: Dict[str, int] = {}
+
+_build_lock = threading.Lock()
+_listeners: List[Callable[[], None]] = []
+_watcher: threading.Thread | None = None
+_watcher_stop = threading.Event()
+
+
+def _source_files() -> Dict[str, Path]:
+    """modname -> path for every top-level .py module in the skills package."""
+    files: Dict[str, Path] = {}
+    for base in skills_pkg_path:
+        for path in sorted(Path(base).glob("*.py")):
+            files.setdefault(path.stem, path)
+    return files
+
+
+def _mtime(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _register(modname: str, module) -> Skill | None:
+    if not hasattr(module, "register"):
+        return None  # helper module, not a skill
+    skill = module.register()
+    if not isinstance(skill, Skill):
+        print(f"⚠️ skills.{modname}.register() did not return a Skill")
+        return None
+    return skill
+
+
+def _import_fresh(modname: str, path: Path):
+    """
+    Execute the module source into a brand-new module object.
+    Only on success does it replace sys.modules, so a broken edit never half-overwrites
+    the module the previous Skill still points into.
+    """
+    fullname = f"skills.{modname}"
+    spec = importlib.util.spec_from_file_location(fullname, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules[fullname] = module
+    return module
+
+
+def _is_shared(modname: str) -> bool:
+    """Infrastructure or helper module (no register()) rather than a skill."""
+    if modname in EXCLUDE:
+        return True
+    module = sys.modules.get(f"skills.{modname}")
+    return modname not in _modules and module is not None and not hasattr(module, "register")
+
+
+def _swap(skills: List[Skill]) -> _IntentTable:
+    global _table
+    version = (_table.version + 1) if _table is not None else 1
+    table = _IntentTable(skills, version)
+    _table = table
+    for cb in list(_listeners):
+        try:
+            cb()
+        except Exception as e:
+            print(f"⚠️ Skill reload listener failed: {e}")
+    return table
+
+
+def _ordered_skills() -> List[Skill]:
+    # Same order as discovery (pkgutil yields sorted module names)
+    return [_modules[name] for name in sorted(_modules)]
 
 
 def load_skills() -> List[Skill]:
     """Import all skill modules in the skills package and collect their Skill objects."""
-    global _skills_cache
-    skills: List[Skill] = []
+    with _build_lock:
+        _modules.clear()
+        _mtimes.update({name: _mtime(path) for name, path in _source_files().items()})
+        for _, modname, ispkg in pkgutil.iter_modules(skills_pkg_path):
+            if ispkg or modname in EXCLUDE:
+                continue
+            try:
+                module = importlib.import_module(f"skills.{modname}")
+                skill = _register(modname, module)
+                if skill is not None:
+                    _modules[modname] = skill
+            except Exception as e:
+                print(f"⚠️ Failed to load skill 'skills.{modname}': {e}")
+
+        return list(_swap(_ordered_skills()).skills)
+
+
+def reload_changed() -> List[str]:
+    """
+    Re-import only the skill modules whose source changed since the last (re)load and swap
+    in a rebuilt intent table. A module that fails to import keeps its previous version.
+    Returns the names of modules whose Skill was replaced, added or removed.
+    """
+    if _table is None:
+        load_skills()
+        return []
+
+    with _build_lock:
+        changed: List[str] = []
+        files = _source_files()
+
+        for modname, path in files.items():
+            mtime = _mtime(path)
+            if _mtimes.get(modname) == mtime:
+                continue
+            _mtimes[modname] = mtime
+            if _is_shared(modname):
+                # Shared helpers (types, session state, ...) are bound into other modules
+                print(f"ℹ️ skills.{modname} changed; shared modules take effect after a restart.")
+                continue
+            try:
+                skill = _register(modname, _import_fresh(modname, path))
+            except Exception as e:
+                kept = " (keeping previous version)" if modname in _modules else ""
+                print(f"⚠️ Failed to reload skill 'skills.{modname}'{kept}: {e}")
+                continue
+            if skill is not None:
+                _modules[modname] = skill
+                changed.append(modname)
+                print(f"🔁 Reloaded skill 'skills.{modname}'")
+
+        for modname in [m for m in _modules if m not in files]:
+            del _modules[modname]
+            _mtimes.pop(modname, None)
+            sys.modules.pop(f"skills.{modname}", None)
+            changed.append(modname)
+            print(f"🗑️ Removed skill 'skills.{modname}'")
+
+        if changed:
+            _swap(_ordered_skills())
+        return changed
+
+
+def install_skills(skills: List[Skill]) -> None:
+    """Make exactly these skills active (benchmarks, dry runs). load_skills() restores discovery."""
+    with _build_lock:
+        _swap(list(skills))
+
+
+def add_reload_listener(cb: Callable[[], None]) -> None:
+    """Call `cb()` after every intent table swap (initial load included)."""
+    _listeners.append(cb)
+
+
+def remove_reload_listener(cb: Callable[[], None]) -> None:
+    """Stop calling `cb` (no-op if it was never added)."""
+    try:
+        _listeners.remove(cb)
+    except ValueError:
+        pass
+
 
-    for _, modname, ispkg in pkgutil.iter_modules(skills_pkg_path):
-        if ispkg or modname in EXCLUDE:
-            continue
+def start_watcher(interval_sec: float = 1.0) -> None:
+    """Poll the skills package for source changes on a daemon thread."""
+    global _watcher
+    if _watcher is not None and _watcher.is_alive():
+        return
+    _watcher_stop.clear()
+
+    def _loop():
+        while not _watcher_stop.wait(interval_sec):
+            try:
+                reload_changed()
+            except Exception as e:
+                print(f"⚠️ Skill watcher error: {e}")
+
+    _watcher = threading.Thread(target=_loop, name="skills_watcher", daemon=True)
+    _watcher.start()
+
+
+def stop_watcher() -> None:
+    _watcher_stop.set()
+
+
+def _ensure_loaded() -> _IntentTable:
+    table = _table
+    if table is None:
+        load_skills()
+        table = _table
+    return table
+
+
+@lru_cache(maxsize=None)
+def _accepts_slots(handler: Callable) -> bool:
+    """Handlers opt into parsed slots by declaring a `slots` parameter (or **kwargs)."""
+    try:
+        params = inspect.signature(handler).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == "slots" or p.kind is p.VAR_KEYWORD for p in params)
+
+
+def match(text: str) -> Optional[Match]:
+    """Return the matching intent plus its extracted slots, without running anything."""
+    return _ensure_loaded().grammar.match(text)
+
+
+def set_fallback_threshold(threshold: Optional[float]) -> None:
+    """Cosine score the fallback classifier needs to act; None turns the fallback off."""
+    global _fallback_threshold
+    _fallback_threshold = threshold
+
+
+def classify(text: str) -> Optional[Match]:
+    """Nearest intent by n-gram similarity when the grammar has no match (no slots)."""
+    if _fallback_threshold is None:
+        return None
+    hit = _ensure_loaded().classifier.classify(text, _fallback_threshold)
+    if hit is None:
+        return None
+    skill, intent, score, phrase = hit
+    return Match(skill=skill, intent=intent, pattern=phrase, slots={}, fallback=True)
+
+
+def run_match(m: Match, text: str, speak: Callable[[str], None]) -> None:
+    """Invoke a matched intent's handler, reporting handler errors through `speak`."""
+    t = (text or "").lower()
+    labels = {"skill": m.skill.name, "intent": m.intent.name}
+    DISPATCH_TOTAL.inc(**labels)
+    t0 = time.perf_counter()
+    try:
+        if _accepts_slots(m.intent.handler):
+            m.intent.handler(t, speak, slots=m.slots)
+        else:
+            m.intent.handler(t, speak)
+    except Exception as e:
+        HANDLER_ERRORS.inc(**labels)
+        print(f"⚠️ Error in skill '{m.skill.name}' intent '{m.intent.name}': {e}")
         try:
-            module = importlib.import_module(f"skills.{modname}")
-            if hasattr(module, "register"):
-                skill = module.register()
-                if isinstance(skill, Skill):
-                    skills.append(skill)
-                else:
-                    print(f"⚠️ skills.{modname}.register() did not return a Skill")
-            else:
-                print(f"ℹ️ skills.{modname} has no register() function; skipping.")
-        except Exception as e:
-            print(f"⚠️ Failed to load skill 'skills.{modname}': {e}")
+            speak("I faced an error running that command.")
+        except Exception:
+            pass
+    finally:
+        HANDLER_SECONDS.observe(time.perf_counter() - t0, **labels)
 
-    _skills_cache = skills
-    return skills
 
+def command_vocabulary(extra: Iterable[str] = ()) -> List[str]:
+    """Closed vocabulary of all registered patterns (for grammar-constrained recognition)."""
+    return _ensure_loaded().grammar.vocabulary(extra)
 
-def _ensure_loaded() -> List[Skill]:
-    global _skills_cache
-    return _skills_cache if _skills_cache is not None else load_skills()
 
+def needs_full_decode(text: str) -> bool:
+    """
+    True if a command-mode transcript should be re-decoded open-vocabulary: it has
+    unknown words, matches no intent, or matched an intent that takes free text.
+    """
+    if "[unk]" in text:
+        return True
+    grammar = _ensure_loaded().grammar
+    m = grammar.match(text)
+    return m is None or grammar.needs_free_text(m.intent)
 
-def dispatch(text: str, speak: Callable[[str], None]) -> bool:
+
+def needs_free_text(text: str) -> bool:
+    """True if the transcript matches an intent whose slots take free text (e.g. a search query)."""
+    grammar = _ensure_loaded().grammar
+    m = grammar.match(text)
+    return m is not None and grammar.needs_free_text(m.intent)
+
+
+def split_commands(text: str) -> Optional[List[Tuple[str, Match, bool]]]:
     """
-    Try to handle the transcript via the first matching intent across all skills.
-    Matching is simple substring-based for now.
-    Returns True if handled; False otherwise.
+    Split a multi-command utterance on conjunctions into (segment, match, after_then).
+    Only splits when every segment matches an intent on its own, so free text with an
+    "and" in it ("search for salt and pepper") stays one command. None = not a multi-command.
     """
     t = (text or "").lower()
-    for skill in _ensure_loaded():
-        for intent in skill.intents:
-            for pattern in intent.patterns:
-                if pattern.lower() in t:
-                    try:
-                        intent.handler(t, speak)
-                    except Exception as e:
-                        print(f"⚠️ Error in skill '{skill.name}' intent '{intent.name}': {e}")
-                        try:
-                            speak("I faced an error running that command.")
-                        except Exception:
-                            pass
-                    return True
-    return False
-import importlib
-import pkgutil
-from typing import List, Callable
-from .types import Skill
-from . import __path__ as skills_pkg_path  # package search path
+    parts = _CONJUNCTION.split(t)
+    if len(parts) < 2 or len(parts) > MAX_COMMANDS:
+        return None
+    seps = [m.group() for m in _CONJUNCTION.finditer(t)]
+    out: List[Tuple[str, Match, bool]] = []
+    for i, seg in enumerate(parts):
+        seg = seg.strip()
+        m = match(seg) if seg else None
+        if m is None:
+            return None
+        out.append((seg, m, i > 0 and bool(_SEQUENTIAL.search(seps[i - 1]))))
+    return out
 
-EXCLUDE = {"registry", "types", "__init__"}
-_skills_cache: List[Skill] | None = None
 
-def load_skills() -> List[Skill]:
-    global _skills_cache
-    skills: List[Skill] = []
+_multi_pool: Optional[ThreadPoolExecutor] = None
+_multi_lock = threading.Lock()
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _multi_pool
+    with _multi_lock:
+        if _multi_pool is None:
+            _multi_pool = ThreadPoolExecutor(max_workers=MAX_COMMANDS, thread_name_prefix="dispatch")
+        return _multi_pool
 
-    for _, modname, ispkg in pkgutil.iter_modules(skills_pkg_path):
-        if ispkg or modname in EXCLUDE:
-            continue
-        try:
-            module = importlib.import_module(f"skills.{modname}")
-            if hasattr(module, "register"):
-                skill = module.register()
-                if isinstance(skill, Skill):
-                    skills.append(skill)
-                else:
-                    print(f"⚠️ skills.{modname}.register() did not return a Skill")
-            else:
-                print(f"ℹ️ skills.{modname} has no register() function; skipping.")
-        except Exception as e:
-            print(f"⚠️ Failed to load skill 'skills.{modname}': {e}")
 
-    _skills_cache = skills
-    return skills
+def _run_commands(commands: List[Tuple[str, Match, bool]], speak: Callable[[str], None]) -> None:
+    """
+    Run split commands one after another, in utterance order ("search for cats and open
+    it" needs the search done first). Consecutive intents marked `independent` share a
+    stage and run concurrently, unless "then" or a repeated skill separates them.
+    Replies are collected per command and spoken once, in utterance order.
+    """
+    stages: List[List[Tuple[str, Match]]] = []
+    for seg, m, after_then in commands:
+        joins = (
+            stages and not after_then and m.intent.independent
+            and all(other.intent.independent and m.skill is not other.skill for _, other in stages[-1])
+        )
+        if not joins:
+            stages.append([])
+        stages[-1].append((seg, m))
+
+    replies: List[List[str]] = []
+    for stage in stages:
+        outs: List[List[str]] = [[] for _ in stage]
+        if len(stage) == 1:
+            run_match(stage[0][1], stage[0][0], outs[0].append)
+        else:
+            # copy_context: handlers see the caller's session (skills.session_state)
+            futures = [_pool().submit(copy_context().run, run_match, m, seg, out.append)
+                       for (seg, m), out in zip(stage, outs)]
+            for f in futures:
+                f.result()
+        replies += outs
+    reply = " ".join(s.strip() for out in replies for s in out if s and s.strip())
+    if reply:
+        speak(reply)
+
+
+def dispatch_match(text: str, speak: Callable[[str], None]) -> Optional[Match]:
+    """
+    Like dispatch(), but returns the Match that ran (None if nothing matched).
+    For a multi-command utterance every command runs and the first one's Match is returned.
+    """
+    commands = split_commands(text)
+    if commands is not None:
+        MULTI_COMMAND_TOTAL.inc()
+        _run_commands(commands, speak)
+        return commands[0][1]
+    m = match(text)
+    if m is None:
+        m = classify(text)
+        if m is None:
+            UNMATCHED_TOTAL.inc()
+            return None
+        FALLBACK_TOTAL.inc(intent=m.intent.name)
+    run_match(m, text, speak)
+    return m
 
-def _ensure_loaded() -> List[Skill]:
-    global _skills_cache
-    return _skills_cache if _skills_cache is not None else load_skills()
 
 def dispatch(text: str, speak: Callable[[str], None]) -> bool:
-    t = (text or "").lower()
-    for skill in _ensure_loaded():
-        for intent in skill.intents:
-            for pattern in intent.patterns:
-                if pattern.lower() in t:
-                    try:
-                        intent.handler(t, speak)
-                    except Exception as e:
-                        print(f"⚠️ Error in skill '{skill.name}' intent '{intent.name}': {e}")
-                        try:
-                            speak("I faced an error running that command.")
-                        except Exception:
-                            pass
-                    return True
-    return False
+    """
+    Handle the transcript with the intent matched by the compiled grammar.
+    Patterns match whole words; at the leftmost matching word the most specific
+    pattern wins, and its typed slots are handed to the handler. Utterances joined
+    with "and"/"then" run as several commands when each part matches on its own.
+    Returns True if handled; False otherwise.
+    """
+    return dispatch_match(text, speak) is not None
@@ -0,0 +1,206 @@
+# skills/scheduler.py
+"""
+Timer / reminder service shared by skills.
+
+One daemon thread sleeps on a condition variable until the earliest due job in a heap
+(or until a new job comes in), so thousands of pending timers cost the same as one:
+no thread or sleep per timer, no polling.
+
+- Jobs are persisted to cache/scheduler.json (atomic replace) by the same thread, at
+  most every SAVE_DELAY_SEC, so a burst of changes costs one write; reloaded at
+  startup, where anything that fell due while Leo was off is delivered at once.
+- Due jobs go to the delivery callback (leo.py installs `speak`, which works whether
+  or not a listening session is active); without one they are printed.
+- cancel() is lazy: cancelled jobs stay in the heap and are skipped when they surface.
+"""
+from __future__ import annotations
+import heapq
+import itertools
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from core.config import ROOT
+
+STORE_PATH = ROOT / "cache" / "scheduler.json"
+SAVE_DELAY_SEC = 0.2
+
+
+@dataclass(order=True)
+class Job:
+    due: float                                   # epoch seconds
+    id: int
+    kind: str = field(default="timer", compare=False)       # "timer" | "reminder"
+    message: str = field(default="", compare=False)
+    created: float = field(default=0.0, compare=False)
+
+
+def describe_duration(seconds: float) -> str:
+    """3725 -> '1 hour 2 minutes' (seconds only under a minute)."""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds} second{'s' if seconds != 1 else ''}"
+    hours, rest = divmod(seconds, 3600)
+    minutes = rest // 60
+    parts = []
+    if hours:
+        parts.append(f"{hours} hour{'s' if hours != 1 else ''}")
+    if minutes:
+        parts.append(f"{minutes} minute{'s' if minutes != 1 else ''}")
+    return " ".join(parts)
+
+
+class Scheduler:
+    def __init__(self, path: Path = STORE_PATH, deliver: Optional[Callable[[Job, bool], None]] = None):
+        self.path = Path(path)
+        self.deliver = deliver
+        self._heap: List[Job] = []
+        self._jobs: Dict[int, Job] = {}          # pending (not cancelled) by id
+        self._cond = threading.Condition()
+        self._ids = itertools.count(1)
+        self._thread: Optional[threading.Thread] = None
+        self._dirty = False
+        self._saved_at = 0.0
+        self._load()
+
+    # ---------- Persistence ----------
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"⚠️ Could not read scheduled timers: {e}")
+            return
+        for rec in data:
+            try:
+                job = Job(**rec)
+            except TypeError:
+                continue
+            self._jobs[job.id] = job
+            heapq.heappush(self._heap, job)
+        self._ids = itertools.count(max(self._jobs, default=0) + 1)
+
+    def _changed(self) -> None:
+        """Mark the store stale and wake the worker (caller holds the lock)."""
+        if len(self._heap) > 2 * len(self._jobs) + 64:
+            self._heap = sorted(self._jobs.values())  # mostly cancelled entries; a sorted list is a heap
+        self._dirty = True
+        self._cond.notify()
+
+    def save(self) -> None:
+        """Write pending jobs now."""
+        with self._cond:
+            snapshot = json.dumps([asdict(j) for j in sorted(self._jobs.values())])
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(snapshot, encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError as e:
+            print(f"⚠️ Could not save scheduled timers: {e}")
+
+    # ---------- API ----------
+    def start(self) -> "Scheduler":
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="scheduler", daemon=True)
+                self._thread.start()
+        return self
+
+    def add(self, delay_sec: float, message: str = "", kind: str = "timer") -> Job:
+        now = time.time()
+        with self._cond:
+            job = Job(due=now + max(0.0, delay_sec), id=next(self._ids), kind=kind, message=message, created=now)
+            self._jobs[job.id] = job
+            heapq.heappush(self._heap, job)
+            self._changed()  # also: may be earlier than what the worker is waiting for
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        with self._cond:
+            if self._jobs.pop(job_id, None) is None:
+                return False
+            self._changed()
+            return True
+
+    def cancel_all(self, kind: Optional[str] = None) -> int:
+        with self._cond:
+            ids = [i for i, j in self._jobs.items() if kind is None or j.kind == kind]
+            for i in ids:
+                del self._jobs[i]
+            if ids:
+                self._changed()
+            return len(ids)
+
+    def pending(self, kind: Optional[str] = None) -> List[Job]:
+        with self._cond:
+            return sorted(j for j in self._jobs.values() if kind is None or j.kind == kind)
+
+    # ---------- Worker ----------
+    def _run(self) -> None:
+        while True:
+            due: List[Job] = []
+            save = False
+            with self._cond:
+                while True:
+                    # Drop cancelled jobs that reached the top
+                    while self._heap and self._heap[0].id not in self._jobs:
+                        heapq.heappop(self._heap)
+                    now = time.time()
+                    while self._heap and self._heap[0].due <= now:
+                        job = heapq.heappop(self._heap)
+                        if self._jobs.pop(job.id, None) is not None:
+                            due.append(job)
+                    save_in = SAVE_DELAY_SEC - (time.monotonic() - self._saved_at) if (self._dirty or due) else None
+                    if due or (save_in is not None and save_in <= 0):
+                        save = self._dirty or bool(due)
+                        break
+                    waits = [w for w in (self._heap[0].due - now if self._heap else None, save_in) if w is not None]
+                    self._cond.wait(min(waits) if waits else None)
+            if save:
+                self.save()
+            for job in due:
+                late = time.time() - job.due > 60  # fell due while Leo was not running
+                try:
+                    if self.deliver is not None:
+                        self.deliver(job, late)
+                    else:
+                        print(f"⏰ {announcement(job, late)}")
+                except Exception as e:
+                    print(f"⚠️ Timer delivery failed: {e}")
+
+
+def announcement(job: Job, late: bool = False) -> str:
+    if job.kind == "reminder":
+        text = f"Reminder: {job.message}." if job.message else "This is your reminder."
+    else:
+        text = f"Your {job.message} timer is done." if job.message else "Your timer is done."
+    if late:
+        text += f" It was due {describe_duration(time.time() - job.due)} ago."
+    return text
+
+
+_scheduler: Optional[Scheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """Process-wide scheduler, started on first use (resumes persisted timers)."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler().start()
+        return _scheduler
+
+
+def set_delivery(deliver: Callable[[str], None]) -> Scheduler:
+    """Route due timers to `deliver(text)` (e.g. the assistant's speak)."""
+    scheduler = get_scheduler()
+    scheduler.deliver = lambda job, late: deliver(announcement(job, late))
+    return scheduler
@@ -1,15 +1,107 @@
 # skills/session_state.py
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
 from threading import Lock
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
+
+# Memory budget for prefetched page text, per session
+TEXT_BUDGET_CHARS = 1_000_000
+TEXT_PER_RESULT_CHARS = 200_000
+
+
+@dataclass
+class SearchResult:
+    url: str
+    title: str
+    snippet: str = ""
+    text: Optional[str] = None   # extracted page text, once fetched
+    fetched: bool = False        # fetch attempted (text may still be empty)
+    pos: int = 0                 # next sentence to read ("read more")
+
+
+class SessionState:
+    """
+    Per-conversation state shared by skills: the ranked results of the last search,
+    their extracted text (filled in by background prefetch) and which one is current.
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self.query: Optional[str] = None
+        self.results: List[SearchResult] = []
+        self.cursor = 0
+        self.generation = 0      # bumps on every new search; stale prefetches check it
+
+    # ---------- Ranked results ----------
+    def set_results(self, query: str, results: List[SearchResult]) -> int:
+        """Replace the result list; returns the new generation."""
+        with self._lock:
+            self.query = query
+            self.results = list(results)
+            self.cursor = 0
+            self.generation += 1
+            return self.generation
+
+    def get_result(self, index: Optional[int] = None) -> Optional[SearchResult]:
+        """Result by 0-based rank (default: current)."""
+        with self._lock:
+            i = self.cursor if index is None else index
+            return self.results[i] if 0 <= i < len(self.results) else None
+
+    def select(self, index: int) -> Optional[SearchResult]:
+        with self._lock:
+            if 0 <= index < len(self.results):
+                self.cursor = index
+                return self.results[index]
+            return None
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self.results)
+
+    def store_text(self, generation: int, url: str, text: str) -> bool:
+        """Attach fetched text to a result, within the session memory budget."""
+        with self._lock:
+            if generation != self.generation:
+                return False  # a newer search replaced these results
+            used = sum(len(r.text or "") for r in self.results)
+            room = max(0, min(TEXT_PER_RESULT_CHARS, TEXT_BUDGET_CHARS - used))
+            for r in self.results:
+                if r.url == url:
+                    r.text = text[:room]
+                    r.fetched = True
+                    return True
+            return False
+
+    # ---------- Single "last result" (kept for simple callers) ----------
+    def set_last_result(self, url: Optional[str], title: Optional[str]) -> None:
+        self.set_results(self.query or "", [SearchResult(url=url or "", title=title or "")] if url else [])
+
+    def get_last_result(self) -> Tuple[Optional[str], Optional[str]]:
+        r = self.get_result()
+        return (r.url, r.title) if r else (None, None)
+
+
+# The local microphone session uses the default; the server binds one per client.
+_default = SessionState()
+_current: ContextVar[SessionState] = ContextVar("leo_session_state", default=_default)
+
+
+def use_session(state: SessionState) -> Token:
+    """Make `state` current for this thread/task. Pass the token to `reset_session()`."""
+    return _current.set(state)
+
+
+def reset_session(token: Token) -> None:
+    _current.reset(token)
+
+
+def current_session() -> SessionState:
+    return _current.get()
 
-_last: Tuple[Optional[str], Optional[str]] = (None, None)  # (url, title)
-_lock = Lock()
 
 def set_last_result(url: Optional[str], title: Optional[str]) -> None:
-    global _last
-    with _lock:
-        _last = (url, title)
+    _current.get().set_last_result(url, title)
+
 
 def get_last_result() -> Tuple[Optional[str], Optional[str]]:
-    with _lock:
-        return _last
+    return _current.get().get_last_result()
@@ -11,6 +11,8 @@ def register() -> Skill:
             patterns=["what time is", "what is the time", "time"],
             handler=_tell_time,
             name="tell_time",
+            examples=["what's the time", "tell me the time", "got the time", "current time"],
+            independent=True,
         ),
     ]
     return Skill(name="time", intents=intents)
@@ -0,0 +1,112 @@
+# skills/timer_skill.py
+import time
+from typing import List
+from .types import Intent, Skill
+from .scheduler import describe_duration, get_scheduler
+
+_UNITS = "second|seconds|minute|minutes|hour|hours"
+_SECONDS = {"second": 1, "minute": 60, "hour": 3600}
+# "{n:int} {unit}" and the "a minute" / "an hour" form ({n:int} must not take "a" as 1
+# everywhere: "set volume to a ..." would become 1 percent)
+_AMOUNTS = ("{n:int}", "{n:a|an}")
+
+
+def _durations(pattern: str) -> List[str]:
+    """Expand DURATION in `pattern` into both amount forms."""
+    return [pattern.replace("DURATION", f"{n} {{unit:{_UNITS}}}") for n in _AMOUNTS]
+
+
+def _delay(slots) -> float | None:
+    n, unit = (slots or {}).get("n"), (slots or {}).get("unit")
+    if n in ("a", "an"):
+        n = 1
+    if not n or not unit:
+        return None
+    return n * _SECONDS[unit.rstrip("s")]
+
+
+def _set_timer(text, speak, slots=None):
+    delay = _delay(slots)
+    if delay is None:
+        speak("How long should the timer be? For example, set a timer for ten minutes.")
+        return
+    get_scheduler().add(delay, kind="timer", message=(slots or {}).get("label", ""))
+    speak(f"Timer set for {describe_duration(delay)}.")
+
+
+def _remind(text, speak, slots=None):
+    delay = _delay(slots)
+    message = (slots or {}).get("message", "").strip()
+    if delay is None or not message:
+        speak("Tell me what and when. For example, remind me in ten minutes to check the oven.")
+        return
+    get_scheduler().add(delay, kind="reminder", message=message)
+    speak(f"Okay, in {describe_duration(delay)} I'll remind you to {message}.")
+
+
+def _time_left(text, speak):
+    jobs = get_scheduler().pending()
+    if not jobs:
+        speak("You have no timers or reminders.")
+        return
+    now = time.time()
+    parts = []
+    for job in jobs[:3]:
+        what = f"reminder to {job.message}" if job.kind == "reminder" else (f"{job.message} timer" if job.message else "timer")
+        left = job.due - now
+        parts.append(f"{what}: {describe_duration(left)} left" if left >= 1 else f"{what}: due now")
+    more = f" and {len(jobs) - 3} more" if len(jobs) > 3 else ""
+    speak("; ".join(parts) + more + ".")
+
+
+def _cancel(text, speak, slots=None):
+    kind = (slots or {}).get("kind", "")
+    kind = "reminder" if "reminder" in kind else "timer" if "timer" in kind else None
+    n = get_scheduler().cancel_all(kind)
+    what = f"{kind}s" if kind else "timers and reminders"
+    speak(f"Cancelled {n} {what}." if n else f"There are no {what} to cancel.")
+
+
+def register() -> Skill:
+    intents = [
+        Intent(
+            name="set_timer",
+            patterns=[
+                *_durations("set a timer for DURATION"),
+                *_durations("set timer for DURATION"),
+                f"set a {{n:int}} {{unit:{_UNITS}}} timer",
+                *_durations("timer for DURATION"),
+                *_durations("set a {label:word} timer for DURATION"),
+                "set a timer",
+                "start a timer",
+            ],
+            handler=_set_timer,
+            independent=True,
+        ),
+        Intent(
+            name="remind_me",
+            patterns=[
+                *_durations("remind me in DURATION to {message}"),
+                *_durations("remind me to {message} in DURATION"),
+                "remind me",
+            ],
+            handler=_remind,
+            independent=True,
+        ),
+        Intent(
+            name="time_left",
+            patterns=["how much time is left", "how long is left", "what timers do i have", "list timers", "list reminders"],
+            handler=_time_left,
+            examples=["time remaining", "how long until my timer", "when is my timer done"],
+            independent=True,
+        ),
+        Intent(
+            name="cancel_timer",
+            patterns=[
+                "cancel {kind:all timers|the timer|timers|timer|all reminders|the reminder|reminders|reminder}",
+                "cancel everything",
+            ],
+            handler=_cancel,
+        ),
+    ]
+    return Skill(name="timers", intents=intents)
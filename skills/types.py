@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Callable, List
 
 # speak: Callable[[str], None]  -> function you call to speak a response
@@ -9,6 +9,9 @@ class Intent:
     patterns: List[str]                           # phrases/substrings to match
     handler: Callable[[str, Callable[[str], None]], None]
     name: str = ""                                # optional identifier
+    examples: List[str] = field(default_factory=list)  # extra phrasings for the fallback classifier
+    independent: bool = False                     # may run alongside other commands in one utterance
+                                                  # (read-only, order-free; never for session_state users)
 
 @dataclass
 class Skill:
@@ -0,0 +1,273 @@
+# skills/volume_backends.py
+# System volume backends behind one interface, picked once and cached:
+#   Windows: pycaw (cached endpoint) -> virtual-key presses
+#   Linux:   wpctl (PipeWire) -> pactl (PulseAudio)
+#   macOS:   osascript
+#   Tests:   fake (in-memory), via volume_backend = "fake" / VOLUME_BACKEND=fake
+
+from __future__ import annotations
+import abc
+import ctypes
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from typing import List, Optional
+
+# --- Try pycaw first (precise control on Windows) ---
+try:
+    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+    from comtypes import CLSCTX_ALL
+    import comtypes.client as cc
+    HAVE_PYCAW = True
+except Exception:
+    HAVE_PYCAW = False
+
+STEP_PCT = 5  # step size for backends without a native "step"
+
+
+class VolumeBackend(abc.ABC):
+    name = "base"
+    exact = True  # False when set_level() can only approximate
+
+    def step(self, up: bool) -> None:
+        level = self.get_level()
+        if level is None:
+            raise RuntimeError("current level unknown")
+        self.set_level(level + (STEP_PCT if up else -STEP_PCT))
+
+    @abc.abstractmethod
+    def set_level(self, pct: int) -> None:
+        """Set the output level to `pct` (0-100)."""
+
+    def get_level(self) -> Optional[int]:
+        return None
+
+    @abc.abstractmethod
+    def set_mute(self, muted: bool) -> None:
+        """Mute or unmute the output (an absolute state, not a toggle)."""
+
+
+def _clamp(pct: int) -> int:
+    return max(0, min(100, int(pct)))
+
+
+# ---------- Windows ----------
+VK_VOLUME_MUTE  = 0xAD
+VK_VOLUME_DOWN  = 0xAE
+VK_VOLUME_UP    = 0xAF
+KEYEVENTF_KEYUP = 0x0002
+
+
+class KeyPressBackend(VolumeBackend):
+    """Media-key simulation; no dependencies, but levels are approximate."""
+    name = "keys"
+    exact = False
+    TOTAL_STEPS = 50  # Windows volume typically has ~50 steps (~2% each)
+
+    def __init__(self):
+        self._user32 = ctypes.WinDLL("user32")
+        self._muted: Optional[bool] = None  # mute state as far as we know (keys can only toggle)
+
+    def _press(self, vk, times=1, delay_s=0.0):
+        for _ in range(max(0, int(times))):
+            self._user32.keybd_event(vk, 0, 0, 0)
+            self._user32.keybd_event(vk, 0, KEYEVENTF_KEYUP, 0)
+            if delay_s:
+                time.sleep(delay_s)
+
+    def step(self, up: bool) -> None:
+        self._press(VK_VOLUME_UP if up else VK_VOLUME_DOWN)
+        self._muted = False  # volume keys unmute
+
+    def set_level(self, pct: int) -> None:
+        # Drive to minimum, then step up to target
+        self._press(VK_VOLUME_DOWN, times=self.TOTAL_STEPS, delay_s=0.004)
+        self._press(VK_VOLUME_UP, times=round(_clamp(pct) / (100 / self.TOTAL_STEPS)), delay_s=0.004)
+        self._muted = False
+
+    def set_mute(self, muted: bool) -> None:
+        # Only a toggle exists: press it only when the tracked state differs. Unknown state:
+        # assume unmuted for "mute", but never toggle blindly for "unmute" (it could mute)
+        if self._muted == muted:
+            return
+        if self._muted is None and not muted:
+            raise RuntimeError("mute state unknown; media keys can only toggle")
+        self._press(VK_VOLUME_MUTE)
+        self._muted = muted
+
+
+class PycawBackend(VolumeBackend):
+    """Core Audio endpoint, enumerated once and reused; re-acquired if the device changes."""
+    name = "pycaw"
+
+    def __init__(self):
+        self._ep = None
+        self._lock = threading.Lock()
+
+    def _endpoint(self):
+        if self._ep is None:
+            devices = AudioUtilities.GetSpeakers()
+            interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+            self._ep = cc.CastTo(interface, IAudioEndpointVolume)
+        return self._ep
+
+    def _call(self, fn):
+        with self._lock:
+            try:
+                return fn(self._endpoint())
+            except Exception:
+                self._ep = None  # default device changed or COM handle went stale
+                return fn(self._endpoint())
+
+    def step(self, up: bool) -> None:
+        self._call(lambda ep: ep.VolumeStepUp(None) if up else ep.VolumeStepDown(None))
+
+    def set_level(self, pct: int) -> None:
+        self._call(lambda ep: ep.SetMasterVolumeLevelScalar(_clamp(pct) / 100.0, None))
+
+    def get_level(self) -> Optional[int]:
+        return round(self._call(lambda ep: ep.GetMasterVolumeLevelScalar()) * 100)
+
+    def set_mute(self, muted: bool) -> None:
+        self._call(lambda ep: ep.SetMute(1 if muted else 0, None))
+
+
+# ---------- Linux / macOS (one short-lived process per command) ----------
+class _CommandBackend(VolumeBackend):
+    def __init__(self, binary: str):
+        self.binary = binary  # resolved once
+
+    def _run(self, *args: str) -> str:
+        out = subprocess.run([self.binary, *args], capture_output=True, text=True, timeout=2, check=True)
+        return out.stdout
+
+
+class WpctlBackend(_CommandBackend):
+    """PipeWire (wireplumber)."""
+    name = "wpctl"
+    SINK = "@DEFAULT_AUDIO_SINK@"
+
+    def step(self, up: bool) -> None:
+        self._run("set-volume", "-l", "1.0", self.SINK, f"{STEP_PCT}%{'+' if up else '-'}")
+
+    def set_level(self, pct: int) -> None:
+        self._run("set-volume", self.SINK, f"{_clamp(pct) / 100:.2f}")
+
+    def get_level(self) -> Optional[int]:
+        m = re.search(r"Volume:\s*([\d.]+)", self._run("get-volume", self.SINK))
+        return round(float(m.group(1)) * 100) if m else None
+
+    def set_mute(self, muted: bool) -> None:
+        self._run("set-mute", self.SINK, "1" if muted else "0")
+
+
+class PactlBackend(_CommandBackend):
+    """PulseAudio (also served by pipewire-pulse)."""
+    name = "pactl"
+    SINK = "@DEFAULT_SINK@"
+
+    def step(self, up: bool) -> None:
+        level = self.get_level()
+        if level is not None and up and level + STEP_PCT > 100:
+            self.set_level(100)  # pactl happily goes past 100%
+        else:
+            self._run("set-sink-volume", self.SINK, f"{'+' if up else '-'}{STEP_PCT}%")
+
+    def set_level(self, pct: int) -> None:
+        self._run("set-sink-volume", self.SINK, f"{_clamp(pct)}%")
+
+    def get_level(self) -> Optional[int]:
+        m = re.search(r"(\d+)%", self._run("get-sink-volume", self.SINK))
+        return int(m.group(1)) if m else None
+
+    def set_mute(self, muted: bool) -> None:
+        self._run("set-sink-mute", self.SINK, "1" if muted else "0")
+
+
+class OsascriptBackend(_CommandBackend):
+    name = "osascript"
+
+    def set_level(self, pct: int) -> None:
+        self._run("-e", f"set volume output volume {_clamp(pct)}")
+
+    def get_level(self) -> Optional[int]:
+        out = self._run("-e", "output volume of (get volume settings)").strip()
+        return int(out) if out.isdigit() else None
+
+    def set_mute(self, muted: bool) -> None:
+        self._run("-e", f"set volume output muted {'true' if muted else 'false'}")
+
+
+# ---------- Tests ----------
+class FakeBackend(VolumeBackend):
+    """In-memory backend; records calls for tests and benchmarks."""
+    name = "fake"
+
+    def __init__(self, level: int = 50):
+        self.level = level
+        self.muted = False
+        self.calls: List[tuple] = []
+
+    def set_level(self, pct: int) -> None:
+        self.calls.append(("set_level", pct))
+        self.level = _clamp(pct)
+
+    def get_level(self) -> Optional[int]:
+        return self.level
+
+    def set_mute(self, muted: bool) -> None:
+        self.calls.append(("set_mute", muted))
+        self.muted = muted
+
+
+# ---------- Selection ----------
+_backend: Optional[VolumeBackend] = None
+_selected = False
+
+
+def _create(name: str) -> Optional[VolumeBackend]:
+    if name == "fake":
+        return FakeBackend()
+    if name == "pycaw" and HAVE_PYCAW and sys.platform == "win32":
+        return PycawBackend()
+    if name == "keys" and sys.platform == "win32":
+        return KeyPressBackend()
+    for cls in (WpctlBackend, PactlBackend, OsascriptBackend):
+        if name == cls.name:
+            binary = shutil.which(cls.name)
+            return cls(binary) if binary else None
+    return None
+
+
+def _auto_order() -> List[str]:
+    if sys.platform == "win32":
+        return ["pycaw", "keys"]
+    if sys.platform == "darwin":
+        return ["osascript"]
+    return ["wpctl", "pactl"]
+
+
+def get_backend() -> Optional[VolumeBackend]:
+    """The volume backend for this machine, chosen once (config `volume_backend`, default auto)."""
+    global _backend, _selected
+    if not _selected:
+        try:
+            from core.config import load_config
+            wanted = str(load_config().get("volume_backend", "auto")).lower()
+        except Exception:
+            wanted = "auto"
+        for name in (_auto_order() if wanted == "auto" else [wanted]):
+            _backend = _create(name)
+            if _backend is not None:
+                break
+        _selected = True
+    return _backend
+
+
+def set_backend(backend: Optional[VolumeBackend]) -> None:
+    """Override the selected backend (tests, benchmarks)."""
+    global _backend, _selected
+    _backend, _selected = backend, True
@@ -1,117 +1,288 @@
 # skills/web_search.py
 from __future__ import annotations
 import re
-from typing import List, Callable, Optional
-from dataclasses import dataclass
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Callable, Optional, Tuple
+from urllib.parse import urlsplit
 
 from ddgs import DDGS
-import requests
 from bs4 import BeautifulSoup
 
-from .session_state import set_last_result   # store last (url, title)
+from core.net import NetworkUnavailable, get_health
+from .session_state import SearchResult, SessionState, current_session
 from .types import Skill, Intent
 
+MAX_RESULTS = 5
+PREFETCH_WORKERS = 2
+SEARCH_HOST = "duckduckgo.com"
+RECENT_SEARCHES = 32          # queries remembered for offline answers
+RECENT_SEARCH_TTL = 6 * 3600
+
 
 # ---------- Helpers ----------
+# Used when the handler is called without grammar slots
+_QUERY_ANCHORED = [re.compile(p, re.IGNORECASE) for p in (
+    r"^(?:search the web for)\s+(.+)$",
+    r"^(?:search the web)\s+(.+)$",
+    r"^(?:search|search for|web search)\s+(.+)$",
+    r"^(?:what is|who is|tell me about|news on)\s+(.+)$",
+)]
+_QUERY_ANYWHERE = [re.compile(p, re.IGNORECASE) for p in (
+    r"(?:search the web for)\s+(.+)",
+    r"(?:search the web)\s+(.+)",
+    r"(?:search|search for|web search)\s+(.+)",
+)]
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_WHITESPACE = re.compile(r"\s+")
+
+
 def _extract_query(text: str) -> Optional[str]:
     t = (text or "").strip()
     # common spoken forms first
-    for pat in (
-        r"^(?:search the web for)\s+(.+)$",
-        r"^(?:search the web)\s+(.+)$",
-        r"^(?:search|search for|web search)\s+(.+)$",
-        r"^(?:what is|who is|tell me about|news on)\s+(.+)$",
-    ):
-        m = re.match(pat, t, flags=re.IGNORECASE)
+    for rx in _QUERY_ANCHORED:
+        m = rx.match(t)
         if m:
             return m.group(1).strip()
     # fallback: phrase anywhere
-    for pat in (
-        r"(?:search the web for)\s+(.+)",
-        r"(?:search the web)\s+(.+)",
-        r"(?:search|search for|web search)\s+(.+)",
-    ):
-        m = re.search(pat, t, flags=re.IGNORECASE)
+    for rx in _QUERY_ANYWHERE:
+        m = rx.search(t)
         if m:
             return m.group(1).strip()
     return None
 
 
 def _search(query: str, max_results: int = 5) -> List[dict]:
-    with DDGS() as ddgs:
-        return list(ddgs.text(query, max_results=max_results))
+    """DDG text search under the search host's breaker; raises NetworkUnavailable while it is open."""
+    health = get_health()
+    with health.guard(SEARCH_HOST):
+        try:
+            with DDGS(timeout=health.read_timeout) as ddgs:
+                return list(ddgs.text(query, max_results=max_results))
+        except Exception as e:
+            if "no results" in str(e).lower():
+                return []  # the service answered; not a health failure
+            raise
 
 
 def _fetch_and_extract(url: str) -> str:
     try:
         headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
-        r = requests.get(url, headers=headers, timeout=10)
+        r = get_health().get(url, headers=headers)
         r.raise_for_status()
         soup = BeautifulSoup(r.text, "html.parser")
         for tag in soup(["script", "style", "noscript", "header", "footer", "aside", "form", "nav"]):
             tag.decompose()
         main = soup.find(["article", "main"]) or soup.body or soup
         text = main.get_text(separator=" ", strip=True)
-        return re.sub(r"\s+", " ", text).strip()
+        return _WHITESPACE.sub(" ", text).strip()
     except Exception:
         return ""
 
 
-def _summarize(text: str, max_sentences: int = 4) -> str:
+def _read_chunk(text: str, start: int = 0, max_sentences: int = 4) -> Tuple[str, int]:
+    """Next few substantial sentences from sentence `start`; returns (chunk, next start)."""
     if not text:
-        return ""
-    sentences = re.split(r"(?<=[.!?])\s+", text)
+        return "", start
+    sentences = _SENTENCE_SPLIT.split(text)
     picked = []
-    for s in sentences:
-        s = s.strip()
+    i = start
+    while i < len(sentences) and len(picked) < max_sentences:
+        s = sentences[i].strip()
+        i += 1
         if len(s) >= 60:
             picked.append(s)
-        if len(picked) >= max_sentences:
-            break
-    if not picked:
+    if not picked and start == 0:
         picked = sentences[:max_sentences]
-    summary = " ".join(picked).strip()
-    if len(summary) > 600:
-        summary = summary[:600].rsplit(" ", 1)[0] + "…"
-    return summary
+        i = len(picked)
+    chunk = " ".join(picked).strip()
+    if len(chunk) > 600:
+        chunk = chunk[:600].rsplit(" ", 1)[0] + "…"
+    return chunk, i
+
+
+def _summarize(text: str, max_sentences: int = 4) -> str:
+    return _read_chunk(text, 0, max_sentences)[0]
+
+
+# ---------- Offline answers ----------
+# query -> (time, results); result objects keep any text fetched for them
+_recent: "OrderedDict[str, Tuple[float, List[SearchResult]]]" = OrderedDict()
+_recent_lock = threading.Lock()
+
+
+def _remember(query: str, results: List[SearchResult]) -> None:
+    # Titles, URLs and snippets only: page text stays in the session, under its budget
+    light = [SearchResult(url=r.url, title=r.title, snippet=r.snippet) for r in results]
+    with _recent_lock:
+        _recent[query.lower()] = (time.time(), light)
+        _recent.move_to_end(query.lower())
+        while len(_recent) > RECENT_SEARCHES:
+            _recent.popitem(last=False)
+
+
+def _recall(query: str) -> Optional[List[SearchResult]]:
+    with _recent_lock:
+        hit = _recent.get(query.lower())
+    if hit is None or time.time() - hit[0] > RECENT_SEARCH_TTL:
+        return None
+    return [SearchResult(url=r.url, title=r.title, snippet=r.snippet) for r in hit[1]]
+
+
+def _answer_offline(query: str, speak: Callable[[str], None]) -> None:
+    """Reply without touching the network: an earlier answer for the same query, or an apology."""
+    results = _recall(query)
+    if results:
+        state = current_session()
+        state.set_results(query, results)
+        top = results[0]
+        speak(f"I can’t reach the web right now, but earlier I found {top.title}. {top.snippet}".strip())
+        return
+    health = get_health()
+    if not health.online:
+        speak("I’m offline right now, so I can’t search the web.")
+        return
+    wait = health.breaker(SEARCH_HOST).retry_in()
+    speak(f"Web search isn’t responding. Try again in {max(1, round(wait))} seconds." if wait
+          else "Web search isn’t responding right now.")
+
+
+# ---------- Background prefetch ----------
+_prefetch_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _prefetch_pool
+    with _pool_lock:
+        if _prefetch_pool is None:
+            _prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch")
+        return _prefetch_pool
+
+
+def _prefetch_one(state: SessionState, generation: int, result: SearchResult) -> None:
+    if state.generation != generation or result.fetched:
+        return  # superseded by a newer search, or already read
+    if not get_health().available(urlsplit(result.url).hostname or ""):
+        return  # don't mark it fetched; a later read retries once the host is back
+    state.store_text(generation, result.url, _fetch_and_extract(result.url))
+
+
+def _prefetch(state: SessionState, generation: int, results: List[SearchResult]) -> None:
+    for r in results:
+        _pool().submit(_prefetch_one, state, generation, r)
+
+
+def _ensure_text(state: SessionState, result: SearchResult) -> str:
+    """Prefetched text if ready, otherwise fetch it now."""
+    if not result.fetched:
+        state.store_text(state.generation, result.url, _fetch_and_extract(result.url))
+    return result.text or ""
 
 
-# ---------- Intent Handler ----------
-def handle_web_search(transcript: str, speak: Callable[[str], None]) -> None:
-    query = _extract_query(transcript)
+def _read_result(state: SessionState, result: SearchResult, speak: Callable[[str], None], intro: str) -> None:
+    chunk, result.pos = _read_chunk(_ensure_text(state, result), 0, max_sentences=4)
+    if chunk:
+        speak(f"{intro}{result.title}. Summary: {chunk}")
+    elif result.snippet:
+        speak(f"{intro}{result.title}. {result.snippet}")
+    else:
+        speak(f"I found {result.title}, but couldn’t extract the article text.")
+
+
+# ---------- Intent Handlers ----------
+def handle_web_search(transcript: str, speak: Callable[[str], None], slots: dict | None = None) -> None:
+    query = slots.get("query") if slots is not None else _extract_query(transcript)
     if not query:
         speak("What should I search for?")
         return
 
+    # Known-down: answer in milliseconds instead of announcing a search that will hang
+    if not get_health().available(SEARCH_HOST):
+        _answer_offline(query, speak)
+        return
+
     speak(f"Searching the web for {query}")
     try:
-        results = _search(query, max_results=5)
+        raw = _search(query, max_results=MAX_RESULTS)
+    except NetworkUnavailable:
+        _answer_offline(query, speak)
+        return
     except Exception:
-        results = []
+        if not get_health().available(SEARCH_HOST):  # that failure opened the breaker
+            _answer_offline(query, speak)
+            return
+        raw = []
 
+    results = [
+        SearchResult(
+            url=r.get("href") or r.get("url") or "",
+            title=r.get("title") or r.get("body") or "result",
+            snippet=r.get("body") or "",
+        )
+        for r in raw
+    ]
+    results = [r for r in results if r.url]
     if not results:
         speak("I couldn’t find anything right now.")
         return
 
-    top = next((r for r in results if r.get("href")), results[0])
-    url = top.get("href") or top.get("url") or ""
-    title = top.get("title") or top.get("body") or "result"
+    # ✅ keep the ranked list for “open it”, “open the second one”, “read more”
+    state = current_session()
+    generation = state.set_results(query, results)
+    _remember(query, results)
+    top = results[0]
+
+    _read_result(state, top, speak, intro="")
 
-    # ✅ save last result for “open it”
-    set_last_result(url, title)
+    print("\n=== Top result ===")
+    print("Title:", top.title)
+    print("URL  :", top.url)
+    print("==================\n")
 
-    content = _fetch_and_extract(url)
-    summary = _summarize(content, max_sentences=4)
+    # The answer is out; warm the rest so follow-ups don't wait on the network
+    _prefetch(state, generation, results[1:])
 
-    if summary:
-        speak(f"{title}. Summary: {summary}")
+
+def handle_read_more(transcript: str, speak: Callable[[str], None]) -> None:
+    state = current_session()
+    result = state.get_result()
+    if result is None:
+        speak("There’s nothing to read yet. Say search for something first.")
+        return
+    chunk, result.pos = _read_chunk(_ensure_text(state, result), result.pos, max_sentences=4)
+    if chunk:
+        speak(chunk)
     else:
-        speak(f"I found {title}, but couldn’t extract the article text.")
+        speak(f"That’s the end of {result.title}.")
 
-    print("\n=== Top result ===")
-    print("Title:", title)
-    print("URL  :", url)
-    print("==================\n")
+
+def handle_next_result(transcript: str, speak: Callable[[str], None]) -> None:
+    state = current_session()
+    if state.count() == 0:
+        speak("There are no results yet. Say search for something first.")
+        return
+    result = state.select(state.cursor + 1)
+    if result is None:
+        speak("That was the last result.")
+        return
+    _read_result(state, result, speak, intro=f"Result {state.cursor + 1}: ")
+
+
+def handle_read_nth(transcript: str, speak: Callable[[str], None], slots: dict | None = None) -> None:
+    state = current_session()
+    n = (slots or {}).get("n")
+    if state.count() == 0:
+        speak("There are no results yet. Say search for something first.")
+        return
+    index = state.count() - 1 if n == -1 else (n or 1) - 1
+    result = state.select(index)
+    if result is None:
+        speak(f"I only have {state.count()} results.")
+        return
+    _read_result(state, result, speak, intro=f"Result {index + 1}: ")
 
 
 # ---------- Registration ----------
@@ -120,17 +291,48 @@ def register() -> Skill:
         Intent(
             name="web_search",
             patterns=[
-                "search the web for",  # covers “search the web for nasa…”
+                "search the web for {query}",  # covers “search the web for nasa…”
+                "search the web {query}",
+                "search for {query}",
+                "search {query}",
+                "web search {query}",
+                "what is {query}",
+                "who is {query}",
+                "tell me about {query}",
+                "news on {query}",
+                # bare forms: handler asks what to search for
+                "search the web for",
                 "search the web",
                 "search for",
-                "search ",             # note trailing space; avoids matching “research”
                 "web search",
                 "what is",
                 "who is",
                 "tell me about",
-                "news on",
             ],
             handler=handle_web_search,
-        )
+        ),
+        Intent(
+            name="read_more",
+            patterns=["read more", "tell me more", "continue reading", "keep reading"],
+            handler=handle_read_more,
+            examples=["go on", "read on", "more please"],
+        ),
+        Intent(
+            name="next_result",
+            patterns=["next result", "next one", "read the next one", "read the next result"],
+            handler=handle_next_result,
+            examples=["skip this one", "the next one please"],
+        ),
+        Intent(
+            name="read_result",
+            patterns=[
+                "read the {n:ordinal} one",
+                "read the {n:ordinal} result",
+                "read result {n:int}",
+                "what is the {n:ordinal} one",
+                "what is the {n:ordinal} result",
+            ],
+            handler=handle_read_nth,
+        ),
     ]
     return Skill(name="web_search", intents=intents)